@@ -1,8 +1,34 @@
 from .agent_binary_request import (
+    AgentBinaryDownloadRequest,
     AgentBinaryDownloadReservation,
     AgentBinaryDownloadTicket,
     ReservationID,
 )
+from .agent_binary_wrapper_template import AGENT_BINARY_PLACEHOLDER, AgentBinaryWrapperTemplate
+from .agent_command_template import (
+    DOWNLOAD_URL_PLACEHOLDER,
+    OTP_PLACEHOLDER,
+    AgentCommandTemplate,
+)
+from .async_adapters import (
+    AsyncAgentBinaryRepositoryAdapter,
+    AsyncAgentEventPublisherAdapter,
+    AsyncAgentOTPProviderAdapter,
+    AsyncHTTPAgentBinaryServerRegistrarAdapter,
+    AsyncPropagationCredentialsRepositoryAdapter,
+    SyncAgentBinaryRepositoryAdapter,
+    SyncAgentEventPublisherAdapter,
+    SyncAgentOTPProviderAdapter,
+    SyncHTTPAgentBinaryServerRegistrarAdapter,
+    SyncPropagationCredentialsRepositoryAdapter,
+)
+from .background_agent_event_publisher import (
+    AgentEventPublisherMetrics,
+    BackgroundAgentEventPublisher,
+)
+from .bitmap_tcp_port_selector import BitmapTCPPortSelector
+from .buffering_agent_event_publisher import BufferingAgentEventPublisher
+from .caching_agent_binary_repository import CachingAgentBinaryRepository
 from .dropper_execution_mode import DropperExecutionMode
 from .exploiter_result import ExploiterResult
 from .fingerprint_data import FingerprintData
@@ -10,6 +36,11 @@ from .i_agent_binary_repository import IAgentBinaryRepository, RetrievalError
 from .i_agent_command_builder_factory import IAgentCommandBuilderFactory
 from .i_agent_event_publishler import IAgentEventPublisher
 from .i_agent_otp_provider import IAgentOTPProvider
+from .i_async_agent_binary_repository import IAsyncAgentBinaryRepository
+from .i_async_agent_event_publisher import IAsyncAgentEventPublisher
+from .i_async_agent_otp_provider import IAsyncAgentOTPProvider
+from .i_async_http_agent_binary_server_registrar import IAsyncHTTPAgentBinaryServerRegistrar
+from .i_async_propagation_credentials_repository import IAsyncPropagationCredentialsRepository
 from .i_http_agent_binary_server_registrar import IHTTPAgentBinaryServerRegistrar
 from .i_linux_agent_command_builder import (
     ILinuxAgentCommandBuilder,
@@ -18,7 +49,13 @@ from .i_linux_agent_command_builder import (
     LinuxRunOptions,
     LinuxSetPermissionsOptions,
 )
-from .i_propagation_credentials_repository import IPropagationCredentialsRepository
+from .i_propagation_credentials_repository import (
+    IdentityType,
+    IPropagationCredentialsRepository,
+    NewCredentials,
+    NewCredentialsCallback,
+    SecretType,
+)
 from .i_tcp_port_selector import ITCPPortSelector
 from .i_windows_agent_command_builder import (
     IWindowsAgentCommandBuilder,
@@ -27,8 +64,21 @@ from .i_windows_agent_command_builder import (
     WindowsRunOptions,
     WindowsShell,
 )
-from .local_machine_info import LocalMachineInfo
+from .in_memory_propagation_credentials_repository import (
+    InMemoryPropagationCredentialsRepository,
+)
+from .local_machine_info import InterfaceToTargetCacheInfo, LocalMachineInfo
+from .overflow_policy import OverflowPolicy
 from .payload_result import PayloadResult
 from .ping_scan_data import PingScanData
 from .port_scan_data import PortScanData
-from .target_host import PortScanDataDict, TargetHost, TargetHostPorts
+from .prefetching_agent_otp_provider import PrefetchingAgentOTPProvider
+from .shared_port_scan_store import SharedPortScanDataDict, SharedPortScanStore
+from .target_host import (
+    CompactPortScanDataDict,
+    PortScanDataDict,
+    TargetHost,
+    TargetHostPorts,
+)
+from .target_host_inventory import TargetHostInventory
+from .target_host_jsonl import dump_target_hosts_jsonl, load_target_hosts_jsonl
@@ -1,16 +1,26 @@
 from dataclasses import dataclass
+from ipaddress import IPv4Address
 from typing import TypeAlias
 
 from monkeytypes import Event, OperatingSystem
 
+from .agent_binary_wrapper_template import AgentBinaryWrapperTemplate
+
 ReservationID: TypeAlias = str
 
 
+@dataclass(frozen=True)
+class AgentBinaryDownloadRequest:
+    operating_system: OperatingSystem
+    requestor_ip: IPv4Address
+    agent_binary_wrapper_template: bytes | AgentBinaryWrapperTemplate | None = None
+
+
 @dataclass(frozen=True)
 class AgentBinaryDownloadReservation:
     id: ReservationID
     operating_system: OperatingSystem
-    agent_binary_wrapper_template: bytes | None
+    agent_binary_wrapper_template: bytes | AgentBinaryWrapperTemplate | None
     download_url: str
     download_completed: Event
 
@@ -0,0 +1,65 @@
+from dataclasses import dataclass, field
+from typing import Final, List, Tuple
+
+AGENT_BINARY_PLACEHOLDER: Final = b"$(agent_binary)b"
+
+
+@dataclass(frozen=True)
+class AgentBinaryWrapperTemplate:
+    """
+    A compiled agent binary wrapper template
+
+    The template is split around its "$(agent_binary)b" placeholders once, when it is created, so
+    it can be reused for any number of downloads. Servers can write the segments of the template
+    and the Agent binary to the client one after the other (e.g. with `socket.sendmsg()`), instead
+    of building a new payload that contains a copy of the Agent binary for each download.
+
+    :param template: A bytes template that contains at least one "$(agent_binary)b" placeholder
+    :raises ValueError: If the template does not contain a placeholder
+    """
+
+    template: bytes
+    _segments: Tuple[bytes, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        segments = tuple(self.template.split(AGENT_BINARY_PLACEHOLDER))
+        if len(segments) < 2:
+            raise ValueError(
+                f"The agent binary wrapper template must contain {AGENT_BINARY_PLACEHOLDER!r}"
+            )
+
+        object.__setattr__(self, "_segments", segments)
+
+    def get_size(self, agent_binary_size: int) -> int:
+        """
+        Get the size of the payload this template produces for an Agent binary
+
+        :param agent_binary_size: The size of the Agent binary in bytes
+        :return: The size of the payload in bytes
+        """
+        num_placeholders = len(self._segments) - 1
+        return sum(map(len, self._segments)) + num_placeholders * agent_binary_size
+
+    def get_buffers(self, agent_binary: bytes | bytearray | memoryview) -> List[memoryview]:
+        """
+        Get the buffers that make up the payload for an Agent binary, without copying it
+
+        :param agent_binary: The Agent binary
+        :return: The buffers that, written in order, make up the payload. Empty buffers are omitted.
+        """
+        agent_binary_view = memoryview(agent_binary)
+        buffers = [memoryview(self._segments[0])]
+        for segment in self._segments[1:]:
+            buffers.append(agent_binary_view)
+            buffers.append(memoryview(segment))
+
+        return [buffer for buffer in buffers if len(buffer) > 0]
+
+    def render(self, agent_binary: bytes | bytearray | memoryview) -> bytes:
+        """
+        Build the payload for an Agent binary as a single bytes object
+
+        :param agent_binary: The Agent binary
+        :return: The template with every placeholder replaced by the Agent binary
+        """
+        return b"".join(self.get_buffers(agent_binary))
@@ -0,0 +1,103 @@
+import re
+from dataclasses import dataclass, field
+from typing import Final, Optional, Self, Tuple
+
+DOWNLOAD_URL_PLACEHOLDER: Final = "$(download_url)"
+OTP_PLACEHOLDER: Final = "$(otp)"
+
+_PLACEHOLDER_REGEX = re.compile(
+    f"({re.escape(DOWNLOAD_URL_PLACEHOLDER)}|{re.escape(OTP_PLACEHOLDER)})"
+)
+
+
+@dataclass(frozen=True)
+class AgentCommandTemplate:
+    """
+    A compiled Agent command
+
+    Only the download URL and the OTP differ between the commands that download and run the Agent
+    on different targets. The template is split around its "$(download_url)" and "$(otp)"
+    placeholders once, when it is created, so rendering a command for a target only joins the
+    segments with the target's download URL and OTP.
+
+    :param template: A command that contains "$(download_url)" and/or "$(otp)" placeholders
+    """
+
+    template: str
+    _segments: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    _download_url_indexes: Tuple[int, ...] = field(init=False, repr=False, compare=False)
+    _otp_indexes: Tuple[int, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # re.split() puts the placeholders that it splits on at the odd indexes
+        segments = tuple(_PLACEHOLDER_REGEX.split(self.template))
+        placeholder_indexes = range(1, len(segments), 2)
+
+        object.__setattr__(self, "_segments", segments)
+        object.__setattr__(
+            self,
+            "_download_url_indexes",
+            tuple(i for i in placeholder_indexes if segments[i] == DOWNLOAD_URL_PLACEHOLDER),
+        )
+        object.__setattr__(
+            self,
+            "_otp_indexes",
+            tuple(i for i in placeholder_indexes if segments[i] == OTP_PLACEHOLDER),
+        )
+
+    @classmethod
+    def from_built_command(cls, command: str, include_otp: bool) -> Self:
+        """
+        Create a template from a command that a builder built with the placeholders as options
+
+        Builders that quote or escape the options may not have written the placeholders as they
+        were given, in which case every rendered command would contain the placeholders instead.
+        This checks that the placeholders are in the command.
+
+        :param command: The built command
+        :param include_otp: Whether the command was built to include the OTP
+        :return: A template of the command
+        :raises ValueError: If the command does not contain the "$(download_url)" placeholder, or if
+                            `include_otp` is True and the command does not contain the "$(otp)"
+                            placeholder
+        """
+        if DOWNLOAD_URL_PLACEHOLDER not in command:
+            raise ValueError(f"The built command does not contain {DOWNLOAD_URL_PLACEHOLDER!r}")
+
+        command_template = cls(command)
+        if include_otp and not command_template.includes_otp:
+            raise ValueError(
+                f"The built command does not contain {OTP_PLACEHOLDER!r}. The run command must "
+                "use the OTP given in the run options."
+            )
+
+        return command_template
+
+    @property
+    def includes_otp(self) -> bool:
+        """
+        Whether the command includes an OTP
+        """
+        return len(self._otp_indexes) > 0
+
+    def render(self, download_url: str, otp: Optional[str] = None) -> str:
+        """
+        Build the command for a target
+
+        :param download_url: The URL that the target downloads the Agent from
+        :param otp: The OTP that the Agent uses to authenticate, if the command includes an OTP
+        :return: The template with every placeholder replaced
+        :raises ValueError: If the command includes an OTP but none was given
+        """
+        segments = list(self._segments)
+        for i in self._download_url_indexes:
+            segments[i] = download_url
+
+        if self._otp_indexes:
+            if otp is None:
+                raise ValueError("The command includes an OTP, but no OTP was given")
+
+            for i in self._otp_indexes:
+                segments[i] = otp
+
+        return "".join(segments)
@@ -0,0 +1,407 @@
+import asyncio
+import io
+from concurrent.futures import Executor
+from ipaddress import IPv4Address
+from typing import Any, BinaryIO, Callable, Coroutine, Iterable, List, Optional, Sequence, TypeVar
+
+from monkeyevents import AbstractAgentEvent
+from monkeytypes import Credentials, OperatingSystem
+
+from .agent_binary_request import (
+    AgentBinaryDownloadRequest,
+    AgentBinaryDownloadTicket,
+    ReservationID,
+)
+from .agent_binary_wrapper_template import AgentBinaryWrapperTemplate
+from .i_agent_binary_repository import IAgentBinaryRepository
+from .i_agent_event_publishler import IAgentEventPublisher
+from .i_agent_otp_provider import IAgentOTPProvider
+from .i_async_agent_binary_repository import IAsyncAgentBinaryRepository
+from .i_async_agent_event_publisher import IAsyncAgentEventPublisher
+from .i_async_agent_otp_provider import IAsyncAgentOTPProvider
+from .i_async_http_agent_binary_server_registrar import IAsyncHTTPAgentBinaryServerRegistrar
+from .i_async_propagation_credentials_repository import IAsyncPropagationCredentialsRepository
+from .i_http_agent_binary_server_registrar import IHTTPAgentBinaryServerRegistrar
+from .i_propagation_credentials_repository import (
+    IdentityType,
+    IPropagationCredentialsRepository,
+    NewCredentials,
+    NewCredentialsCallback,
+    SecretType,
+)
+
+T = TypeVar("T")
+
+
+class _SyncToAsyncAdapter:
+    def __init__(self, executor: Optional[Executor] = None):
+        """
+        :param executor: The executor that runs the blocking calls. Its number of workers bounds
+                         how many blocking calls can run at once. Defaults to the running event
+                         loop's default executor.
+        """
+        self._executor = executor
+
+    async def _run(self, fn: Callable[..., T], *args: Any) -> T:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+
+class _AsyncToSyncAdapter:
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        """
+        :param loop: A running event loop, in another thread, that runs the coroutines
+        """
+        self._loop = loop
+
+    def _run(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        try:
+            running_loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is self._loop:
+            coroutine.close()
+            raise RuntimeError(
+                "Blocking on the event loop's own thread would deadlock; "
+                "use the async interface instead"
+            )
+
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+
+class AsyncAgentBinaryRepositoryAdapter(_SyncToAsyncAdapter, IAsyncAgentBinaryRepository):
+    """
+    Exposes an IAgentBinaryRepository as an IAsyncAgentBinaryRepository
+    """
+
+    def __init__(
+        self, agent_binary_repository: IAgentBinaryRepository, executor: Optional[Executor] = None
+    ):
+        super().__init__(executor)
+        self._agent_binary_repository = agent_binary_repository
+
+    async def get_agent_binary(self, operating_system: OperatingSystem) -> io.BytesIO:
+        return await self._run(self._agent_binary_repository.get_agent_binary, operating_system)
+
+    async def open_agent_binary(self, operating_system: OperatingSystem) -> BinaryIO:
+        return await self._run(self._agent_binary_repository.open_agent_binary, operating_system)
+
+    async def get_agent_binary_view(self, operating_system: OperatingSystem) -> memoryview:
+        return await self._run(
+            self._agent_binary_repository.get_agent_binary_view, operating_system
+        )
+
+    async def get_agent_binary_size(self, operating_system: OperatingSystem) -> int:
+        return await self._run(
+            self._agent_binary_repository.get_agent_binary_size, operating_system
+        )
+
+    async def get_agent_binary_sha256(self, operating_system: OperatingSystem) -> str:
+        return await self._run(
+            self._agent_binary_repository.get_agent_binary_sha256, operating_system
+        )
+
+
+class SyncAgentBinaryRepositoryAdapter(_AsyncToSyncAdapter, IAgentBinaryRepository):
+    """
+    Exposes an IAsyncAgentBinaryRepository as an IAgentBinaryRepository
+    """
+
+    def __init__(
+        self, agent_binary_repository: IAsyncAgentBinaryRepository, loop: asyncio.AbstractEventLoop
+    ):
+        super().__init__(loop)
+        self._agent_binary_repository = agent_binary_repository
+
+    def get_agent_binary(self, operating_system: OperatingSystem) -> io.BytesIO:
+        return self._run(self._agent_binary_repository.get_agent_binary(operating_system))
+
+    def open_agent_binary(self, operating_system: OperatingSystem) -> BinaryIO:
+        return self._run(self._agent_binary_repository.open_agent_binary(operating_system))
+
+    def get_agent_binary_view(self, operating_system: OperatingSystem) -> memoryview:
+        return self._run(self._agent_binary_repository.get_agent_binary_view(operating_system))
+
+    def get_agent_binary_size(self, operating_system: OperatingSystem) -> int:
+        return self._run(self._agent_binary_repository.get_agent_binary_size(operating_system))
+
+    def get_agent_binary_sha256(self, operating_system: OperatingSystem) -> str:
+        return self._run(self._agent_binary_repository.get_agent_binary_sha256(operating_system))
+
+
+class AsyncAgentOTPProviderAdapter(_SyncToAsyncAdapter, IAsyncAgentOTPProvider):
+    """
+    Exposes an IAgentOTPProvider as an IAsyncAgentOTPProvider
+    """
+
+    def __init__(self, otp_provider: IAgentOTPProvider, executor: Optional[Executor] = None):
+        super().__init__(executor)
+        self._otp_provider = otp_provider
+
+    async def get_otp(self) -> str:
+        return await self._run(self._otp_provider.get_otp)
+
+    async def get_otps(self, count: int) -> List[str]:
+        return await self._run(self._otp_provider.get_otps, count)
+
+
+class SyncAgentOTPProviderAdapter(_AsyncToSyncAdapter, IAgentOTPProvider):
+    """
+    Exposes an IAsyncAgentOTPProvider as an IAgentOTPProvider
+    """
+
+    def __init__(self, otp_provider: IAsyncAgentOTPProvider, loop: asyncio.AbstractEventLoop):
+        super().__init__(loop)
+        self._otp_provider = otp_provider
+
+    def get_otp(self) -> str:
+        return self._run(self._otp_provider.get_otp())
+
+    def get_otps(self, count: int) -> List[str]:
+        return self._run(self._otp_provider.get_otps(count))
+
+
+class AsyncHTTPAgentBinaryServerRegistrarAdapter(
+    _SyncToAsyncAdapter, IAsyncHTTPAgentBinaryServerRegistrar
+):
+    """
+    Exposes an IHTTPAgentBinaryServerRegistrar as an IAsyncHTTPAgentBinaryServerRegistrar
+    """
+
+    def __init__(
+        self, registrar: IHTTPAgentBinaryServerRegistrar, executor: Optional[Executor] = None
+    ):
+        super().__init__(executor)
+        self._registrar = registrar
+
+    async def reserve_download(
+        self,
+        operating_system: OperatingSystem,
+        requestor_ip: IPv4Address,
+        agent_binary_wrapper_template: Optional[bytes],
+    ) -> AgentBinaryDownloadTicket:
+        return await self._run(
+            self._registrar.reserve_download,
+            operating_system,
+            requestor_ip,
+            agent_binary_wrapper_template,
+        )
+
+    async def reserve_compiled_download(
+        self,
+        operating_system: OperatingSystem,
+        requestor_ip: IPv4Address,
+        agent_binary_wrapper_template: AgentBinaryWrapperTemplate,
+    ) -> AgentBinaryDownloadTicket:
+        return await self._run(
+            self._registrar.reserve_compiled_download,
+            operating_system,
+            requestor_ip,
+            agent_binary_wrapper_template,
+        )
+
+    async def clear_reservation(self, reservation_id: ReservationID):
+        await self._run(self._registrar.clear_reservation, reservation_id)
+
+    async def reserve_downloads(
+        self, requests: Sequence[AgentBinaryDownloadRequest]
+    ) -> List[AgentBinaryDownloadTicket]:
+        return await self._run(self._registrar.reserve_downloads, requests)
+
+    async def clear_reservations(self, reservation_ids: Iterable[ReservationID]):
+        await self._run(self._registrar.clear_reservations, list(reservation_ids))
+
+
+class SyncHTTPAgentBinaryServerRegistrarAdapter(
+    _AsyncToSyncAdapter, IHTTPAgentBinaryServerRegistrar
+):
+    """
+    Exposes an IAsyncHTTPAgentBinaryServerRegistrar as an IHTTPAgentBinaryServerRegistrar
+    """
+
+    def __init__(
+        self, registrar: IAsyncHTTPAgentBinaryServerRegistrar, loop: asyncio.AbstractEventLoop
+    ):
+        super().__init__(loop)
+        self._registrar = registrar
+
+    def reserve_download(
+        self,
+        operating_system: OperatingSystem,
+        requestor_ip: IPv4Address,
+        agent_binary_wrapper_template: Optional[bytes],
+    ) -> AgentBinaryDownloadTicket:
+        return self._run(
+            self._registrar.reserve_download(
+                operating_system, requestor_ip, agent_binary_wrapper_template
+            )
+        )
+
+    def reserve_compiled_download(
+        self,
+        operating_system: OperatingSystem,
+        requestor_ip: IPv4Address,
+        agent_binary_wrapper_template: AgentBinaryWrapperTemplate,
+    ) -> AgentBinaryDownloadTicket:
+        return self._run(
+            self._registrar.reserve_compiled_download(
+                operating_system, requestor_ip, agent_binary_wrapper_template
+            )
+        )
+
+    def clear_reservation(self, reservation_id: ReservationID):
+        self._run(self._registrar.clear_reservation(reservation_id))
+
+    def reserve_downloads(
+        self, requests: Sequence[AgentBinaryDownloadRequest]
+    ) -> List[AgentBinaryDownloadTicket]:
+        return self._run(self._registrar.reserve_downloads(requests))
+
+    def clear_reservations(self, reservation_ids: Iterable[ReservationID]):
+        self._run(self._registrar.clear_reservations(list(reservation_ids)))
+
+
+class AsyncAgentEventPublisherAdapter(_SyncToAsyncAdapter, IAsyncAgentEventPublisher):
+    """
+    Exposes an IAgentEventPublisher as an IAsyncAgentEventPublisher
+    """
+
+    def __init__(
+        self, agent_event_publisher: IAgentEventPublisher, executor: Optional[Executor] = None
+    ):
+        super().__init__(executor)
+        self._agent_event_publisher = agent_event_publisher
+
+    async def publish(self, event: AbstractAgentEvent):
+        await self._run(self._agent_event_publisher.publish, event)
+
+    async def publish_many(self, events: Iterable[AbstractAgentEvent]):
+        await self._run(self._agent_event_publisher.publish_many, list(events))
+
+
+class SyncAgentEventPublisherAdapter(_AsyncToSyncAdapter, IAgentEventPublisher):
+    """
+    Exposes an IAsyncAgentEventPublisher as an IAgentEventPublisher
+    """
+
+    def __init__(
+        self, agent_event_publisher: IAsyncAgentEventPublisher, loop: asyncio.AbstractEventLoop
+    ):
+        super().__init__(loop)
+        self._agent_event_publisher = agent_event_publisher
+
+    def publish(self, event: AbstractAgentEvent):
+        self._run(self._agent_event_publisher.publish(event))
+
+    def publish_many(self, events: Iterable[AbstractAgentEvent]):
+        self._run(self._agent_event_publisher.publish_many(list(events)))
+
+
+class AsyncPropagationCredentialsRepositoryAdapter(
+    _SyncToAsyncAdapter, IAsyncPropagationCredentialsRepository
+):
+    """
+    Exposes an IPropagationCredentialsRepository as an IAsyncPropagationCredentialsRepository
+    """
+
+    def __init__(
+        self,
+        propagation_credentials_repository: IPropagationCredentialsRepository,
+        executor: Optional[Executor] = None,
+    ):
+        super().__init__(executor)
+        self._propagation_credentials_repository = propagation_credentials_repository
+
+    async def add_credentials(self, credentials_to_add: Iterable[Credentials]):
+        await self._run(
+            self._propagation_credentials_repository.add_credentials, list(credentials_to_add)
+        )
+
+    async def get_credentials(self) -> Iterable[Credentials]:
+        # The credentials are collected on the executor in case they are retrieved lazily
+        return await self._run(self._get_credentials)
+
+    async def find_credentials(
+        self,
+        identity_type: Optional[IdentityType] = None,
+        secret_type: Optional[SecretType] = None,
+        username: Optional[str] = None,
+    ) -> Iterable[Credentials]:
+        return await self._run(self._find_credentials, identity_type, secret_type, username)
+
+    async def get_credentials_since(self, generation: int) -> NewCredentials:
+        return await self._run(
+            self._propagation_credentials_repository.get_credentials_since, generation
+        )
+
+    async def subscribe_to_new_credentials(self, callback: NewCredentialsCallback):
+        await self._run(
+            self._propagation_credentials_repository.subscribe_to_new_credentials, callback
+        )
+
+    async def unsubscribe_from_new_credentials(self, callback: NewCredentialsCallback):
+        await self._run(
+            self._propagation_credentials_repository.unsubscribe_from_new_credentials, callback
+        )
+
+    def _get_credentials(self) -> List[Credentials]:
+        return list(self._propagation_credentials_repository.get_credentials())
+
+    def _find_credentials(
+        self,
+        identity_type: Optional[IdentityType],
+        secret_type: Optional[SecretType],
+        username: Optional[str],
+    ) -> List[Credentials]:
+        return list(
+            self._propagation_credentials_repository.find_credentials(
+                identity_type, secret_type, username
+            )
+        )
+
+
+class SyncPropagationCredentialsRepositoryAdapter(
+    _AsyncToSyncAdapter, IPropagationCredentialsRepository
+):
+    """
+    Exposes an IAsyncPropagationCredentialsRepository as an IPropagationCredentialsRepository
+    """
+
+    def __init__(
+        self,
+        propagation_credentials_repository: IAsyncPropagationCredentialsRepository,
+        loop: asyncio.AbstractEventLoop,
+    ):
+        super().__init__(loop)
+        self._propagation_credentials_repository = propagation_credentials_repository
+
+    def add_credentials(self, credentials_to_add: Iterable[Credentials]):
+        self._run(
+            self._propagation_credentials_repository.add_credentials(list(credentials_to_add))
+        )
+
+    def get_credentials(self) -> Iterable[Credentials]:
+        return self._run(self._propagation_credentials_repository.get_credentials())
+
+    def get_credentials_since(self, generation: int) -> NewCredentials:
+        return self._run(self._propagation_credentials_repository.get_credentials_since(generation))
+
+    def subscribe_to_new_credentials(self, callback: NewCredentialsCallback):
+        self._run(self._propagation_credentials_repository.subscribe_to_new_credentials(callback))
+
+    def unsubscribe_from_new_credentials(self, callback: NewCredentialsCallback):
+        self._run(
+            self._propagation_credentials_repository.unsubscribe_from_new_credentials(callback)
+        )
+
+    def find_credentials(
+        self,
+        identity_type: Optional[IdentityType] = None,
+        secret_type: Optional[SecretType] = None,
+        username: Optional[str] = None,
+    ) -> Iterable[Credentials]:
+        return self._run(
+            self._propagation_credentials_repository.find_credentials(
+                identity_type, secret_type, username
+            )
+        )
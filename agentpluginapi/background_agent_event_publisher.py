@@ -0,0 +1,243 @@
+import logging
+import queue
+import threading
+import time
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from monkeyevents import AbstractAgentEvent
+from monkeytoolbox import create_daemon_thread
+
+from .i_agent_event_publishler import IAgentEventPublisher
+from .overflow_policy import OverflowPolicy
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_QUEUE_SIZE = 10_000
+DEFAULT_MAX_BATCH_SIZE = 100
+
+# Queued by stop() after all of the events that were published before it
+_STOP = object()
+
+
+class AgentEventPublisherMetrics(NamedTuple):
+    queue_depth: int
+    published_events: int
+    dropped_events: int
+    failed_events: int
+    mean_latency_sec: float
+    max_latency_sec: float
+
+
+class BackgroundAgentEventPublisher(IAgentEventPublisher):
+    """
+    An IAgentEventPublisher that publishes events on a background thread
+
+    publish() only adds the event to a bounded queue, so plugins can publish events from their hot
+    loops without waiting for another IAgentEventPublisher to publish them. A worker thread drains
+    the queue and passes the events on in batches of up to `max_batch_size` events.
+
+    By default, events that are published while the queue is full are dropped so that publishers
+    are never stalled. stop() delivers all of the events that were queued before it was called.
+    """
+
+    def __init__(
+        self,
+        agent_event_publisher: IAgentEventPublisher,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        overflow_policy: OverflowPolicy = OverflowPolicy.DROP,
+    ):
+        """
+        :param agent_event_publisher: The publisher that the events are passed to
+        :param max_queue_size: The maximum number of events that can be queued
+        :param max_batch_size: The maximum number of events that are passed on at once
+        :param overflow_policy: What to do with an event that is published when the queue is full
+        :raises ValueError: If max_queue_size or max_batch_size is less than 1
+        """
+        if max_queue_size < 1:
+            raise ValueError(f"max_queue_size must be at least 1, got {max_queue_size}")
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be at least 1, got {max_batch_size}")
+
+        self._agent_event_publisher = agent_event_publisher
+        self._max_batch_size = max_batch_size
+        self._overflow_policy = overflow_policy
+
+        self._queue: queue.Queue[Tuple[float, AbstractAgentEvent] | object] = queue.Queue(
+            maxsize=max_queue_size
+        )
+
+        self._state_lock = threading.Lock()
+        # Notified when the worker takes events from the queue or the publisher is stopped
+        self._room_available = threading.Condition(self._state_lock)
+        self._stopped = False
+        self._worker: Optional[threading.Thread] = None
+
+        self._metrics_lock = threading.Lock()
+        self._published_events = 0
+        self._dropped_events = 0
+        self._failed_events = 0
+        self._total_latency_sec = 0.0
+        self._max_latency_sec = 0.0
+
+    @property
+    def metrics(self) -> AgentEventPublisherMetrics:
+        """
+        Statistics about the events that were published
+
+        Latency is measured from when an event is published to when the underlying publisher
+        finishes publishing it.
+        """
+        with self._metrics_lock:
+            delivered_events = self._published_events + self._failed_events
+            return AgentEventPublisherMetrics(
+                queue_depth=self._queue.qsize(),
+                published_events=self._published_events,
+                dropped_events=self._dropped_events,
+                failed_events=self._failed_events,
+                mean_latency_sec=(
+                    self._total_latency_sec / delivered_events if delivered_events else 0.0
+                ),
+                max_latency_sec=self._max_latency_sec,
+            )
+
+    def start(self):
+        """
+        Start publishing queued events on a background thread
+        """
+        with self._state_lock:
+            if self._worker is not None or self._stopped:
+                raise RuntimeError("The publisher has already been started or stopped")
+
+            self._worker = create_daemon_thread(
+                target=self._run, name="BackgroundAgentEventPublisher"
+            )
+            self._worker.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Publish all queued events and stop the background thread
+
+        Events that are published after stop() is called are rejected. If start() was never
+        called, the queued events are published on the calling thread.
+
+        :param timeout: The number of seconds to wait for the queued events to be published. If
+                        None, wait until they are all published.
+        """
+        with self._state_lock:
+            if self._stopped:
+                return
+            self._stopped = True
+            self._room_available.notify_all()
+
+            if self._worker is not None:
+                self._queue.put(_STOP)
+
+        if self._worker is None:
+            self._publish_queued_events(block=False)
+            return
+
+        self._worker.join(timeout)
+        if self._worker.is_alive():
+            logger.warning(
+                f"Timed out waiting for {self._queue.qsize()} queued events to be published"
+            )
+
+    def publish(self, event: AbstractAgentEvent):
+        """
+        Queue an event to be published on the background thread
+
+        With OverflowPolicy.BLOCK, this waits for room in the queue. Other publishers and stop()
+        are not held up while it waits.
+
+        :param event: Event to publish
+        :raises RuntimeError: If the publisher has been stopped, or if it must wait for room in the
+                              queue but start() hasn't been called
+        """
+        self._enqueue((event,))
+
+    def publish_many(self, events: Iterable[AbstractAgentEvent]):
+        """
+        Queue events to be published on the background thread
+
+        :param events: Events to publish, in order
+        :raises RuntimeError: If the publisher has been stopped, or if it must wait for room in the
+                              queue but start() hasn't been called
+        """
+        self._enqueue(events)
+
+    def _enqueue(self, events: Iterable[AbstractAgentEvent]):
+        # The state lock guarantees that no event is queued after _STOP. It's released while
+        # waiting for room in the queue.
+        with self._state_lock:
+            for event in events:
+                while not self._put(event):
+                    if self._worker is None:
+                        raise RuntimeError(
+                            "The queue is full, and it won't be drained until start() is called"
+                        )
+                    self._room_available.wait()
+
+    def _put(self, event: AbstractAgentEvent) -> bool:
+        if self._stopped:
+            raise RuntimeError("Cannot publish events after the publisher has been stopped")
+
+        try:
+            self._queue.put_nowait((time.monotonic(), event))
+        except queue.Full:
+            if self._overflow_policy == OverflowPolicy.BLOCK:
+                return False
+
+            with self._metrics_lock:
+                self._dropped_events += 1
+
+        return True
+
+    def _run(self):
+        self._publish_queued_events(block=True)
+
+    def _publish_queued_events(self, block: bool):
+        while True:
+            stop, batch = self._get_batch(block)
+            if batch:
+                with self._room_available:
+                    self._room_available.notify_all()
+                self._publish_batch(batch)
+            if stop:
+                return
+
+    def _get_batch(self, block: bool) -> Tuple[bool, List[Tuple[float, AbstractAgentEvent]]]:
+        batch: List[Tuple[float, AbstractAgentEvent]] = []
+        try:
+            item = self._queue.get(block)
+            while item is not _STOP:
+                batch.append(item)  # type: ignore [arg-type]
+                if len(batch) >= self._max_batch_size:
+                    return False, batch
+
+                item = self._queue.get_nowait()
+        except queue.Empty:
+            # When not blocking, an empty queue means that there is nothing left to publish
+            return not block, batch
+
+        return True, batch
+
+    def _publish_batch(self, batch: List[Tuple[float, AbstractAgentEvent]]):
+        try:
+            self._agent_event_publisher.publish_many([event for _, event in batch])
+            published = True
+        except Exception:
+            logger.exception(f"Failed to publish a batch of {len(batch)} events")
+            published = False
+
+        now = time.monotonic()
+        with self._metrics_lock:
+            if published:
+                self._published_events += len(batch)
+            else:
+                self._failed_events += len(batch)
+
+            for published_at, _ in batch:
+                latency_sec = now - published_at
+                self._total_latency_sec += latency_sec
+                self._max_latency_sec = max(self._max_latency_sec, latency_sec)
@@ -0,0 +1,209 @@
+import heapq
+import logging
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from eggtimer import EggTimer
+from monkeytypes import NetworkPort
+
+from .i_tcp_port_selector import ITCPPortSelector
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_INTERVAL_SEC = 1.0
+PROC_NET_TCP_PATHS = (Path("/proc/net/tcp"), Path("/proc/net/tcp6"))
+NUM_PORTS = 65536
+
+
+# Random ports are tried this many times before falling back to scanning the whole range
+MAX_RANDOM_PORT_ATTEMPTS = 8
+
+
+def _get_lowest_set_bit(bitmap: int) -> int:
+    return (bitmap & -bitmap).bit_length() - 1
+
+
+def _is_set(bitmap: bytearray, port: int) -> bool:
+    return bool(bitmap[port >> 3] & (1 << (port & 7)))
+
+
+def _set(bitmap: bytearray, port: int):
+    bitmap[port >> 3] |= 1 << (port & 7)
+
+
+def _clear(bitmap: bytearray, port: int):
+    bitmap[port >> 3] &= ~(1 << (port & 7))
+
+
+class BitmapTCPPortSelector(ITCPPortSelector):
+    """
+    An ITCPPortSelector that tracks used ports in bitmaps
+
+    The ports that the OS reports as in use are read from /proc/net/tcp and /proc/net/tcp6 into a
+    65536-bit bitmap, which is refreshed at most every `refresh_interval_sec` seconds rather than
+    on every call. Leased ports are kept in a second bitmap. A port is selected by testing a few
+    random ports in the bitmaps, and the whole range is only scanned if they are all in use, so
+    selecting a port does not depend on how many sockets are open. Selectors can be shared by many
+    threads.
+
+    Preferred ports are tried even if they are not between `min_range` and `max_range`, which only
+    limit the ports that are chosen at random. Preferred ports that are not valid port numbers are
+    skipped.
+
+    On systems without /proc/net/tcp, only leased ports are considered to be in use.
+    """
+
+    def __init__(
+        self,
+        refresh_interval_sec: float = DEFAULT_REFRESH_INTERVAL_SEC,
+        proc_net_tcp_paths: Sequence[Path] = PROC_NET_TCP_PATHS,
+    ):
+        """
+        :param refresh_interval_sec: The maximum age, in seconds, of the ports in use that are read
+                                     from the OS
+        :param proc_net_tcp_paths: The files that the ports in use are read from
+        """
+        self._refresh_interval_sec = refresh_interval_sec
+        self._proc_net_tcp_paths = proc_net_tcp_paths
+
+        self._lock = threading.Lock()
+        self._refresh_timer = EggTimer()
+        self._refresh_timer.set(0)
+
+        # Bit N of each bitmap is set if port N is reported in use by the OS or leased, respectively
+        self._ports_in_use = bytearray(NUM_PORTS // 8)
+        self._leased_ports = bytearray(NUM_PORTS // 8)
+
+        self._lease_expiration_times: Dict[int, float] = {}
+        # (expiration time, port), which may include leases that have since been released
+        self._lease_expiration_heap: List[Tuple[float, int]] = []
+
+    def get_free_tcp_port(
+        self,
+        min_range: int = 1024,
+        max_range: int = 65535,
+        lease_time_sec: float = 30,
+        preferred_ports: Sequence[NetworkPort] = [],
+    ) -> Optional[NetworkPort]:
+        ports = self.get_free_tcp_ports(1, min_range, max_range, lease_time_sec, preferred_ports)
+        return ports[0] if ports else None
+
+    def get_free_tcp_ports(
+        self,
+        count: int,
+        min_range: int = 1024,
+        max_range: int = 65535,
+        lease_time_sec: float = 30,
+        preferred_ports: Sequence[NetworkPort] = [],
+    ) -> List[NetworkPort]:
+        min_range = max(min_range, 0)
+        max_range = min(max_range, NUM_PORTS - 1)
+
+        with self._lock:
+            self._refresh_ports_in_use()
+            self._expire_leases()
+
+            ports: List[NetworkPort] = []
+            for port in preferred_ports:
+                if len(ports) >= count:
+                    break
+                if 0 <= port < NUM_PORTS and not self._is_used(port):
+                    self._lease(port, lease_time_sec)
+                    ports.append(port)
+
+            while len(ports) < count and min_range <= max_range:
+                free_port = self._find_free_port(min_range, max_range)
+                if free_port is None:
+                    break
+
+                self._lease(free_port, lease_time_sec)
+                ports.append(free_port)
+
+        return ports
+
+    def release(self, ports: Iterable[NetworkPort]):
+        with self._lock:
+            for port in ports:
+                if self._lease_expiration_times.pop(port, None) is not None:
+                    _clear(self._leased_ports, port)
+
+    def _is_used(self, port: int) -> bool:
+        return _is_set(self._ports_in_use, port) or _is_set(self._leased_ports, port)
+
+    def _find_free_port(self, min_range: int, max_range: int) -> Optional[int]:
+        # Most ports are usually free, so a few random attempts almost always find one
+        for _ in range(MAX_RANDOM_PORT_ATTEMPTS):
+            port = random.randint(min_range, max_range)
+            if not self._is_used(port):
+                return port
+
+        return self._scan_for_free_port(min_range, max_range)
+
+    def _scan_for_free_port(self, min_range: int, max_range: int) -> Optional[int]:
+        used_ports = int.from_bytes(self._ports_in_use, "little") | int.from_bytes(
+            self._leased_ports, "little"
+        )
+        range_mask = ((1 << (max_range - min_range + 1)) - 1) << min_range
+        free_ports = ~used_ports & range_mask
+        if not free_ports:
+            return None
+
+        # Choose the first free port at or after a random port, wrapping around to the start
+        start = random.randint(min_range, max_range)
+        free_ports_from_start = free_ports >> start
+        if free_ports_from_start:
+            return start + _get_lowest_set_bit(free_ports_from_start)
+
+        return _get_lowest_set_bit(free_ports)
+
+    def _lease(self, port: int, lease_time_sec: float):
+        expiration_time = time.monotonic() + lease_time_sec
+        _set(self._leased_ports, port)
+        self._lease_expiration_times[port] = expiration_time
+        heapq.heappush(self._lease_expiration_heap, (expiration_time, port))
+
+    def _expire_leases(self):
+        now = time.monotonic()
+        while self._lease_expiration_heap and self._lease_expiration_heap[0][0] <= now:
+            expiration_time, port = heapq.heappop(self._lease_expiration_heap)
+
+            # The port may have been released, or released and leased again, since
+            if self._lease_expiration_times.get(port) == expiration_time:
+                del self._lease_expiration_times[port]
+                _clear(self._leased_ports, port)
+
+    def _refresh_ports_in_use(self):
+        if not self._refresh_timer.is_expired():
+            return
+
+        ports_in_use = bytearray(NUM_PORTS // 8)
+        for path in self._proc_net_tcp_paths:
+            for port in self._read_ports_in_use(path):
+                _set(ports_in_use, port)
+
+        self._ports_in_use = ports_in_use
+        self._refresh_timer.set(self._refresh_interval_sec)
+
+    @staticmethod
+    def _read_ports_in_use(path: Path) -> Iterable[int]:
+        try:
+            with open(path) as f:
+                lines = f.readlines()
+        except OSError as err:
+            logger.debug(f"Unable to read the ports in use from {path}: {err}")
+            return []
+
+        # Each line after the header starts with "<sl>: <local address>:<port in hex> ..."
+        ports = []
+        for line in lines[1:]:
+            fields = line.split(None, 2)
+            if len(fields) < 2:
+                continue
+
+            local_address = fields[1]
+            ports.append(int(local_address[local_address.rfind(":") + 1 :], 16))
+
+        return ports
@@ -0,0 +1,151 @@
+import logging
+import queue
+import threading
+from typing import Iterable, List, Optional
+
+from monkeyevents import AbstractAgentEvent
+from monkeytoolbox import PeriodicCaller
+
+from .i_agent_event_publishler import IAgentEventPublisher
+from .overflow_policy import OverflowPolicy
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BATCH_SIZE = 100
+DEFAULT_MAX_BATCH_DELAY_SEC = 1.0
+DEFAULT_MAX_QUEUE_SIZE = 10_000
+
+
+class BufferingAgentEventPublisher(IAgentEventPublisher):
+    """
+    An IAgentEventPublisher that coalesces events into batches
+
+    Published events are queued and passed to another IAgentEventPublisher's publish_many() in
+    batches of up to `max_batch_size` events, so that the per-event cost of publishing is
+    amortized. A full batch is published by the thread that fills it. Once start() is called,
+    queued events are also published at least every `max_batch_delay_sec` seconds, so that events
+    are not held indefinitely when few are published.
+
+    If events are published faster than they can be passed on, the queue fills up and the
+    `overflow_policy` determines whether publishers wait for room in the queue or the events are
+    dropped.
+    """
+
+    def __init__(
+        self,
+        agent_event_publisher: IAgentEventPublisher,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_batch_delay_sec: float = DEFAULT_MAX_BATCH_DELAY_SEC,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK,
+    ):
+        """
+        :param agent_event_publisher: The publisher that the batches of events are passed to
+        :param max_batch_size: The maximum number of events in a batch
+        :param max_batch_delay_sec: The maximum time, in seconds, that an event is queued for once
+                                    start() has been called
+        :param max_queue_size: The maximum number of events that can be queued
+        :param overflow_policy: What to do with an event that is published when the queue is full
+        :raises ValueError: If max_batch_size is less than 1 or max_queue_size is less than
+                            max_batch_size
+        """
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be at least 1, got {max_batch_size}")
+        if max_queue_size < max_batch_size:
+            raise ValueError(
+                f"max_queue_size ({max_queue_size}) must be at least max_batch_size "
+                f"({max_batch_size})"
+            )
+
+        self._agent_event_publisher = agent_event_publisher
+        self._max_batch_size = max_batch_size
+        self._overflow_policy = overflow_policy
+
+        self._queue: queue.Queue[AbstractAgentEvent] = queue.Queue(maxsize=max_queue_size)
+        self._publish_lock = threading.Lock()
+
+        self._dropped_events = 0
+        self._dropped_events_lock = threading.Lock()
+
+        self._periodic_flusher = PeriodicCaller(
+            self.flush, max_batch_delay_sec, name="BufferingAgentEventPublisher"
+        )
+
+    @property
+    def dropped_events(self) -> int:
+        """
+        The number of events that were dropped because the queue was full
+        """
+        return self._dropped_events
+
+    def start(self):
+        """
+        Start publishing queued events every `max_batch_delay_sec` seconds in the background
+        """
+        self._periodic_flusher.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stop publishing queued events in the background and publish any events that remain queued
+
+        :param timeout: The number of seconds to wait for the background publishing to stop
+        """
+        self._periodic_flusher.stop(timeout)
+        self.flush()
+
+    def publish(self, event: AbstractAgentEvent):
+        self._enqueue(event)
+        self._publish_full_batches()
+
+    def publish_many(self, events: Iterable[AbstractAgentEvent]):
+        for event in events:
+            self._enqueue(event)
+            self._publish_full_batches()
+
+    def flush(self):
+        """
+        Publish all queued events, including a partial batch
+        """
+        with self._publish_lock:
+            while batch := self._get_batch():
+                self._publish_batch(batch)
+
+    def _enqueue(self, event: AbstractAgentEvent):
+        if self._overflow_policy == OverflowPolicy.BLOCK:
+            self._queue.put(event)
+            return
+
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            with self._dropped_events_lock:
+                self._dropped_events += 1
+
+    def _publish_full_batches(self):
+        # If another thread is already publishing, it re-checks the queue after it releases the
+        # lock, so no full batch is left behind
+        while self._queue.qsize() >= self._max_batch_size:
+            if not self._publish_lock.acquire(blocking=False):
+                return
+
+            try:
+                while self._queue.qsize() >= self._max_batch_size:
+                    self._publish_batch(self._get_batch())
+            finally:
+                self._publish_lock.release()
+
+    def _get_batch(self) -> List[AbstractAgentEvent]:
+        batch: List[AbstractAgentEvent] = []
+        try:
+            while len(batch) < self._max_batch_size:
+                batch.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+
+        return batch
+
+    def _publish_batch(self, batch: List[AbstractAgentEvent]):
+        try:
+            self._agent_event_publisher.publish_many(batch)
+        except Exception:
+            logger.exception(f"Failed to publish a batch of {len(batch)} events")
@@ -0,0 +1,154 @@
+import hashlib
+import io
+import logging
+import mmap
+import shutil
+import threading
+from pathlib import Path
+from typing import BinaryIO, Dict, Optional
+
+from monkeytoolbox import insecure_generate_random_string, open_new_securely_permissioned_file
+from monkeytypes import OperatingSystem
+
+from .i_agent_binary_repository import IAgentBinaryRepository, RetrievalError
+
+logger = logging.getLogger(__name__)
+
+
+class _CachedAgentBinary:
+    def __init__(self, path: Path):
+        self.path = path
+        self.size = path.stat().st_size
+        self.sha256: Optional[str] = None
+
+        self._file = open(path, "rb")
+        # mmap can't map empty files
+        self._mmap = (
+            mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size > 0 else None
+        )
+
+    def view(self) -> memoryview:
+        if self._mmap is None:
+            return memoryview(b"")
+
+        return memoryview(self._mmap)
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
+
+
+class CachingAgentBinaryRepository(IAgentBinaryRepository):
+    """
+    An IAgentBinaryRepository that retrieves each agent binary only once and shares it
+
+    Each agent binary is retrieved from another IAgentBinaryRepository the first time it is
+    requested and stored in a file in the cache directory (e.g.
+    `LocalMachineInfo.temporary_directory`). If several threads request the same agent binary
+    before it is cached, only one of them retrieves it and the others wait for it.
+
+    Cached agent binaries are memory-mapped, so get_agent_binary_view() returns read-only views of
+    a single copy that is shared by all callers, and open_agent_binary() streams from the cached
+    file.
+    """
+
+    def __init__(self, agent_binary_repository: IAgentBinaryRepository, cache_directory: Path):
+        """
+        :param agent_binary_repository: The repository to retrieve agent binaries from
+        :param cache_directory: A directory where the agent binaries will be stored
+        """
+        self._agent_binary_repository = agent_binary_repository
+        self._cache_directory = cache_directory
+
+        self._cached_agent_binaries: Dict[OperatingSystem, _CachedAgentBinary] = {}
+        self._locks = {operating_system: threading.Lock() for operating_system in OperatingSystem}
+
+    def get_agent_binary(self, operating_system: OperatingSystem) -> io.BytesIO:
+        """
+        Retrieve the appropriate agent binary from the repository.
+
+        The returned BytesIO is a private copy of the agent binary. Use get_agent_binary_view() or
+        open_agent_binary() to avoid copying it.
+
+        :param operating_system: The name of the operating system on which the agent binary will run
+        :return: A file-like object for the requested agent binary
+        :raises RetrievalError: If an error occurs when retrieving the agent binary
+        """
+        with self._get_cached_agent_binary(operating_system).view() as view:
+            return io.BytesIO(view)
+
+    def get_agent_binary_view(self, operating_system: OperatingSystem) -> memoryview:
+        return self._get_cached_agent_binary(operating_system).view()
+
+    def open_agent_binary(self, operating_system: OperatingSystem) -> BinaryIO:
+        path = self._get_cached_agent_binary(operating_system).path
+        try:
+            return open(path, "rb")
+        except OSError as err:
+            raise RetrievalError(
+                f"Failed to open the cached {operating_system} agent binary: {err}"
+            ) from err
+
+    def get_agent_binary_size(self, operating_system: OperatingSystem) -> int:
+        return self._get_cached_agent_binary(operating_system).size
+
+    def get_agent_binary_sha256(self, operating_system: OperatingSystem) -> str:
+        cached_agent_binary = self._get_cached_agent_binary(operating_system)
+        with self._locks[operating_system]:
+            if cached_agent_binary.sha256 is None:
+                with cached_agent_binary.view() as view:
+                    cached_agent_binary.sha256 = hashlib.sha256(view).hexdigest()
+
+        return cached_agent_binary.sha256
+
+    def close(self):
+        """
+        Unmap and delete all cached agent binaries
+
+        All views returned by get_agent_binary_view() must be released before this is called.
+
+        :raises BufferError: If a view of a cached agent binary has not been released
+        """
+        for operating_system, lock in self._locks.items():
+            with lock:
+                cached_agent_binary = self._cached_agent_binaries.pop(operating_system, None)
+                if cached_agent_binary is None:
+                    continue
+
+                cached_agent_binary.close()
+                cached_agent_binary.path.unlink(missing_ok=True)
+
+    def _get_cached_agent_binary(self, operating_system: OperatingSystem) -> _CachedAgentBinary:
+        # Most calls find the agent binary already cached, so the lock is only acquired on a miss
+        cached_agent_binary = self._cached_agent_binaries.get(operating_system)
+        if cached_agent_binary is not None:
+            return cached_agent_binary
+
+        with self._locks[operating_system]:
+            cached_agent_binary = self._cached_agent_binaries.get(operating_system)
+            if cached_agent_binary is None:
+                cached_agent_binary = self._cache_agent_binary(operating_system)
+                self._cached_agent_binaries[operating_system] = cached_agent_binary
+
+        return cached_agent_binary
+
+    def _cache_agent_binary(self, operating_system: OperatingSystem) -> _CachedAgentBinary:
+        logger.debug(f"Caching the {operating_system} agent binary in {self._cache_directory}")
+
+        agent_binary = self._agent_binary_repository.get_agent_binary(operating_system)
+        path = self._cache_directory / (
+            f"{operating_system.value}-agent-binary-{insecure_generate_random_string(8)}"
+        )
+
+        try:
+            with open_new_securely_permissioned_file(str(path), "wb") as f:
+                agent_binary.seek(0)
+                shutil.copyfileobj(agent_binary, f)
+
+            return _CachedAgentBinary(path)
+        except OSError as err:
+            path.unlink(missing_ok=True)
+            raise RetrievalError(
+                f"Failed to cache the {operating_system} agent binary: {err}"
+            ) from err
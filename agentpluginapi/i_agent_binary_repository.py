@@ -1,5 +1,7 @@
 import abc
+import hashlib
 import io
+from typing import BinaryIO
 
 from monkeytypes import OperatingSystem
 
@@ -31,3 +33,59 @@ class IAgentBinaryRepository(metaclass=abc.ABCMeta):
         :return: A file-like object for the requested agent binary
         :raises RetrievalError: If an error occurs when retrieving the agent binary
         """
+
+    def open_agent_binary(self, operating_system: OperatingSystem) -> BinaryIO:
+        """
+        Open the appropriate agent binary for reading, so that it can be streamed to a victim
+
+        Unlike get_agent_binary(), the returned file-like object does not need to hold the whole
+        agent binary in memory. The caller is responsible for closing it. The default
+        implementation returns a new file-like object with the contents of the result of
+        get_agent_binary(), so closing it doesn't close a file-like object that the repository
+        may reuse; repositories that can stream the agent binary from a file or other source should
+        override it.
+
+        :param operating_system: The name of the operating system on which the agent binary will run
+        :return: A seekable, read-only file-like object for the requested agent binary
+        :raises RetrievalError: If an error occurs when retrieving the agent binary
+        """
+        return io.BytesIO(self.get_agent_binary(operating_system).getvalue())
+
+    def get_agent_binary_view(self, operating_system: OperatingSystem) -> memoryview:
+        """
+        Get a read-only view of the appropriate agent binary
+
+        Repositories that cache agent binaries may return views of a single copy that is shared by
+        all callers, so callers must not rely on being able to modify the view. Callers should
+        release the view when they are done with it. The default implementation returns a view of
+        a copy of the result of get_agent_binary().
+
+        :param operating_system: The name of the operating system on which the agent binary will run
+        :return: A read-only view of the requested agent binary
+        :raises RetrievalError: If an error occurs when retrieving the agent binary
+        """
+        return memoryview(self.get_agent_binary(operating_system).getvalue())
+
+    def get_agent_binary_size(self, operating_system: OperatingSystem) -> int:
+        """
+        Get the size of the appropriate agent binary
+
+        :param operating_system: The name of the operating system on which the agent binary will run
+        :return: The size of the requested agent binary in bytes
+        :raises RetrievalError: If an error occurs when retrieving the agent binary
+        """
+        # The result of get_agent_binary() may be reused by the repository, so it's neither closed
+        # nor read from, which would move its position
+        with self.get_agent_binary(operating_system).getbuffer() as agent_binary:
+            return agent_binary.nbytes
+
+    def get_agent_binary_sha256(self, operating_system: OperatingSystem) -> str:
+        """
+        Get the SHA-256 digest of the appropriate agent binary
+
+        :param operating_system: The name of the operating system on which the agent binary will run
+        :return: The hex-encoded SHA-256 digest of the requested agent binary
+        :raises RetrievalError: If an error occurs when retrieving the agent binary
+        """
+        with self.get_agent_binary(operating_system).getbuffer() as agent_binary:
+            return hashlib.sha256(agent_binary).hexdigest()
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Iterable
 
 from monkeyevents import AbstractAgentEvent
 
@@ -15,3 +16,16 @@ class IAgentEventPublisher(ABC):
 
         :param event: Event to publish
         """
+
+    def publish_many(self, events: Iterable[AbstractAgentEvent]):
+        """
+        Publishes many events at once
+
+        Publishers should override this if they can publish a batch of events more cheaply than
+        publishing each event individually. The default implementation calls publish() for each
+        event.
+
+        :param events: Events to publish, in order
+        """
+        for event in events:
+            self.publish(event)
@@ -1,4 +1,5 @@
 import abc
+from typing import List
 
 
 class IAgentOTPProvider(metaclass=abc.ABCMeta):
@@ -16,3 +17,17 @@ class IAgentOTPProvider(metaclass=abc.ABCMeta):
         :return: An OTP
         :raises RuntimeError: If an OTP cannot be retrieved
         """
+
+    def get_otps(self, count: int) -> List[str]:
+        """
+        Get many one-time passwords (OTPs) at once
+
+        Providers should override this if they can retrieve a batch of OTPs more cheaply than
+        retrieving each OTP individually. The default implementation calls get_otp() `count`
+        times.
+
+        :param count: The number of OTPs to get
+        :return: `count` OTPs
+        :raises RuntimeError: If the OTPs cannot be retrieved
+        """
+        return [self.get_otp() for _ in range(count)]
@@ -0,0 +1,70 @@
+import abc
+import hashlib
+import io
+from typing import BinaryIO
+
+from monkeytypes import OperatingSystem
+
+
+class IAsyncAgentBinaryRepository(metaclass=abc.ABCMeta):
+    """
+    An asyncio variant of IAgentBinaryRepository
+
+    Plugins that propagate to many targets concurrently on a single event loop can use this
+    interface to retrieve agent binaries without blocking the event loop.
+    """
+
+    @abc.abstractmethod
+    async def get_agent_binary(self, operating_system: OperatingSystem) -> io.BytesIO:
+        """
+        Retrieve the appropriate agent binary from the repository.
+        :param operating_system: The name of the operating system on which the agent binary will run
+        :return: A file-like object for the requested agent binary
+        :raises RetrievalError: If an error occurs when retrieving the agent binary
+        """
+
+    async def open_agent_binary(self, operating_system: OperatingSystem) -> BinaryIO:
+        """
+        Open the appropriate agent binary for reading, so that it can be streamed to a victim
+
+        See IAgentBinaryRepository.open_agent_binary().
+
+        :param operating_system: The name of the operating system on which the agent binary will run
+        :return: A seekable, read-only file-like object for the requested agent binary
+        :raises RetrievalError: If an error occurs when retrieving the agent binary
+        """
+        return io.BytesIO((await self.get_agent_binary(operating_system)).getvalue())
+
+    async def get_agent_binary_view(self, operating_system: OperatingSystem) -> memoryview:
+        """
+        Get a read-only view of the appropriate agent binary
+
+        See IAgentBinaryRepository.get_agent_binary_view().
+
+        :param operating_system: The name of the operating system on which the agent binary will run
+        :return: A read-only view of the requested agent binary
+        :raises RetrievalError: If an error occurs when retrieving the agent binary
+        """
+        return memoryview((await self.get_agent_binary(operating_system)).getvalue())
+
+    async def get_agent_binary_size(self, operating_system: OperatingSystem) -> int:
+        """
+        Get the size of the appropriate agent binary
+
+        :param operating_system: The name of the operating system on which the agent binary will run
+        :return: The size of the requested agent binary in bytes
+        :raises RetrievalError: If an error occurs when retrieving the agent binary
+        """
+        with (await self.get_agent_binary(operating_system)).getbuffer() as agent_binary:
+            return agent_binary.nbytes
+
+    async def get_agent_binary_sha256(self, operating_system: OperatingSystem) -> str:
+        """
+        Get the SHA-256 digest of the appropriate agent binary
+
+        :param operating_system: The name of the operating system on which the agent binary will run
+        :return: The hex-encoded SHA-256 digest of the requested agent binary
+        :raises RetrievalError: If an error occurs when retrieving the agent binary
+        """
+        with (await self.get_agent_binary(operating_system)).getbuffer() as agent_binary:
+            return hashlib.sha256(agent_binary).hexdigest()
@@ -0,0 +1,29 @@
+from abc import ABC, abstractmethod
+from typing import Iterable
+
+from monkeyevents import AbstractAgentEvent
+
+
+class IAsyncAgentEventPublisher(ABC):
+    """
+    An asyncio variant of IAgentEventPublisher
+    """
+
+    @abstractmethod
+    async def publish(self, event: AbstractAgentEvent):
+        """
+        Publishes an event with the given data
+
+        :param event: Event to publish
+        """
+
+    async def publish_many(self, events: Iterable[AbstractAgentEvent]):
+        """
+        Publishes many events at once
+
+        See IAgentEventPublisher.publish_many().
+
+        :param events: Events to publish, in order
+        """
+        for event in events:
+            await self.publish(event)
@@ -0,0 +1,29 @@
+import abc
+from typing import List
+
+
+class IAsyncAgentOTPProvider(metaclass=abc.ABCMeta):
+    """
+    An asyncio variant of IAgentOTPProvider
+    """
+
+    @abc.abstractmethod
+    async def get_otp(self) -> str:
+        """
+        Get a one-time password (OTP)
+
+        :return: An OTP
+        :raises RuntimeError: If an OTP cannot be retrieved
+        """
+
+    async def get_otps(self, count: int) -> List[str]:
+        """
+        Get many one-time passwords (OTPs) at once
+
+        See IAgentOTPProvider.get_otps().
+
+        :param count: The number of OTPs to get
+        :return: `count` OTPs
+        :raises RuntimeError: If the OTPs cannot be retrieved
+        """
+        return [await self.get_otp() for _ in range(count)]
@@ -0,0 +1,116 @@
+import abc
+from ipaddress import IPv4Address
+from typing import Iterable, List, Optional, Sequence
+
+from monkeytypes import OperatingSystem
+
+from .agent_binary_request import (
+    AgentBinaryDownloadRequest,
+    AgentBinaryDownloadTicket,
+    ReservationID,
+)
+from .agent_binary_wrapper_template import AgentBinaryWrapperTemplate
+
+
+class IAsyncHTTPAgentBinaryServerRegistrar(metaclass=abc.ABCMeta):
+    """
+    An asyncio variant of IHTTPAgentBinaryServerRegistrar
+    """
+
+    @abc.abstractmethod
+    async def reserve_download(
+        self,
+        operating_system: OperatingSystem,
+        requestor_ip: IPv4Address,
+        agent_binary_wrapper_template: Optional[bytes],
+    ) -> AgentBinaryDownloadTicket:
+        """
+        Register to download an Agent over HTTP
+
+        See IHTTPAgentBinaryServerRegistrar.reserve_download().
+
+        :param operating_system: The operating system for the Agent binary to serve
+        :param requestor_ip: The IP address of the client that will download the Agent binary
+        :param agent_binary_wrapper_template: A template that the bytes from the Agent binary will
+            be inserted into, or None
+        :raises RuntimeError: If the binary could not be served
+        :returns: A ticket to download the Agent binary
+        """
+
+    async def reserve_compiled_download(
+        self,
+        operating_system: OperatingSystem,
+        requestor_ip: IPv4Address,
+        agent_binary_wrapper_template: AgentBinaryWrapperTemplate,
+    ) -> AgentBinaryDownloadTicket:
+        """
+        Register to download an Agent over HTTP, wrapped in a compiled template
+
+        See IHTTPAgentBinaryServerRegistrar.reserve_compiled_download().
+
+        :param operating_system: The operating system for the Agent binary to serve
+        :param requestor_ip: The IP address of the client that will download the Agent binary
+        :param agent_binary_wrapper_template: A compiled template that the bytes from the Agent
+            binary will be inserted into
+        :raises RuntimeError: If the binary could not be served
+        :returns: A ticket to download the Agent binary
+        """
+        return await self.reserve_download(
+            operating_system, requestor_ip, agent_binary_wrapper_template.template
+        )
+
+    @abc.abstractmethod
+    async def clear_reservation(self, reservation_id: ReservationID):
+        """
+        Deregister a AgentBinaryDownloadReservation from the registrar
+
+        :param reservation_id: The ID of the reservation to be deregistered
+        :raises KeyError: If the reservation ID is not registered
+        """
+
+    async def reserve_downloads(
+        self, requests: Sequence[AgentBinaryDownloadRequest]
+    ) -> List[AgentBinaryDownloadTicket]:
+        """
+        Register many downloads of Agents over HTTP at once
+
+        See IHTTPAgentBinaryServerRegistrar.reserve_downloads().
+
+        :param requests: The downloads to reserve
+        :raises RuntimeError: If a binary could not be served
+        :returns: A ticket for each request, in the same order as the requests
+        """
+        tickets = []
+        for request in requests:
+            template = request.agent_binary_wrapper_template
+            if isinstance(template, AgentBinaryWrapperTemplate):
+                ticket = await self.reserve_compiled_download(
+                    request.operating_system, request.requestor_ip, template
+                )
+            else:
+                ticket = await self.reserve_download(
+                    request.operating_system, request.requestor_ip, template
+                )
+            tickets.append(ticket)
+
+        return tickets
+
+    async def clear_reservations(self, reservation_ids: Iterable[ReservationID]):
+        """
+        Deregister many AgentBinaryDownloadReservations from the registrar at once
+
+        See IHTTPAgentBinaryServerRegistrar.clear_reservations().
+
+        :param reservation_ids: The IDs of the reservations to be deregistered
+        :raises KeyError: If any of the reservation IDs are not registered. All of the registered
+                          reservations are still deregistered.
+        """
+        unregistered_ids = []
+        for reservation_id in reservation_ids:
+            try:
+                await self.clear_reservation(reservation_id)
+            except KeyError:
+                unregistered_ids.append(reservation_id)
+
+        if unregistered_ids:
+            raise KeyError(f"Reservations are not registered: {unregistered_ids}")
@@ -0,0 +1,93 @@
+import abc
+from typing import Iterable, Optional
+
+from monkeytypes import Credentials
+
+from .i_propagation_credentials_repository import (
+    IdentityType,
+    NewCredentials,
+    NewCredentialsCallback,
+    SecretType,
+    check_generation,
+    credentials_match,
+)
+
+
+class IAsyncPropagationCredentialsRepository(metaclass=abc.ABCMeta):
+    """
+    An asyncio variant of IPropagationCredentialsRepository
+    """
+
+    @abc.abstractmethod
+    async def add_credentials(self, credentials_to_add: Iterable[Credentials]):
+        """
+        Adds credentials to the CredentialStore
+        :param credentials_to_add: The credentials that will be added
+        """
+
+    @abc.abstractmethod
+    async def get_credentials(self) -> Iterable[Credentials]:
+        """
+        Retrieves credentials from the store
+        :return: Credentials that can be used for propagation
+        """
+
+    async def find_credentials(
+        self,
+        identity_type: Optional[IdentityType] = None,
+        secret_type: Optional[SecretType] = None,
+        username: Optional[str] = None,
+    ) -> Iterable[Credentials]:
+        """
+        Retrieves the credentials from the store that match all of the given criteria
+
+        See IPropagationCredentialsRepository.find_credentials().
+
+        :param identity_type: If set, only credentials with this type of identity are retrieved
+        :param secret_type: If set, only credentials with this type of secret are retrieved
+        :param username: If set, only credentials with this username are retrieved
+        :return: Credentials that match all of the criteria
+        """
+        return [
+            credentials
+            for credentials in await self.get_credentials()
+            if credentials_match(credentials, identity_type, secret_type, username)
+        ]
+
+    async def get_credentials_since(self, generation: int) -> NewCredentials:
+        """
+        Retrieves the credentials that were added to the store since a generation
+
+        See IPropagationCredentialsRepository.get_credentials_since().
+
+        :param generation: A generation returned by a previous call, or 0
+        :return: The current generation and the credentials added since `generation`
+        :raises ValueError: If `generation` is negative or later than the current generation
+        """
+        check_generation(generation, 0)
+
+        return NewCredentials(0, list(await self.get_credentials()))
+
+    async def subscribe_to_new_credentials(self, callback: NewCredentialsCallback):
+        """
+        Register a callback to be called whenever new credentials are added to the store
+
+        See IPropagationCredentialsRepository.subscribe_to_new_credentials().
+
+        :param callback: A callable that accepts the new credentials
+        :raises NotImplementedError: If the repository does not support subscriptions
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not support subscribing to new credentials"
+        )
+
+    async def unsubscribe_from_new_credentials(self, callback: NewCredentialsCallback):
+        """
+        Deregister a callback registered with subscribe_to_new_credentials()
+
+        See IPropagationCredentialsRepository.unsubscribe_from_new_credentials().
+
+        :param callback: The callable to deregister
+        :raises ValueError: If the callback is not registered
+        """
+        raise ValueError(f"{callback!r} is not subscribed to new credentials")
@@ -1,9 +1,15 @@
 import abc
 from ipaddress import IPv4Address
+from typing import Iterable, List, Optional, Sequence
 
 from monkeytypes import OperatingSystem
 
-from .agent_binary_request import AgentBinaryDownloadTicket, ReservationID
+from .agent_binary_request import (
+    AgentBinaryDownloadRequest,
+    AgentBinaryDownloadTicket,
+    ReservationID,
+)
+from .agent_binary_wrapper_template import AgentBinaryWrapperTemplate
 
 
 class IHTTPAgentBinaryServerRegistrar(metaclass=abc.ABCMeta):
@@ -12,7 +18,7 @@ class IHTTPAgentBinaryServerRegistrar(metaclass=abc.ABCMeta):
         self,
         operating_system: OperatingSystem,
         requestor_ip: IPv4Address,
-        agent_binary_wrapper_template: bytes | None,
+        agent_binary_wrapper_template: Optional[bytes],
     ) -> AgentBinaryDownloadTicket:
         """
         Register to download an Agent over HTTP
@@ -28,6 +34,30 @@ class IHTTPAgentBinaryServerRegistrar(metaclass=abc.ABCMeta):
         :returns: A ticket to download the Agent binary
         """
 
+    def reserve_compiled_download(
+        self,
+        operating_system: OperatingSystem,
+        requestor_ip: IPv4Address,
+        agent_binary_wrapper_template: AgentBinaryWrapperTemplate,
+    ) -> AgentBinaryDownloadTicket:
+        """
+        Register to download an Agent over HTTP, wrapped in a compiled template
+
+        The same compiled template can be reused for many downloads. Registrars that can serve
+        AgentBinaryWrapperTemplates without rendering them for each download should override this.
+        The default implementation passes the template's bytes to reserve_download().
+
+        :param operating_system: The operating system for the Agent binary to serve
+        :param requestor_ip: The IP address of the client that will download the Agent binary
+        :param agent_binary_wrapper_template: A compiled template that the bytes from the Agent
+            binary will be inserted into
+        :raises RuntimeError: If the binary could not be served
+        :returns: A ticket to download the Agent binary
+        """
+        return self.reserve_download(
+            operating_system, requestor_ip, agent_binary_wrapper_template.template
+        )
+
     @abc.abstractmethod
     def clear_reservation(self, reservation_id: ReservationID):
         """
@@ -36,3 +66,54 @@ class IHTTPAgentBinaryServerRegistrar(metaclass=abc.ABCMeta):
         :param reservation_id: The ID of the reservation to be deregistered
         :raises KeyError: If the reservation ID is not registered
         """
+
+    def reserve_downloads(
+        self, requests: Sequence[AgentBinaryDownloadRequest]
+    ) -> List[AgentBinaryDownloadTicket]:
+        """
+        Register many downloads of Agents over HTTP at once
+
+        Registrars should override this to reserve all of the downloads while holding their lock
+        once, and may compile each distinct wrapper template only once. The default implementation
+        calls reserve_compiled_download() for each request with a compiled wrapper template, and
+        reserve_download() for each other request, with the request's wrapper template as it is.
+
+        :param requests: The downloads to reserve
+        :raises RuntimeError: If a binary could not be served
+        :returns: A ticket for each request, in the same order as the requests
+        """
+        tickets = []
+        for request in requests:
+            template = request.agent_binary_wrapper_template
+            if isinstance(template, AgentBinaryWrapperTemplate):
+                ticket = self.reserve_compiled_download(
+                    request.operating_system, request.requestor_ip, template
+                )
+            else:
+                ticket = self.reserve_download(
+                    request.operating_system, request.requestor_ip, template
+                )
+            tickets.append(ticket)
+
+        return tickets
+
+    def clear_reservations(self, reservation_ids: Iterable[ReservationID]):
+        """
+        Deregister many AgentBinaryDownloadReservations from the registrar at once
+
+        Registrars should override this to clear all of the reservations while holding their lock
+        once. The default implementation calls clear_reservation() for each reservation ID.
+
+        :param reservation_ids: The IDs of the reservations to be deregistered
+        :raises KeyError: If any of the reservation IDs are not registered. All of the registered
+                          reservations are still deregistered.
+        """
+        unregistered_ids = []
+        for reservation_id in reservation_ids:
+            try:
+                self.clear_reservation(reservation_id)
+            except KeyError:
+                unregistered_ids.append(reservation_id)
+
+        if unregistered_ids:
+            raise KeyError(f"Reservations are not registered: {unregistered_ids}")
@@ -6,6 +6,7 @@ from typing import Optional
 from monkeytypes import InfectionMonkeyBaseModel
 from pydantic import Field, model_validator
 
+from .agent_command_template import DOWNLOAD_URL_PLACEHOLDER, OTP_PLACEHOLDER, AgentCommandTemplate
 from .dropper_execution_mode import DropperExecutionMode
 
 
@@ -30,6 +31,8 @@ class LinuxRunOptions(InfectionMonkeyBaseModel):
     dropper_execution_mode: DropperExecutionMode
     dropper_destination_path: Optional[PurePosixPath] = None
     include_otp: bool = True
+    # If this is set, builders must use this OTP in the run command instead of getting one
+    otp: Optional[str] = None
 
     @model_validator(mode="after")
     def check_dropper_execution(self) -> "LinuxRunOptions":
@@ -50,6 +53,8 @@ class LinuxRunOptions(InfectionMonkeyBaseModel):
                 "OTP must be passed when running the dropper script, because "
                 "there's no other secure way to pass it"
             )
+        if not self.include_otp and self.otp is not None:
+            raise ValueError("An OTP was given, but the run command does not include the OTP")
         return self
 
 
@@ -75,7 +80,8 @@ class ILinuxAgentCommandBuilder(metaclass=abc.ABCMeta):
         """
         Builds Agent's run command
 
-        :param run_options: Options needed for the command to be built
+        :param run_options: Options needed for the command to be built. If `run_options.otp` is
+                            set, the command must use that OTP.
         """
 
     @abc.abstractmethod
@@ -89,3 +95,46 @@ class ILinuxAgentCommandBuilder(metaclass=abc.ABCMeta):
         """
         Resets the command
         """
+
+    def build_command_template(
+        self,
+        download_options: LinuxDownloadOptions,
+        set_permissions_options: LinuxSetPermissionsOptions,
+        run_options: LinuxRunOptions,
+    ) -> AgentCommandTemplate:
+        """
+        Build a reusable template of the command that downloads, prepares, and runs the Agent
+
+        The options are validated and the command is assembled once. The template can then render
+        the command for any number of targets by filling in each target's download URL and OTP.
+
+        The command is built with this builder's methods, using "$(download_url)" as the download
+        URL and, if the run options include the OTP, "$(otp)" as the OTP. The builder is reset
+        before and after. Builders that write these placeholders differently, e.g. because they
+        escape "$", must override this.
+
+        :param download_options: Options needed for the download command to be built. The download
+                                 URL is replaced by "$(download_url)".
+        :param set_permissions_options: Options needed for the permission change command to be
+                                        built
+        :param run_options: Options needed for the run command to be built
+        :return: A template of the command
+        :raises ValueError: If the command does not contain the "$(download_url)" placeholder, or if
+                            the run options include the OTP and the command does not contain the
+                            "$(otp)" placeholder
+        """
+        if run_options.include_otp:
+            run_options = run_options.model_copy(update={"otp": OTP_PLACEHOLDER})
+
+        self.reset_command()
+        try:
+            self.build_download_command(
+                download_options.model_copy(update={"download_url": DOWNLOAD_URL_PLACEHOLDER})
+            )
+            self.build_set_permissions_command(set_permissions_options)
+            self.build_run_command(run_options)
+            return AgentCommandTemplate.from_built_command(
+                self.get_command(), run_options.include_otp
+            )
+        finally:
+            self.reset_command()
@@ -1,7 +1,44 @@
 import abc
-from typing import Iterable
+from typing import Callable, Iterable, List, NamedTuple, Optional, Sequence, Type, TypeAlias
 
-from monkeytypes import Credentials
+from monkeytypes import Credentials, EmailAddress, LMHash, NTHash, Password, SSHKeypair, Username
+
+IdentityType: TypeAlias = Type[Username] | Type[EmailAddress]
+SecretType: TypeAlias = Type[Password] | Type[LMHash] | Type[NTHash] | Type[SSHKeypair]
+NewCredentialsCallback: TypeAlias = Callable[[Sequence[Credentials]], None]
+
+
+class NewCredentials(NamedTuple):
+    generation: int
+    credentials: List[Credentials]
+
+
+def credentials_match(
+    credentials: Credentials,
+    identity_type: Optional[IdentityType] = None,
+    secret_type: Optional[SecretType] = None,
+    username: Optional[str] = None,
+) -> bool:
+    if identity_type is not None and type(credentials.identity) is not identity_type:
+        return False
+
+    if secret_type is not None and type(credentials.secret) is not secret_type:
+        return False
+
+    if username is not None and not (
+        isinstance(credentials.identity, Username) and credentials.identity.username == username
+    ):
+        return False
+
+    return True
+
+
+def check_generation(generation: int, current_generation: int):
+    if not 0 <= generation <= current_generation:
+        raise ValueError(
+            f"Generation {generation} is not between 0 and the current generation "
+            f"({current_generation})"
+        )
 
 
 class IPropagationCredentialsRepository(metaclass=abc.ABCMeta):
@@ -22,3 +59,77 @@ class IPropagationCredentialsRepository(metaclass=abc.ABCMeta):
         Retrieves credentials from the store
         :return: Credentials that can be used for propagation
         """
+
+    def find_credentials(
+        self,
+        identity_type: Optional[IdentityType] = None,
+        secret_type: Optional[SecretType] = None,
+        username: Optional[str] = None,
+    ) -> Iterable[Credentials]:
+        """
+        Retrieves the credentials from the store that match all of the given criteria
+
+        For example, `find_credentials(identity_type=Username, secret_type=Password)` retrieves
+        only username and password pairs. Repositories should override this to look the
+        credentials up in indexes. The default implementation filters the result of
+        get_credentials().
+
+        :param identity_type: If set, only credentials with this type of identity are retrieved
+        :param secret_type: If set, only credentials with this type of secret are retrieved
+        :param username: If set, only credentials with this username are retrieved
+        :return: Credentials that match all of the criteria
+        """
+        return [
+            credentials
+            for credentials in self.get_credentials()
+            if credentials_match(credentials, identity_type, secret_type, username)
+        ]
+
+    def get_credentials_since(self, generation: int) -> NewCredentials:
+        """
+        Retrieves the credentials that were added to the store since a generation
+
+        Every time new credentials are added, the store's generation increases. A caller that
+        passes the generation returned by its previous call retrieves only the credentials that
+        were added in the meantime. Pass 0 to retrieve all credentials.
+
+        Repositories should override this. The default implementation can't tell which
+        credentials were added since a generation, so it always returns generation 0 and all of
+        the credentials, which callers will treat as new.
+
+        :param generation: A generation returned by a previous call, or 0
+        :return: The current generation and the credentials added since `generation`
+        :raises ValueError: If `generation` is negative or later than the current generation
+        """
+        check_generation(generation, 0)
+
+        return NewCredentials(0, list(self.get_credentials()))
+
+    def subscribe_to_new_credentials(self, callback: NewCredentialsCallback):
+        """
+        Register a callback to be called whenever new credentials are added to the store
+
+        The callback is called with the credentials that were added, on the thread that added
+        them, so it should return quickly.
+
+        Repositories are not required to support subscriptions. The default implementation raises
+        NotImplementedError, in which case callers should poll get_credentials_since() instead.
+
+        :param callback: A callable that accepts the new credentials
+        :raises NotImplementedError: If the repository does not support subscriptions
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not support subscribing to new credentials"
+        )
+
+    def unsubscribe_from_new_credentials(self, callback: NewCredentialsCallback):
+        """
+        Deregister a callback registered with subscribe_to_new_credentials()
+
+        The default implementation always raises ValueError, since the default
+        subscribe_to_new_credentials() never registers a callback.
+
+        :param callback: The callable to deregister
+        :raises ValueError: If the callback is not registered
+        """
+        raise ValueError(f"{callback!r} is not subscribed to new credentials")
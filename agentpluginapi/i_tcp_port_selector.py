@@ -1,5 +1,5 @@
 import abc
-from typing import Optional, Sequence
+from typing import Iterable, List, Optional, Sequence
 
 from monkeytypes import NetworkPort
 
@@ -30,3 +30,58 @@ class ITCPPortSelector(metaclass=abc.ABCMeta):
         :param preferred_ports: A sequence of ports that should be tried first
         :return: The selected port, or None if no ports are available
         """
+
+    def get_free_tcp_ports(
+        self,
+        count: int,
+        min_range: int = 1024,
+        max_range: int = 65535,
+        lease_time_sec: float = 30,
+        preferred_ports: Sequence[NetworkPort] = [],
+    ) -> List[NetworkPort]:
+        """
+        Get several distinct free TCP ports that new servers can listen on
+
+        Selectors should override this to lease all of the ports in one pass over the ports that
+        the OS reports as in use. The default implementation calls get_free_tcp_port() until it
+        has `count` distinct ports or no port is available. Selectors that don't lease the ports
+        they return may return the same port more than once, so at most `count` duplicate ports
+        are retried before giving up.
+
+        :param count: The number of ports to get
+        :param min_range: The smallest port number a random port can be chosen from, defaults to
+                          1024
+        :param max_range: The largest port number a random port can be chosen from, defaults to
+                          65535
+        :param lease_time_sec: The amount of time the ports should be reserved for if the OS does
+                               not report them as in use, defaults to 30 seconds
+        :param preferred_ports: A sequence of ports that should be tried first
+        :return: The selected ports, which may be fewer than `count` if not enough ports are
+                 available
+        """
+        ports: List[NetworkPort] = []
+        retries_left = count
+        while len(ports) < count:
+            port = self.get_free_tcp_port(min_range, max_range, lease_time_sec, preferred_ports)
+            if port is None:
+                break
+
+            if port not in ports:
+                ports.append(port)
+            elif retries_left > 0:
+                retries_left -= 1
+            else:
+                break
+
+        return ports
+
+    def release(self, ports: Iterable[NetworkPort]):
+        """
+        Release the leases on ports so that they can be selected again before their leases expire
+
+        Releasing a port that is not leased has no effect. The default implementation does
+        nothing, so the ports remain reserved until their leases expire.
+
+        :param ports: The ports to release
+        """
+        pass
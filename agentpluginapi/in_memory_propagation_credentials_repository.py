@@ -0,0 +1,127 @@
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, TypeVar
+
+from monkeytypes import Credentials, Username
+
+from .i_propagation_credentials_repository import (
+    IdentityType,
+    IPropagationCredentialsRepository,
+    NewCredentials,
+    NewCredentialsCallback,
+    SecretType,
+    check_generation,
+)
+
+logger = logging.getLogger(__name__)
+
+# Dicts are used as insertion-ordered sets, so that credentials are retrieved in the order in
+# which they were added
+_CredentialsSet = Dict[Credentials, None]
+K = TypeVar("K")
+
+
+def _add_to_index(index: Dict[K, _CredentialsSet], key: K, credentials: Credentials):
+    index.setdefault(key, {})[credentials] = None
+
+
+class InMemoryPropagationCredentialsRepository(IPropagationCredentialsRepository):
+    """
+    An IPropagationCredentialsRepository that indexes credentials in memory
+
+    Credentials are indexed by identity type, secret type, and username, so find_credentials()
+    takes time proportional to the number of credentials that it retrieves rather than the number
+    of credentials in the repository. Credentials that are already in the repository are ignored
+    by add_credentials(), so the same credentials are never retrieved twice.
+
+    Each added credential advances the generation by one, so get_credentials_since() retrieves
+    new credentials in time proportional to their number. Callbacks registered with
+    subscribe_to_new_credentials() are called after new credentials are added.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._credentials: _CredentialsSet = {}
+        # The generation is the index in this list of the next credentials to be added
+        self._credentials_in_order: List[Credentials] = []
+        self._credentials_by_identity_type: Dict[type, _CredentialsSet] = {}
+        self._credentials_by_secret_type: Dict[type, _CredentialsSet] = {}
+        self._credentials_by_username: Dict[str, _CredentialsSet] = {}
+        self._new_credentials_callbacks: List[NewCredentialsCallback] = []
+
+    def add_credentials(self, credentials_to_add: Iterable[Credentials]):
+        with self._lock:
+            first_new_credentials = len(self._credentials_in_order)
+            for credentials in credentials_to_add:
+                if credentials in self._credentials:
+                    continue
+
+                self._credentials[credentials] = None
+                self._credentials_in_order.append(credentials)
+                _add_to_index(
+                    self._credentials_by_identity_type, type(credentials.identity), credentials
+                )
+                _add_to_index(
+                    self._credentials_by_secret_type, type(credentials.secret), credentials
+                )
+                if isinstance(credentials.identity, Username):
+                    _add_to_index(
+                        self._credentials_by_username, credentials.identity.username, credentials
+                    )
+
+            new_credentials = self._credentials_in_order[first_new_credentials:]
+            callbacks = list(self._new_credentials_callbacks)
+
+        if new_credentials:
+            # The callbacks are called without holding the lock, so that they can use the repository
+            for callback in callbacks:
+                try:
+                    callback(new_credentials)
+                except Exception:
+                    logger.exception("A new credentials callback raised an exception")
+
+    def get_credentials(self) -> List[Credentials]:
+        with self._lock:
+            return list(self._credentials_in_order)
+
+    def get_credentials_since(self, generation: int) -> NewCredentials:
+        with self._lock:
+            current_generation = len(self._credentials_in_order)
+            check_generation(generation, current_generation)
+
+            return NewCredentials(current_generation, self._credentials_in_order[generation:])
+
+    def subscribe_to_new_credentials(self, callback: NewCredentialsCallback):
+        with self._lock:
+            self._new_credentials_callbacks.append(callback)
+
+    def unsubscribe_from_new_credentials(self, callback: NewCredentialsCallback):
+        with self._lock:
+            self._new_credentials_callbacks.remove(callback)
+
+    def find_credentials(
+        self,
+        identity_type: Optional[IdentityType] = None,
+        secret_type: Optional[SecretType] = None,
+        username: Optional[str] = None,
+    ) -> List[Credentials]:
+        with self._lock:
+            matches: List[_CredentialsSet] = []
+            if identity_type is not None:
+                matches.append(self._credentials_by_identity_type.get(identity_type, {}))
+            if secret_type is not None:
+                matches.append(self._credentials_by_secret_type.get(secret_type, {}))
+            if username is not None:
+                matches.append(self._credentials_by_username.get(username, {}))
+
+            if not matches:
+                return list(self._credentials_in_order)
+
+            # Only the smallest index is scanned; the others are only used for membership tests
+            matches.sort(key=len)
+            smallest, others = matches[0], matches[1:]
+            return [
+                credentials
+                for credentials in smallest
+                if all(credentials in other for other in others)
+            ]
@@ -2,11 +2,29 @@ import logging
 import socket
 import struct
 import sys
+import threading
+from collections import OrderedDict
+from functools import cached_property
 from ipaddress import IPv4Address, IPv4Interface
 from pathlib import Path
-from typing import Final, List, Optional, Tuple
-
-from monkeytoolbox import get_os
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    Final,
+    Generic,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Self,
+    Tuple,
+    TypeVar,
+)
+
+from eggtimer import EggTimer
+from monkeytoolbox import get_os, request_cache
 from monkeytypes import InfectionMonkeyBaseModel, OperatingSystem
 
 if get_os() == OperatingSystem.LINUX:
@@ -14,6 +32,8 @@ if get_os() == OperatingSystem.LINUX:
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 # Timeout for monkey connections
 LOOPBACK_NAME: Final = b"lo"
 SIOCGIFADDR: Final = 0x8915  # get PA address
@@ -21,6 +41,31 @@ SIOCGIFNETMASK: Final = 0x891B  # get network PA mask
 RTF_UP: Final = 0x0001  # Route usable
 RTF_REJECT: Final = 0x0200
 
+# How long the parsed routing table is reused before /proc/net/route is read again
+ROUTE_TABLE_CACHE_TTL_SEC: Final = 30
+# The maximum number of targets whose interfaces are remembered by each LocalMachineInfo
+INTERFACE_TO_TARGET_CACHE_SIZE: Final = 4096
+
+# Attributes that LocalMachineInfo derives from its network interfaces and caches on first use.
+# model_copy() copies them along with the fields, so they are discarded from copies, whose network
+# interfaces may be different.
+_DERIVED_ATTRIBUTES: Final = (
+    "_interface_to_target_cache",
+    "_interface_table",
+    "_interfaces_by_ip",
+)
+
+# Incremented whenever the routing table is rebuilt or invalidated, so that caches of results
+# derived from it know to discard them
+_route_table_generation = 0
+
+
+class InterfaceToTargetCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
 
 class LocalMachineInfo(InfectionMonkeyBaseModel):
     """
@@ -36,6 +81,20 @@ class LocalMachineInfo(InfectionMonkeyBaseModel):
     temporary_directory: Path
     network_interfaces: frozenset[IPv4Interface]
 
+    def __copy__(self) -> Self:
+        copied = super().__copy__()
+        copied._discard_derived_attributes()
+        return copied
+
+    def __deepcopy__(self, memo: Optional[Dict[int, Any]] = None) -> Self:
+        copied = super().__deepcopy__(memo)
+        copied._discard_derived_attributes()
+        return copied
+
+    def _discard_derived_attributes(self):
+        for name in _DERIVED_ATTRIBUTES:
+            self.__dict__.pop(name, None)
+
     def get_interface_to_target(self, target: IPv4Address) -> Optional[IPv4Interface]:
         """
         Gets an interface on the local machine that can be reached by the target machine
@@ -44,41 +103,95 @@ class LocalMachineInfo(InfectionMonkeyBaseModel):
         attempts to do this rationally by examining network membership. If that fails, it attempts
         to do this empirically by opening sockets and examining routes.
 
+        The results for the most recently used INTERFACE_TO_TARGET_CACHE_SIZE targets are cached
+        until the routing table is refreshed or invalidate_route_table_cache() is called.
+
         :param interfaces: An iterable of interfaces
         :param target: The IP address of the target
         :return: The network interface that can connect to the target, or None if no such interface
                  could be found
         """
+        return self._interface_to_target_cache.get(target, self._get_interface_to_target)
+
+    @property
+    def interface_to_target_cache_info(self) -> InterfaceToTargetCacheInfo:
+        """
+        Statistics about the cache used by get_interface_to_target()
+        """
+        return self._interface_to_target_cache.info()
 
+    def _get_interface_to_target(self, target: IPv4Address) -> Optional[IPv4Interface]:
         interface_to_target = self._rational_get_interface_to_target(target)
 
         if interface_to_target is not None:
             return interface_to_target
 
-        interface_ip_to_target = LocalMachineInfo._empirical_get_interface_to_target(target)
+        interface_ip_to_target = self._empirical_get_interface_to_target(target)
 
         if interface_ip_to_target is None:
             return None
 
-        for i in self.network_interfaces:
-            if i.ip == interface_ip_to_target:
-                return i
+        return self._interfaces_by_ip.get(int(interface_ip_to_target))
 
-        return None
+    def get_interfaces_to_targets(
+        self, targets: Iterable[IPv4Address]
+    ) -> Dict[IPv4Address, Optional[IPv4Interface]]:
+        """
+        Gets the interfaces on the local machine that can be reached by each of the target machines
+
+        This is equivalent to calling get_interface_to_target() for each target, but resolves all
+        of the targets against the interface and route tables together, which is much faster for
+        large numbers of targets.
+
+        :param targets: The IP addresses of the targets
+        :return: A mapping of each target to the network interface that can connect to it, or to
+                 None if no such interface could be found
+        """
+        # IPv4Address.__hash__() is slow, so the targets are handled as integers until the end
+        target_addresses = [(target, int(target)) for target in targets]
+        interfaces_to_targets = self._interface_table.lookup_many(
+            address for _, address in target_addresses
+        )
+
+        unresolved_addresses = [
+            address for _, address in target_addresses if address not in interfaces_to_targets
+        ]
+        if unresolved_addresses:
+            interface_ips_to_targets = self._empirical_get_interfaces_to_targets(
+                unresolved_addresses
+            )
+            for address, interface_ip in interface_ips_to_targets.items():
+                interface_to_target = self._interfaces_by_ip.get(int(interface_ip))
+                if interface_to_target is not None:
+                    interfaces_to_targets[address] = interface_to_target
+
+        return {target: interfaces_to_targets.get(address) for target, address in target_addresses}
 
     def _rational_get_interface_to_target(self, target: IPv4Address) -> Optional[IPv4Interface]:
         """
 
         :param interfaces: An iterable of interfaces
         :param target: The IP address of the target
-        :return: The network interface that can connect to the target, or None if no such interface
-                 could be found
+        :return: The network interface on the most specific network that contains the target, or
+                 None if no such interface could be found
         """
+        return self._interface_table.lookup(int(target))
+
+    @cached_property
+    def _interface_to_target_cache(self) -> "_InterfaceToTargetCache":
+        return _InterfaceToTargetCache(INTERFACE_TO_TARGET_CACHE_SIZE)
+
+    @cached_property
+    def _interface_table(self) -> "_LongestPrefixMatchTable[IPv4Interface]":
+        interface_table: _LongestPrefixMatchTable[IPv4Interface] = _LongestPrefixMatchTable()
         for i in self.network_interfaces:
-            if target in i.network:
-                return i
+            interface_table.add(int(i.network.network_address), int(i.network.netmask), i)
 
-        return None
+        return interface_table
+
+    @cached_property
+    def _interfaces_by_ip(self) -> Dict[int, IPv4Interface]:
+        return {int(i.ip): i for i in self.network_interfaces}
 
     @staticmethod
     def _empirical_get_interface_to_target(target_ip: IPv4Address) -> Optional[IPv4Address]:
@@ -106,25 +219,66 @@ class LocalMachineInfo(InfectionMonkeyBaseModel):
             return IPv4Address(ip_to_dst)
         else:
             # based on scapy implementation
+            return LocalMachineInfo._get_route_table().lookup(_atol(target))
+
+    @staticmethod
+    def _empirical_get_interfaces_to_targets(
+        target_addresses: Collection[int],
+    ) -> Dict[int, IPv4Address]:
+        """
+        Find the interfaces that can connect to many targets at once
+
+        :param target_addresses: The destination IP addresses as integers
+        :return: A mapping of each destination IP address to the IP address of an interface that
+                 can connect to it. Destinations that no interface can connect to are omitted.
+        """
+        if sys.platform == "win32":
+            interface_ips_to_targets = {
+                address: LocalMachineInfo._empirical_get_interface_to_target(IPv4Address(address))
+                for address in target_addresses
+            }
+            return {a: ip for a, ip in interface_ips_to_targets.items() if ip is not None}
 
-            def atol(x):
-                ip = socket.inet_aton(x)
-                return struct.unpack("!I", ip)[0]
-
-            routes = LocalMachineInfo.get_routes()
-            target_long = atol(target)
-            paths: list[tuple[int, tuple[bytes | str, str, str]]] = []
-            for d, m, gw, i, a in routes:
-                aa = atol(a)
-                if aa == target_long:
-                    paths.append((0xFFFFFFFF, ("lo", a, "0.0.0.0")))
-                if (target_long & m) == (d & m):
-                    paths.append((m, (i, a, gw)))
-            if not paths:
-                return None
-            paths.sort()
-            ret = paths[-1][1]
-            return IPv4Address(ret[1])
+        return LocalMachineInfo._get_route_table().lookup_many(target_addresses)
+
+    @staticmethod
+    @request_cache(ROUTE_TABLE_CACHE_TTL_SEC)
+    def _get_route_table() -> "_LongestPrefixMatchTable[IPv4Address]":
+        """
+        Build a table that maps each route from get_routes() to the address of its interface
+
+        The table is cached for ROUTE_TABLE_CACHE_TTL_SEC seconds, or until
+        invalidate_route_table_cache() is called.
+        """
+        global _route_table_generation
+        _route_table_generation += 1
+
+        paths: List[Tuple[int, int, Tuple[bytes, str, str]]] = []
+        for d, m, gw, i, a in LocalMachineInfo.get_routes():
+            paths.append((0xFFFFFFFF, _atol(a), (LOOPBACK_NAME, a, "0.0.0.0")))
+            paths.append((m, d, (i, a, gw)))
+
+        # When several routes cover the same network, prefer the same one that sorting the paths
+        # by (interface, address, gateway) would have picked
+        paths.sort(key=lambda path: path[2], reverse=True)
+
+        route_table: _LongestPrefixMatchTable[IPv4Address] = _LongestPrefixMatchTable()
+        for netmask, network, (_, a, _) in paths:
+            route_table.add(network, netmask, IPv4Address(a))
+
+        return route_table
+
+    @staticmethod
+    def invalidate_route_table_cache():
+        """
+        Discard the cached routing table, so that the next lookup reads the routes from the OS
+
+        Call this if the local machine's routes or interfaces are known to have changed.
+        """
+        global _route_table_generation
+        _route_table_generation += 1
+
+        LocalMachineInfo._get_route_table.clear_cache()  # type: ignore [attr-defined]
 
     @staticmethod
     def get_routes() -> List[Tuple[int, int, str, bytes, str]]:
@@ -194,3 +348,153 @@ class LocalMachineInfo(InfectionMonkeyBaseModel):
         if addrfamily == socket.AF_INET:
             return socket.inet_ntoa(ifreq[20:24])
         return None
+
+
+def _atol(ip: str) -> int:
+    return struct.unpack("!I", socket.inet_aton(ip))[0]
+
+
+class _InterfaceToTargetCache:
+    """
+    A bounded, thread-safe LRU cache of the interfaces to targets
+
+    All entries are discarded when the routing table is rebuilt or invalidated, and at least every
+    ROUTE_TABLE_CACHE_TTL_SEC seconds, so they are never staler than the routing table. Unpickled
+    instances start out empty.
+    """
+
+    def __init__(self, maxsize: int):
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[int, Optional[IPv4Interface]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._route_table_generation = _route_table_generation
+        self._timer = EggTimer()
+        self._timer.set(ROUTE_TABLE_CACHE_TTL_SEC)
+
+    def __reduce__(self):
+        return (self.__class__, (self._maxsize,))
+
+    def get(
+        self,
+        target: IPv4Address,
+        get_interface_to_target: Callable[[IPv4Address], Optional[IPv4Interface]],
+    ) -> Optional[IPv4Interface]:
+        """
+        Get the cached interface to a target, or find and cache it if it isn't cached
+
+        :param target: The IP address of the target
+        :param get_interface_to_target: A callable that finds the interface to a target
+        :return: The network interface that can connect to the target, or None if no such interface
+                 could be found
+        """
+        address = int(target)
+        with self._lock:
+            self._discard_stale_entries()
+            if address in self._entries:
+                self._hits += 1
+                self._entries.move_to_end(address)
+                return self._entries[address]
+
+            self._misses += 1
+            route_table_generation = self._route_table_generation
+
+        # The lock isn't held while the interface is looked up, since that may require reading the
+        # routing table
+        interface_to_target = get_interface_to_target(target)
+
+        with self._lock:
+            if route_table_generation == _route_table_generation:
+                self._entries[address] = interface_to_target
+                if len(self._entries) > self._maxsize:
+                    self._entries.popitem(last=False)
+
+        return interface_to_target
+
+    def info(self) -> InterfaceToTargetCacheInfo:
+        """
+        Get statistics about the cache
+
+        :return: The number of hits and misses, and the maximum and current number of entries
+        """
+        with self._lock:
+            return InterfaceToTargetCacheInfo(
+                self._hits, self._misses, self._maxsize, len(self._entries)
+            )
+
+    def _discard_stale_entries(self):
+        if self._route_table_generation != _route_table_generation or self._timer.is_expired():
+            self._entries.clear()
+            self._route_table_generation = _route_table_generation
+            self._timer.set(ROUTE_TABLE_CACHE_TTL_SEC)
+
+
+class _LongestPrefixMatchTable(Generic[T]):
+    """
+    Maps IPv4 networks to values and finds the value for the most specific network that contains an
+    address
+
+    Networks are bucketed by netmask, so a lookup costs at most one dictionary lookup per distinct
+    netmask (33 at most), no matter how many networks are in the table.
+    """
+
+    def __init__(self):
+        self._buckets: List[Tuple[int, Dict[int, T]]] = []
+
+    def add(self, network: int, netmask: int, value: T):
+        """
+        Add a network to the table
+
+        :param network: The network address as an integer
+        :param netmask: The network mask as an integer
+        :param value: The value to return for addresses in this network. If the network is already
+                      in the table, the value that was added first is kept.
+        """
+        for bucket_netmask, networks in self._buckets:
+            if bucket_netmask == netmask:
+                break
+        else:
+            networks = {}
+            self._buckets.append((netmask, networks))
+            self._buckets.sort(key=lambda bucket: bucket[0], reverse=True)
+
+        networks.setdefault(network & netmask, value)
+
+    def lookup_many(self, addresses: Iterable[int]) -> Dict[int, T]:
+        """
+        Find the values for many addresses in a single pass over the table
+
+        :param addresses: IPv4 addresses as integers
+        :return: A mapping of each address to the value for the most specific network that contains
+                 it. Addresses that no network contains are omitted.
+        """
+        values: Dict[int, T] = {}
+        unresolved_addresses = set(addresses)
+        for netmask, networks in self._buckets:
+            if not unresolved_addresses:
+                break
+
+            for address in unresolved_addresses:
+                value = networks.get(address & netmask)
+                if value is not None:
+                    values[address] = value
+
+            unresolved_addresses.difference_update(values)
+
+        return values
+
+    def lookup(self, address: int) -> Optional[T]:
+        """
+        Find the value for the most specific network that contains an address
+
+        :param address: An IPv4 address as an integer
+        :return: The value for the network with the longest netmask that contains the address, or
+                 None if no network contains it
+        """
+        for netmask, networks in self._buckets:
+            value = networks.get(address & netmask)
+            if value is not None:
+                return value
+
+        return None
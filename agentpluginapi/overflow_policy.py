@@ -0,0 +1,10 @@
+from enum import Enum, auto
+
+
+class OverflowPolicy(Enum):
+    """
+    What to do with an item that is added to a bounded queue that is full
+    """
+
+    BLOCK = auto()
+    DROP = auto()
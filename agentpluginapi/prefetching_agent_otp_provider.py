@@ -0,0 +1,161 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+from monkeytoolbox import create_daemon_thread
+
+from .i_agent_otp_provider import IAgentOTPProvider
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 32
+DEFAULT_MAX_OTP_AGE_SEC = 60.0
+
+
+class PrefetchingAgentOTPProvider(IAgentOTPProvider):
+    """
+    An IAgentOTPProvider that keeps a pool of OTPs retrieved ahead of time
+
+    Once start() is called, a background thread retrieves OTPs from another IAgentOTPProvider in
+    batches and keeps the pool topped up, so that get_otp() usually only takes an OTP from the
+    pool instead of waiting for a round trip to the Island. OTPs expire, so OTPs that have been in
+    the pool for longer than `max_otp_age_sec` are discarded instead of being handed out.
+
+    If the pool is empty, OTPs are retrieved from the other provider directly.
+    """
+
+    def __init__(
+        self,
+        otp_provider: IAgentOTPProvider,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        max_otp_age_sec: float = DEFAULT_MAX_OTP_AGE_SEC,
+    ):
+        """
+        :param otp_provider: The provider that OTPs are retrieved from
+        :param pool_size: The number of OTPs to keep in the pool
+        :param max_otp_age_sec: The number of seconds after which an OTP in the pool is discarded.
+                                This should be shorter than the lifetime of an OTP, less the time
+                                it takes to use one.
+        :raises ValueError: If pool_size is less than 1 or max_otp_age_sec is not positive
+        """
+        if pool_size < 1:
+            raise ValueError(f"pool_size must be at least 1, got {pool_size}")
+        if max_otp_age_sec <= 0:
+            raise ValueError(f"max_otp_age_sec must be positive, got {max_otp_age_sec}")
+
+        self._otp_provider = otp_provider
+        self._pool_size = pool_size
+        self._refill_threshold = max(1, pool_size // 2)
+        self._max_otp_age_sec = max_otp_age_sec
+
+        # (expiration time, OTP), oldest first
+        self._pool: Deque[Tuple[float, str]] = deque()
+        self._lock = threading.Lock()
+
+        self._refill_needed = threading.Event()
+        self._stop = threading.Event()
+        self._refill_thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """
+        Start filling the pool in the background
+
+        :raises RuntimeError: If the pool is already being filled in the background
+        """
+        if self._refill_thread is not None and self._refill_thread.is_alive():
+            raise RuntimeError("The pool is already being filled in the background")
+
+        self._stop.clear()
+        self._refill_needed.set()
+        self._refill_thread = create_daemon_thread(
+            target=self._run, name="PrefetchingAgentOTPProvider"
+        )
+        self._refill_thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stop filling the pool in the background
+
+        :param timeout: The number of seconds to wait for the background thread to stop
+        """
+        self._stop.set()
+        self._refill_needed.set()
+
+        if self._refill_thread is not None:
+            self._refill_thread.join(timeout)
+
+    def get_otp(self) -> str:
+        otps = self._take_from_pool(1)
+        if otps:
+            return otps[0]
+
+        return self._otp_provider.get_otp()
+
+    def get_otps(self, count: int) -> List[str]:
+        otps = self._take_from_pool(count)
+        if len(otps) < count:
+            otps.extend(self._otp_provider.get_otps(count - len(otps)))
+
+        return otps
+
+    def _take_from_pool(self, count: int) -> List[str]:
+        with self._lock:
+            self._discard_expired_otps()
+            otps = [self._pool.popleft()[1] for _ in range(min(count, len(self._pool)))]
+
+            if len(self._pool) < self._refill_threshold:
+                self._refill_needed.set()
+
+        return otps
+
+    def _discard_expired_otps(self):
+        now = time.monotonic()
+        while self._pool and self._pool[0][0] <= now:
+            self._pool.popleft()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._refill_needed.wait(self._get_time_until_next_expiration())
+            self._refill_needed.clear()
+
+            if not self._stop.is_set():
+                self._refill()
+
+    def _get_time_until_next_expiration(self) -> float:
+        with self._lock:
+            if not self._pool:
+                return self._max_otp_age_sec
+
+            return max(0.0, self._pool[0][0] - time.monotonic())
+
+    def _refill(self):
+        with self._lock:
+            self._discard_expired_otps()
+            count = self._pool_size - len(self._pool)
+
+        if count <= 0:
+            return
+
+        # The OTPs may have been issued as soon as they were requested
+        expiration_time = time.monotonic() + self._max_otp_age_sec
+        try:
+            otps = self._otp_provider.get_otps(count)
+        except Exception:
+            logger.exception(f"Failed to prefetch {count} OTPs")
+            return
+
+        now = time.monotonic()
+        if now >= expiration_time:
+            # Retrying right away would keep the Island busy issuing OTPs that can never be used
+            retrieval_time = now - expiration_time + self._max_otp_age_sec
+            logger.warning(
+                f"Retrieving {count} OTPs took {retrieval_time:.2f} seconds, so they expired "
+                "before they could be used. Waiting before trying again."
+            )
+            self._stop.wait(retrieval_time)
+            return
+
+        with self._lock:
+            self._pool.extend((expiration_time, otp) for otp in otps)
@@ -0,0 +1,321 @@
+import re
+import struct
+from functools import lru_cache
+from ipaddress import IPv4Address
+from itertools import product
+from multiprocessing import shared_memory
+from typing import (
+    AbstractSet,
+    Dict,
+    Final,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Pattern,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from monkeytypes import NetworkPort, NetworkProtocol, NetworkService, PortStatus
+
+from .port_scan_data import PortScanData
+from .target_host import CompactPortScanDataDict, PortScanDataDict, TargetHostPorts
+
+# Each port is stored in one byte. 0 means that the port hasn't been scanned. Any other value is 1
+# plus the position of the port's (status, protocol, service) in this tuple.
+_PORT_SCAN_RESULTS: Final = tuple(product(PortStatus, NetworkProtocol, NetworkService))
+_PORT_SCAN_RESULT_CODES: Final = {
+    result: code for code, result in enumerate(_PORT_SCAN_RESULTS, start=1)
+}
+_NOT_SCANNED: Final = 0
+_PORT_TABLE_SIZE: Final = 65536
+_PROTOCOL_TABLES: Final = (NetworkProtocol.TCP, NetworkProtocol.UDP)
+_HEADER: Final = struct.Struct("<I")  # number of target IPs
+
+
+def _encode_port_scan_data(port_scan_data: PortScanData) -> int:
+    if port_scan_data.banner is not None:
+        raise ValueError("Banners can't be stored in shared memory")
+
+    return _PORT_SCAN_RESULT_CODES[
+        (port_scan_data.status, port_scan_data.protocol, port_scan_data.service)
+    ]
+
+
+@lru_cache
+def _compile_port_scan_result_pattern(
+    status: Optional[PortStatus] = None,
+    protocol: Optional[NetworkProtocol] = None,
+    service: Optional[NetworkService] = None,
+) -> Pattern[bytes]:
+    # Matches the bytes of all ports whose results have the given status, protocol, and service
+    codes = (
+        code
+        for code, result in enumerate(_PORT_SCAN_RESULTS, start=1)
+        if (status is None or result[0] is status)
+        and (protocol is None or result[1] is protocol)
+        and (service is None or result[2] is service)
+    )
+    return re.compile(b"[" + b"".join(re.escape(bytes([code])) for code in codes) + b"]")
+
+
+class SharedPortScanDataDict(PortScanDataDict):
+    """
+    A PortScanDataDict that stores its contents in a table in shared memory
+
+    Each port is stored in a single byte at its offset in the table, so several processes that
+    share the table can read and write ports without serializing them. PortScanData objects are
+    created when they are accessed, so they are equal to, but not the same objects as, the ones
+    that were added. Banners can't be stored.
+
+    The `open`, `closed`, `get_open_service_ports()`, `get_open_services()`, and
+    `get_protocol_ports()` queries scan the table and return snapshots rather than live views.
+    `copy()` returns a CompactPortScanDataDict that is not shared.
+    """
+
+    def __init__(self, table: memoryview):
+        """
+        :param table: A writable buffer with one byte for every port
+        """
+        if len(table) != _PORT_TABLE_SIZE:
+            raise ValueError(f"Expected a table of {_PORT_TABLE_SIZE} bytes, got {len(table)}")
+
+        self._table = table
+
+    def __len__(self) -> int:
+        return _PORT_TABLE_SIZE - bytes(self._table).count(_NOT_SCANNED)
+
+    def __iter__(self) -> Iterator[NetworkPort]:
+        return iter(self._find_ports(_compile_port_scan_result_pattern()))
+
+    def __contains__(self, key: object) -> bool:
+        return self._get_code(key) != _NOT_SCANNED
+
+    def __getitem__(self, key: NetworkPort) -> PortScanData:
+        port_scan_data = self._get_validated(key)
+        if port_scan_data is None:
+            raise KeyError(key)
+
+        return port_scan_data
+
+    def __delitem__(self, key: NetworkPort):
+        if key not in self:
+            raise KeyError(key)
+
+        self._table[key] = _NOT_SCANNED
+
+    def __repr__(self) -> str:
+        return repr(dict(self._validated_items()))
+
+    def __ror__(self, other) -> PortScanDataDict:  # type: ignore [override]
+        port_scan_data_dict = PortScanDataDict(other)
+        port_scan_data_dict |= self
+        return port_scan_data_dict
+
+    def copy(self) -> PortScanDataDict:  # type: ignore [override]
+        # The table can't be shared by another instance, so copies are stored compactly instead
+        port_scan_data_dict = CompactPortScanDataDict()
+        port_scan_data_dict.update_validated(self)
+        return port_scan_data_dict
+
+    def clear(self):
+        self._table[:] = bytes(_PORT_TABLE_SIZE)
+
+    def _get_code(self, port: object) -> int:
+        if type(port) is not int or not 0 <= port < _PORT_TABLE_SIZE:
+            return _NOT_SCANNED
+
+        return self._table[port]
+
+    def _find_ports(self, pattern: Pattern[bytes]) -> List[NetworkPort]:
+        return [match.start() for match in pattern.finditer(self._table)]
+
+    def _get_validated(self, port: NetworkPort) -> Optional[PortScanData]:
+        code = self._get_code(port)
+        if code == _NOT_SCANNED:
+            return None
+
+        status, protocol, service = _PORT_SCAN_RESULTS[code - 1]
+        return PortScanData.model_construct(
+            port=port, status=status, protocol=protocol, banner=None, service=service
+        )
+
+    def _validated_items(self) -> Iterable[Tuple[NetworkPort, PortScanData]]:
+        return ((port, self[port]) for port in self)
+
+    def _set_validated_items(self, items: Iterable[Tuple[NetworkPort, PortScanData]]):
+        # Every item is encoded before any is written, so either all items are set or none are
+        codes = [(port, _encode_port_scan_data(port_scan_data)) for port, port_scan_data in items]
+        for port, code in codes:
+            self._table[port] = code
+
+    def _set_validated_item(self, port: NetworkPort, port_scan_data: PortScanData):
+        self._table[port] = _encode_port_scan_data(port_scan_data)
+
+    @property
+    def open(self) -> AbstractSet[NetworkPort]:
+        return self._find_port_set(_compile_port_scan_result_pattern(status=PortStatus.OPEN))
+
+    @property
+    def closed(self) -> AbstractSet[NetworkPort]:
+        return self._find_port_set(_compile_port_scan_result_pattern(status=PortStatus.CLOSED))
+
+    def get_open_service_ports(self, service: NetworkService) -> AbstractSet[NetworkPort]:
+        return self._find_port_set(
+            _compile_port_scan_result_pattern(status=PortStatus.OPEN, service=service)
+        )
+
+    def get_open_services(self) -> FrozenSet[NetworkService]:
+        return frozenset(
+            _PORT_SCAN_RESULTS[code - 1][2]
+            for code in set(self._table)
+            if code != _NOT_SCANNED and _PORT_SCAN_RESULTS[code - 1][0] is PortStatus.OPEN
+        )
+
+    def get_protocol_ports(self, protocol: NetworkProtocol) -> AbstractSet[NetworkPort]:
+        return self._find_port_set(_compile_port_scan_result_pattern(protocol=protocol))
+
+    def _find_port_set(self, pattern: Pattern[bytes]) -> AbstractSet[NetworkPort]:
+        return frozenset(self._find_ports(pattern))
+
+
+class SharedPortScanStore:
+    """
+    Port scan results for a set of target hosts, stored in shared memory
+
+    The store is created by one process, usually before a process pool is started, with the IPs
+    of all of the target hosts that will be scanned. Other processes attach to it by name, or by
+    receiving the store as a pickled argument, and write their results into the TargetHostPorts
+    returned by `get_target_host_ports()`. Every process sees the results as soon as they are
+    written, so no results need to be serialized and sent back to the parent.
+
+    Each target host takes 128 KiB: one byte for every TCP and UDP port. See
+    SharedPortScanDataDict for what can be stored.
+    """
+
+    def __init__(self, target_ips: Iterable[Union[IPv4Address, str]]):
+        """
+        :param target_ips: The IPs of the target hosts whose ports will be stored
+        :raises ValueError: If there are no target IPs or an IP is invalid
+        """
+        unique_target_ips = list(dict.fromkeys(map(IPv4Address, target_ips)))
+        if not unique_target_ips:
+            raise ValueError("A SharedPortScanStore needs at least one target IP")
+
+        header_size = _HEADER.size + 4 * len(unique_target_ips)
+        size = header_size + len(unique_target_ips) * len(_PROTOCOL_TABLES) * _PORT_TABLE_SIZE
+        shm = shared_memory.SharedMemory(create=True, size=size)
+
+        try:
+            _HEADER.pack_into(shm.buf, 0, len(unique_target_ips))
+            shm.buf[_HEADER.size : header_size] = b"".join(ip.packed for ip in unique_target_ips)
+            shm.buf[header_size:size] = bytes(size - header_size)
+        except BaseException:
+            shm.close()
+            shm.unlink()
+            raise
+
+        self._init(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedPortScanStore":
+        """
+        Attach to a store that was created by another process
+
+        :param name: The name of the store
+        :return: A store that shares the results of the store with the given name
+        :raises FileNotFoundError: If there is no store with the given name
+        """
+        store = cls.__new__(cls)
+        store._init(shared_memory.SharedMemory(name=name), owner=False)
+        return store
+
+    def _init(self, shm: shared_memory.SharedMemory, owner: bool):
+        self._shm = shm
+        self._owner = owner
+
+        (num_target_ips,) = _HEADER.unpack_from(shm.buf, 0)
+        header_size = _HEADER.size + 4 * num_target_ips
+        target_ips = shm.buf[_HEADER.size : header_size].tobytes()
+        self._target_ips = [
+            IPv4Address(target_ips[offset : offset + 4]) for offset in range(0, len(target_ips), 4)
+        ]
+
+        # These views of the shared memory must be released before it can be closed
+        self._tables: List[memoryview] = []
+        self._target_host_ports: Dict[IPv4Address, TargetHostPorts] = {}
+        offset = header_size
+        for target_ip in self._target_ips:
+            tables = []
+            for _ in _PROTOCOL_TABLES:
+                tables.append(shm.buf[offset : offset + _PORT_TABLE_SIZE])
+                offset += _PORT_TABLE_SIZE
+
+            self._tables.extend(tables)
+            tcp_table, udp_table = tables
+            self._target_host_ports[target_ip] = TargetHostPorts(
+                tcp_ports=SharedPortScanDataDict(tcp_table),
+                udp_ports=SharedPortScanDataDict(udp_table),
+            )
+
+    def __reduce__(self):
+        return (self.__class__.attach, (self.name,))
+
+    def __enter__(self) -> "SharedPortScanStore":
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+        if self._owner:
+            self.unlink()
+
+    @property
+    def name(self) -> str:
+        """
+        The name that other processes can use to attach to the store
+        """
+        return self._shm.name
+
+    @property
+    def target_ips(self) -> Sequence[IPv4Address]:
+        return tuple(self._target_ips)
+
+    def __contains__(self, target_ip: object) -> bool:
+        try:
+            return IPv4Address(target_ip) in self._target_host_ports  # type: ignore [arg-type]
+        except ValueError:
+            return False
+
+    def get_target_host_ports(self, target_ip: Union[IPv4Address, str]) -> TargetHostPorts:
+        """
+        Get the ports of a target host
+
+        :param target_ip: The IP of the target host
+        :return: A TargetHostPorts whose ports are read from and written to shared memory
+        :raises KeyError: If the target host is not in the store
+        """
+        return self._target_host_ports[IPv4Address(target_ip)]
+
+    def close(self):
+        """
+        Detach this process from the store
+
+        TargetHostPorts returned by `get_target_host_ports()` can't be used after the store is
+        closed.
+        """
+        for table in self._tables:
+            table.release()
+        self._tables.clear()
+        self._target_host_ports.clear()
+        self._shm.close()
+
+    def unlink(self):
+        """
+        Free the shared memory once all processes have closed the store
+
+        Only the process that created the store should call this.
+        """
+        self._shm.unlink()
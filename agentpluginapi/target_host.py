@@ -1,7 +1,25 @@
 import pprint
+import struct
+import sys
+from array import array
+from bisect import bisect_left
 from collections import UserDict
 from ipaddress import IPv4Address
-from typing import Optional, Set
+from itertools import compress, pairwise
+from typing import (
+    AbstractSet,
+    Dict,
+    Final,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Self,
+    Set,
+    Tuple,
+)
 
 from monkeytypes import (
     MutableInfectionMonkeyBaseModel,
@@ -15,28 +33,623 @@ from pydantic import ConfigDict, Field, TypeAdapter, field_serializer
 
 from .port_scan_data import PortScanData
 
+# Building a TypeAdapter is expensive, so the validators are built once and shared by all instances
+_network_port_validator: Final[TypeAdapter[int]] = TypeAdapter(NetworkPort)
+_port_scan_data_mapping_validator: Final[TypeAdapter[Dict[int, PortScanData]]] = TypeAdapter(
+    Dict[NetworkPort, PortScanData]
+)
+
+
+class _PortSetView(AbstractSet[NetworkPort]):
+    """
+    A read-only, live view of a set of ports
+    """
+
+    __slots__ = ("_ports",)
+
+    def __init__(self, ports: AbstractSet[NetworkPort]):
+        self._ports = ports
+
+    def __contains__(self, port: object) -> bool:
+        return port in self._ports
+
+    def __iter__(self) -> Iterator[NetworkPort]:
+        return iter(self._ports)
+
+    def __len__(self) -> int:
+        return len(self._ports)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({set(self._ports)!r})"
+
+    @classmethod
+    def _from_iterable(cls, it: Iterable[NetworkPort]) -> FrozenSet[NetworkPort]:
+        # Set operators build their results with this, so they return sets rather than views
+        return frozenset(it)
+
+
+class _PortColumns(NamedTuple):
+    """
+    The contents of a PortScanDataDict as parallel arrays of ports and enum codes, sorted by port
+    """
+
+    ports: array
+    statuses: array
+    protocols: array
+    services: array
+    banners: Mapping[NetworkPort, str]
+
+
+def _merge_port_scan_data(current: PortScanData, other: PortScanData) -> PortScanData:
+    # An open port stays open, and unknown or missing fields don't overwrite known ones. Otherwise,
+    # `other` is the newer result, so it wins. `current` is returned if nothing would change.
+    status = current.status if current.status is PortStatus.OPEN else other.status
+    protocol = current.protocol if other.protocol is NetworkProtocol.UNKNOWN else other.protocol
+    service = current.service if other.service is NetworkService.UNKNOWN else other.service
+    banner = current.banner if other.banner is None else other.banner
+
+    if (status, protocol, service, banner) == (
+        current.status,
+        current.protocol,
+        current.service,
+        current.banner,
+    ):
+        return current
+
+    return current.model_copy(
+        update={"status": status, "protocol": protocol, "service": service, "banner": banner}
+    )
+
 
 class PortScanDataDict(UserDict[NetworkPort, PortScanData]):
+    """
+    A mapping of ports to the results of scanning them
+
+    Ports are indexed by status, service, and protocol as they are added and removed, so the
+    `open`, `closed`, `get_open_service_ports()`, and `get_protocol_ports()` queries do not need
+    to scan every port. These queries return read-only views that reflect later changes to the
+    PortScanDataDict.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._status_index: Dict[PortStatus, Set[NetworkPort]] = {
+            status: set() for status in PortStatus
+        }
+        self._status_service_index: Dict[Tuple[PortStatus, NetworkService], Set[NetworkPort]] = {
+            (status, service): set() for status in PortStatus for service in NetworkService
+        }
+        self._protocol_index: Dict[NetworkProtocol, Set[NetworkPort]] = {
+            protocol: set() for protocol in NetworkProtocol
+        }
+
+        super().__init__(*args, **kwargs)
+
     def __setitem__(self, key: NetworkPort, value: PortScanData):
-        TypeAdapter(NetworkPort).validate_python(key)
-        PortScanData.model_validate(value)
-        super().__setitem__(key, value)
+        key = _validate_network_port(key)
+        if not isinstance(value, PortScanData):
+            value = PortScanData.model_validate(value)
+        self._set_validated_item(key, value)
+
+    def __delitem__(self, key: NetworkPort):
+        port_scan_data = self.data.pop(key)
+        self._remove_from_indexes(key, port_scan_data)
+
+    def __ior__(self, other) -> Self:  # type: ignore [override, misc]
+        if isinstance(other, PortScanDataDict):
+            self.update_validated(other)
+        else:
+            self.update(other)
+        return self
+
+    def __or__(self, other) -> Self:  # type: ignore [override]
+        port_scan_data_dict = self.copy()
+        port_scan_data_dict |= other
+        return port_scan_data_dict
+
+    def __ror__(self, other) -> Self:  # type: ignore [override]
+        port_scan_data_dict = self.__class__(other)
+        port_scan_data_dict |= self
+        return port_scan_data_dict
+
+    def __copy__(self) -> Self:
+        return self.copy()
+
+    def copy(self) -> Self:
+        port_scan_data_dict = self.__class__()
+        port_scan_data_dict.update_validated(self)
+        return port_scan_data_dict
+
+    def bulk_update(self, port_scan_data: Mapping[NetworkPort, PortScanData]):
+        """
+        Add many ports at once
+
+        All ports and port scan data are validated in a single pass before any of them are added,
+        so either all of the ports are added or none of them are. PortScanData instances are not
+        re-validated.
+
+        :param port_scan_data: A mapping of ports to the results of scanning them
+        :raises ValueError: If any port or port scan data is invalid
+        """
+        validated_port_scan_data = _port_scan_data_mapping_validator.validate_python(port_scan_data)
+        self._set_validated_items(validated_port_scan_data.items())
+
+    def update_validated(self, other: Mapping[NetworkPort, PortScanData]):
+        """
+        Add all ports from another mapping without validating them again
+
+        The ports and port scan data must already be valid, e.g. because they are in another
+        PortScanDataDict or were validated by pydantic. Use `bulk_update()` for anything else.
+
+        :param other: A mapping of valid ports to valid PortScanData
+        """
+        if isinstance(other, PortScanDataDict):
+            self._set_validated_items(other._validated_items())
+        else:
+            self._set_validated_items(other.items())
+
+    def merge(self, other: "PortScanDataDict"):
+        """
+        Merge the results of another scan of the same ports into this PortScanDataDict
+
+        Ports that are only in `other` are added. For ports that are in both:
+            - A port that is open in either result is open.
+            - A known protocol or service is kept over NetworkProtocol.UNKNOWN or
+              NetworkService.UNKNOWN.
+            - A banner is kept over no banner.
+            - Otherwise, the result from `other` is used.
+
+        The port scan data is not validated again, and only ports whose results change are
+        written, so merging is linear in the size of `other`.
+
+        :param other: A PortScanDataDict whose contents have already been validated
+        :raises TypeError: If `other` is not a PortScanDataDict
+        """
+        if not isinstance(other, PortScanDataDict):
+            raise TypeError(f"Expected a PortScanDataDict, got {type(other).__name__}")
+
+        changed_items = []
+        for port, port_scan_data in other._validated_items():
+            current_port_scan_data = self._get_validated(port)
+            if current_port_scan_data is None:
+                changed_items.append((port, port_scan_data))
+                continue
+
+            merged_port_scan_data = _merge_port_scan_data(current_port_scan_data, port_scan_data)
+            if merged_port_scan_data is not current_port_scan_data:
+                changed_items.append((port, merged_port_scan_data))
+
+        self._set_validated_items(changed_items)
+
+    def _get_validated(self, port: NetworkPort) -> Optional[PortScanData]:
+        return self.data.get(port)
+
+    def _validated_items(self) -> Iterable[Tuple[NetworkPort, PortScanData]]:
+        return self.data.items()
+
+    def _set_validated_items(self, items: Iterable[Tuple[NetworkPort, PortScanData]]):
+        for port, psd in items:
+            self._set_validated_item(port, psd)
+
+    def _port_columns(self) -> _PortColumns:
+        # Hashing enums is slow, so the codes are taken from the indexes rather than from each port.
+        # The indexes were built by iterating over the enums, which is also the order of the codes.
+        ports = array("H", sorted(self.data))
+        positions = {port: position for position, port in enumerate(ports)}
+        statuses = array("B", bytes(len(ports)))
+        protocols = array("B", bytes(len(ports)))
+        services = array("B", bytes(len(ports)))
+
+        for code, status_service_ports in enumerate(self._status_service_index.values()):
+            status_code, service_code = divmod(code, len(_NETWORK_SERVICES))
+            for port in status_service_ports:
+                statuses[positions[port]] = status_code
+                services[positions[port]] = service_code
+
+        for protocol_code, protocol_ports in enumerate(self._protocol_index.values()):
+            for port in protocol_ports:
+                protocols[positions[port]] = protocol_code
+
+        return _PortColumns(
+            ports=ports,
+            statuses=statuses,
+            protocols=protocols,
+            services=services,
+            banners={port: psd.banner for port, psd in self.data.items() if psd.banner is not None},
+        )
+
+    def _set_port_columns(self, columns: _PortColumns):
+        port_scan_data = _decode_port_scan_data(columns)
+        if self.data:
+            self._set_validated_items(zip(columns.ports, port_scan_data))
+            return
+
+        # Nothing needs to be removed from the indexes, so ports are added to them by their codes
+        status_index = list(self._status_index.values())
+        status_service_index = list(self._status_service_index.values())
+        protocol_index = list(self._protocol_index.values())
+        self.data.update(zip(columns.ports, port_scan_data))
+        for port, status, protocol, service in zip(
+            columns.ports, columns.statuses, columns.protocols, columns.services
+        ):
+            status_index[status].add(port)
+            status_service_index[status * len(_NETWORK_SERVICES) + service].add(port)
+            protocol_index[protocol].add(port)
+
+    def _set_validated_item(self, port: NetworkPort, port_scan_data: PortScanData):
+        previous_port_scan_data = self.data.get(port)
+        if previous_port_scan_data is not None:
+            self._remove_from_indexes(port, previous_port_scan_data)
+
+        self.data[port] = port_scan_data
+        self._add_to_indexes(port, port_scan_data)
+
+    def _add_to_indexes(self, port: NetworkPort, port_scan_data: PortScanData):
+        self._status_index[port_scan_data.status].add(port)
+        self._status_service_index[(port_scan_data.status, port_scan_data.service)].add(port)
+        self._protocol_index[port_scan_data.protocol].add(port)
+
+    def _remove_from_indexes(self, port: NetworkPort, port_scan_data: PortScanData):
+        self._status_index[port_scan_data.status].discard(port)
+        self._status_service_index[(port_scan_data.status, port_scan_data.service)].discard(port)
+        self._protocol_index[port_scan_data.protocol].discard(port)
 
     @property
-    def open(self) -> Set[NetworkPort]:
-        return self._filter_ports_by_status(PortStatus.OPEN)
+    def open(self) -> AbstractSet[NetworkPort]:
+        return _PortSetView(self._status_index[PortStatus.OPEN])
 
     @property
-    def closed(self) -> Set[NetworkPort]:
-        return self._filter_ports_by_status(PortStatus.CLOSED)
+    def closed(self) -> AbstractSet[NetworkPort]:
+        return _PortSetView(self._status_index[PortStatus.CLOSED])
 
-    def _filter_ports_by_status(self, status: PortStatus) -> Set[NetworkPort]:
-        return {
-            port for port, port_scan_data in self.data.items() if port_scan_data.status == status
-        }
+    def get_open_service_ports(self, service: NetworkService) -> AbstractSet[NetworkPort]:
+        return _PortSetView(self._status_service_index[(PortStatus.OPEN, service)])
+
+    def get_open_services(self) -> FrozenSet[NetworkService]:
+        """
+        Get the services that are running on at least one open port
+
+        This is much faster than calling `get_open_service_ports()` for every service, since
+        PortScanDataDicts that don't index their ports find all of the services in a single scan.
+
+        :return: The services of the open ports
+        """
+        return frozenset(
+            service
+            for (status, service), ports in self._status_service_index.items()
+            if status is PortStatus.OPEN and ports
+        )
+
+    def get_protocol_ports(self, protocol: NetworkProtocol) -> AbstractSet[NetworkPort]:
+        return _PortSetView(self._protocol_index[protocol])
+
+
+# The enums are stored in CompactPortScanDataDict as their position in these tuples
+_PORT_STATUSES: Final = tuple(PortStatus)
+_NETWORK_PROTOCOLS: Final = tuple(NetworkProtocol)
+_NETWORK_SERVICES: Final = tuple(NetworkService)
+_PORT_STATUS_CODES: Final = {status: code for code, status in enumerate(_PORT_STATUSES)}
+_NETWORK_PROTOCOL_CODES: Final = {
+    protocol: code for code, protocol in enumerate(_NETWORK_PROTOCOLS)
+}
+_NETWORK_SERVICE_CODES: Final = {service: code for code, service in enumerate(_NETWORK_SERVICES)}
+
+# Inserting into the middle of the arrays is O(n), so large batches rebuild the arrays instead
+_MAX_INCREMENTAL_INSERTS: Final = 32
+
+
+class CompactPortScanDataDict(PortScanDataDict):
+    """
+    A PortScanDataDict that stores its contents in parallel typed arrays
+
+    Each port costs a few bytes instead of a full PortScanData object. Banners are kept in a
+    separate table, since most ports don't have one. PortScanData objects are created when they are
+    accessed, so they are equal to, but not the same objects as, the ones that were added. Their
+    `port` field is always the key they were stored under.
+
+    Ports are kept sorted, so lookups are O(log n). The `open`, `closed`,
+    `get_open_service_ports()`, `get_open_services()`, and `get_protocol_ports()` queries scan the
+    arrays and return snapshots rather than live views.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._ports = array("H")
+        self._statuses = array("B")
+        self._protocols = array("B")
+        self._services = array("B")
+        self._banners: Dict[NetworkPort, str] = {}
+
+        port_scan_data = dict(*args, **kwargs)
+        if port_scan_data:
+            self.bulk_update(port_scan_data)
+
+    def __len__(self) -> int:
+        return len(self._ports)
+
+    def __iter__(self) -> Iterator[NetworkPort]:
+        return iter(self._ports)
+
+    def __contains__(self, key: object) -> bool:
+        return self._find_index(key) is not None
+
+    def __getitem__(self, key: NetworkPort) -> PortScanData:
+        index = self._find_index(key)
+        if index is None:
+            raise KeyError(key)
+
+        return self._materialize(index)
+
+    def __delitem__(self, key: NetworkPort):
+        index = self._find_index(key)
+        if index is None:
+            raise KeyError(key)
+
+        for column in self._columns():
+            del column[index]
+        self._banners.pop(key, None)
+
+    def __repr__(self) -> str:
+        return repr(dict(self._validated_items()))
+
+    def clear(self):
+        for column in self._columns():
+            del column[:]
+        self._banners.clear()
+
+    def _columns(self) -> Tuple[array, array, array, array]:
+        return (self._ports, self._statuses, self._protocols, self._services)
+
+    def _find_index(self, port: object) -> Optional[int]:
+        try:
+            index = bisect_left(self._ports, port)  # type: ignore [call-overload]
+        except TypeError:
+            return None
+
+        if index < len(self._ports) and self._ports[index] == port:
+            return index
+
+        return None
+
+    def _materialize(self, index: int) -> PortScanData:
+        port = self._ports[index]
+        return PortScanData.model_construct(
+            port=port,
+            status=_PORT_STATUSES[self._statuses[index]],
+            protocol=_NETWORK_PROTOCOLS[self._protocols[index]],
+            banner=self._banners.get(port),
+            service=_NETWORK_SERVICES[self._services[index]],
+        )
+
+    def _get_validated(self, port: NetworkPort) -> Optional[PortScanData]:
+        index = self._find_index(port)
+        return None if index is None else self._materialize(index)
+
+    def _validated_items(self) -> Iterable[Tuple[NetworkPort, PortScanData]]:
+        return ((self._ports[i], self._materialize(i)) for i in range(len(self._ports)))
+
+    def _set_validated_items(self, items: Iterable[Tuple[NetworkPort, PortScanData]]):
+        rows = {port: self._encode(port, psd) for port, psd in items}
+        if len(rows) <= _MAX_INCREMENTAL_INSERTS:
+            for port, row in rows.items():
+                self._set_row(port, row)
+            return
+
+        all_rows = dict(zip(self._ports, zip(self._statuses, self._protocols, self._services)))
+        all_rows.update(rows)
+        ports = sorted(all_rows)
+
+        self._ports = array("H", ports)
+        self._statuses = array("B", (all_rows[port][0] for port in ports))
+        self._protocols = array("B", (all_rows[port][1] for port in ports))
+        self._services = array("B", (all_rows[port][2] for port in ports))
+
+    def _port_columns(self) -> _PortColumns:
+        return _PortColumns(*self._columns(), banners=self._banners)
+
+    def _set_port_columns(self, columns: _PortColumns):
+        # Decoded columns are already sorted, so an empty dict can adopt them without re-encoding
+        if len(self._ports) > 0:
+            self._set_validated_items(zip(columns.ports, _decode_port_scan_data(columns)))
+            return
+
+        self._ports, self._statuses, self._protocols, self._services = columns[:4]
+        self._banners = dict(columns.banners)
+
+    def _set_validated_item(self, port: NetworkPort, port_scan_data: PortScanData):
+        self._set_row(port, self._encode(port, port_scan_data))
+
+    def _encode(self, port: NetworkPort, port_scan_data: PortScanData) -> Tuple[int, int, int]:
+        if port_scan_data.banner is None:
+            self._banners.pop(port, None)
+        else:
+            self._banners[port] = port_scan_data.banner
 
-    def get_open_service_ports(self, service: NetworkService) -> Set[NetworkPort]:
-        return {port for port in self.open if self[port].service == service}
+        return (
+            _PORT_STATUS_CODES[port_scan_data.status],
+            _NETWORK_PROTOCOL_CODES[port_scan_data.protocol],
+            _NETWORK_SERVICE_CODES[port_scan_data.service],
+        )
+
+    def _set_row(self, port: NetworkPort, row: Tuple[int, int, int]):
+        status, protocol, service = row
+        index = bisect_left(self._ports, port)
+
+        if index < len(self._ports) and self._ports[index] == port:
+            self._statuses[index] = status
+            self._protocols[index] = protocol
+            self._services[index] = service
+        else:
+            self._ports.insert(index, port)
+            self._statuses.insert(index, status)
+            self._protocols.insert(index, protocol)
+            self._services.insert(index, service)
+
+    @property
+    def open(self) -> AbstractSet[NetworkPort]:
+        return self._filter_ports(self._statuses, _PORT_STATUS_CODES[PortStatus.OPEN])
+
+    @property
+    def closed(self) -> AbstractSet[NetworkPort]:
+        return self._filter_ports(self._statuses, _PORT_STATUS_CODES[PortStatus.CLOSED])
+
+    def get_open_service_ports(self, service: NetworkService) -> AbstractSet[NetworkPort]:
+        open_code = _PORT_STATUS_CODES[PortStatus.OPEN]
+        service_code = _NETWORK_SERVICE_CODES[service]
+        return frozenset(
+            port
+            for port, status, port_service in zip(self._ports, self._statuses, self._services)
+            if status == open_code and port_service == service_code
+        )
+
+    def get_open_services(self) -> FrozenSet[NetworkService]:
+        open_code = _PORT_STATUS_CODES[PortStatus.OPEN]
+        service_codes = set(compress(self._services, map(open_code.__eq__, self._statuses)))
+        return frozenset(_NETWORK_SERVICES[code] for code in service_codes)
+
+    def get_protocol_ports(self, protocol: NetworkProtocol) -> AbstractSet[NetworkPort]:
+        return self._filter_ports(self._protocols, _NETWORK_PROTOCOL_CODES[protocol])
+
+    def _filter_ports(self, column: array, code: int) -> AbstractSet[NetworkPort]:
+        return frozenset(compress(self._ports, map(code.__eq__, column)))
+
+
+def _decode_port_scan_data(columns: _PortColumns) -> Iterator[PortScanData]:
+    # The columns are decoded or taken from a PortScanDataDict, so they're already valid
+    return (
+        PortScanData.model_construct(
+            port=port,
+            status=_PORT_STATUSES[status],
+            protocol=_NETWORK_PROTOCOLS[protocol],
+            banner=columns.banners.get(port),
+            service=_NETWORK_SERVICES[service],
+        )
+        for port, status, protocol, service in zip(
+            columns.ports, columns.statuses, columns.protocols, columns.services
+        )
+    )
+
+
+def _validate_network_port(port: NetworkPort) -> NetworkPort:
+    # Plain ints are by far the most common keys, so they're checked without calling into pydantic
+    if type(port) is int and 0 <= port <= 65535:
+        return port
+
+    # Keys that pydantic coerces, e.g. "80", are stored as the port number that they represent
+    return _network_port_validator.validate_python(port)
+
+
+# Encoded TargetHosts and TargetHostPorts start with this version, so the format can change later
+_ENCODING_VERSION: Final = 1
+_TARGET_HOST_HEADER: Final = struct.Struct("<B4sBB")  # version, IP, operating system, ICMP
+_TARGET_HOST_PORTS_HEADER: Final = struct.Struct("<BB")  # version, compact storage flags
+_PORT_COLUMNS_HEADER: Final = struct.Struct("<II")  # number of ports, number of banners
+_COMPACT_TCP_PORTS: Final = 0x01
+_COMPACT_UDP_PORTS: Final = 0x02
+_OPERATING_SYSTEMS: Final = (None, *OperatingSystem)
+_OPERATING_SYSTEM_CODES: Final = {
+    operating_system: code for code, operating_system in enumerate(_OPERATING_SYSTEMS)
+}
+# Banners are arbitrary strings, which may contain lone surrogates
+_BANNER_ENCODING: Final = "utf-8"
+_BANNER_ENCODING_ERRORS: Final = "surrogatepass"
+
+
+def _to_little_endian(column: array) -> bytes:
+    if sys.byteorder == "little" or column.itemsize == 1:
+        return column.tobytes()
+
+    swapped_column = array(column.typecode, column)
+    swapped_column.byteswap()
+    return swapped_column.tobytes()
+
+
+def _get_port_columns(port_scan_data_dict: PortScanDataDict) -> _PortColumns:
+    # Subclasses may store their ports elsewhere, so they're encoded from a compact copy
+    if type(port_scan_data_dict) not in (PortScanDataDict, CompactPortScanDataDict):
+        compact_port_scan_data_dict = CompactPortScanDataDict()
+        compact_port_scan_data_dict.update_validated(port_scan_data_dict)
+        port_scan_data_dict = compact_port_scan_data_dict
+
+    return port_scan_data_dict._port_columns()
+
+
+def _encode_port_columns(columns: _PortColumns) -> bytes:
+    banner_ports = array("H", sorted(columns.banners))
+    banners = [
+        columns.banners[port].encode(_BANNER_ENCODING, _BANNER_ENCODING_ERRORS)
+        for port in banner_ports
+    ]
+
+    return b"".join(
+        (
+            _PORT_COLUMNS_HEADER.pack(len(columns.ports), len(banners)),
+            _to_little_endian(columns.ports),
+            _to_little_endian(columns.statuses),
+            _to_little_endian(columns.protocols),
+            _to_little_endian(columns.services),
+            _to_little_endian(banner_ports),
+            _to_little_endian(array("I", map(len, banners))),
+            *banners,
+        )
+    )
+
+
+def _read(data: memoryview, offset: int, size: int) -> Tuple[memoryview, int]:
+    end = offset + size
+    if end > len(data):
+        raise ValueError(f"Truncated data: expected {end} bytes, got {len(data)}")
+
+    return data[offset:end], end
+
+
+def _unpack(header: struct.Struct, data: memoryview, offset: int) -> Tuple[Tuple, int]:
+    fields, offset = _read(data, offset, header.size)
+    return header.unpack(fields), offset
+
+
+def _read_column(typecode: str, data: memoryview, offset: int, length: int) -> Tuple[array, int]:
+    column = array(typecode)
+    column_bytes, offset = _read(data, offset, length * column.itemsize)
+    column.frombytes(column_bytes)
+    if sys.byteorder != "little" and column.itemsize > 1:
+        column.byteswap()
+
+    return column, offset
+
+
+def _check_codes(column: array, values: Tuple, name: str):
+    if max(column, default=0) >= len(values):
+        raise ValueError(f"Invalid {name} code: {max(column)}")
+
+
+def _decode_port_columns(data: memoryview, offset: int) -> Tuple[_PortColumns, int]:
+    (num_ports, num_banners), offset = _unpack(_PORT_COLUMNS_HEADER, data, offset)
+    ports, offset = _read_column("H", data, offset, num_ports)
+    statuses, offset = _read_column("B", data, offset, num_ports)
+    protocols, offset = _read_column("B", data, offset, num_ports)
+    services, offset = _read_column("B", data, offset, num_ports)
+    banner_ports, offset = _read_column("H", data, offset, num_banners)
+    banner_lengths, offset = _read_column("I", data, offset, num_banners)
+
+    if any(previous_port >= port for previous_port, port in pairwise(ports)):
+        raise ValueError("Ports are not sorted and unique")
+    _check_codes(statuses, _PORT_STATUSES, "port status")
+    _check_codes(protocols, _NETWORK_PROTOCOLS, "network protocol")
+    _check_codes(services, _NETWORK_SERVICES, "network service")
+
+    banners: Dict[NetworkPort, str] = {}
+    for port, length in zip(banner_ports, banner_lengths):
+        banner, offset = _read(data, offset, length)
+        banners[port] = str(banner, _BANNER_ENCODING, _BANNER_ENCODING_ERRORS)
+
+    if banners and not banners.keys() <= set(ports):
+        raise ValueError("Banners were found for ports that were not scanned")
+
+    return _PortColumns(ports, statuses, protocols, services, banners), offset
+
+
+def _check_fully_decoded(data: memoryview, offset: int):
+    if offset != len(data):
+        raise ValueError(f"Unexpected {len(data) - offset} bytes after the encoded data")
 
 
 class TargetHostPorts(MutableInfectionMonkeyBaseModel):
@@ -45,10 +658,118 @@ class TargetHostPorts(MutableInfectionMonkeyBaseModel):
     tcp_ports: PortScanDataDict = Field(default_factory=PortScanDataDict)
     udp_ports: PortScanDataDict = Field(default_factory=PortScanDataDict)
 
+    @classmethod
+    def with_compact_storage(cls) -> Self:
+        """
+        Create a TargetHostPorts that stores its ports in CompactPortScanDataDicts
+
+        :return: An empty TargetHostPorts that uses much less memory per port
+        """
+        return cls(tcp_ports=CompactPortScanDataDict(), udp_ports=CompactPortScanDataDict())
+
     @field_serializer("tcp_ports", "udp_ports", when_used="json")
     def dump_ports(self, v):
         return dict(v)
 
+    def to_bytes(self) -> bytes:
+        """
+        Encode the ports in a compact binary format
+
+        Enums are encoded as their ordinals and ports as packed arrays, which makes the result much
+        smaller and faster to encode and decode than JSON. Each PortScanData's `port` field is
+        encoded as the key it is stored under.
+
+        :return: The encoded ports, which can be decoded with `from_bytes()`
+        """
+        flags = 0
+        if isinstance(self.tcp_ports, CompactPortScanDataDict):
+            flags |= _COMPACT_TCP_PORTS
+        if isinstance(self.udp_ports, CompactPortScanDataDict):
+            flags |= _COMPACT_UDP_PORTS
+
+        return b"".join(
+            (
+                _TARGET_HOST_PORTS_HEADER.pack(_ENCODING_VERSION, flags),
+                _encode_port_columns(_get_port_columns(self.tcp_ports)),
+                _encode_port_columns(_get_port_columns(self.udp_ports)),
+            )
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Self:
+        """
+        Decode ports that were encoded with `to_bytes()`
+
+        Ports that were stored in CompactPortScanDataDicts are decoded into
+        CompactPortScanDataDicts.
+
+        :param data: The encoded ports
+        :return: The decoded ports
+        :raises ValueError: If `data` is not a valid encoding
+        """
+        view = memoryview(data)
+        target_host_ports, offset = cls._decode(view, 0)
+        _check_fully_decoded(view, offset)
+
+        return target_host_ports
+
+    @classmethod
+    def _decode(cls, data: memoryview, offset: int) -> Tuple[Self, int]:
+        (version, flags), offset = _unpack(_TARGET_HOST_PORTS_HEADER, data, offset)
+        if version != _ENCODING_VERSION:
+            raise ValueError(f"Unsupported encoding version: {version}")
+
+        tcp_ports = CompactPortScanDataDict() if flags & _COMPACT_TCP_PORTS else PortScanDataDict()
+        udp_ports = CompactPortScanDataDict() if flags & _COMPACT_UDP_PORTS else PortScanDataDict()
+        for ports in (tcp_ports, udp_ports):
+            columns, offset = _decode_port_columns(data, offset)
+            ports._set_port_columns(columns)
+
+        # The decoded data is valid, so validating it again would only slow decoding down
+        return cls.model_construct(tcp_ports=tcp_ports, udp_ports=udp_ports), offset
+
+    def __reduce_ex__(self, protocol):
+        # The binary format is much faster to pickle, but it's only used when nothing is lost
+        if not self._is_losslessly_encodable():
+            return super().__reduce_ex__(protocol)
+
+        return (_unpickle_target_host_ports, (self.to_bytes(), self.model_fields_set))
+
+    def _is_losslessly_encodable(self) -> bool:
+        return (
+            type(self) is TargetHostPorts
+            and _is_losslessly_encodable(self.tcp_ports)
+            and _is_losslessly_encodable(self.udp_ports)
+        )
+
+    def merge(self, other: "TargetHostPorts") -> Self:
+        """
+        Create a TargetHostPorts that combines these ports with another scan's ports
+
+        See `PortScanDataDict.merge()` for how the results of scanning a port are combined.
+
+        :param other: The results of another scan of the same target host
+        :return: A new TargetHostPorts that uses the same storage as this one. Neither this
+                 TargetHostPorts nor `other` is modified.
+        """
+        merged_target_host_ports = self.__class__.model_construct(
+            tcp_ports=self.tcp_ports.copy(), udp_ports=self.udp_ports.copy()
+        )
+        merged_target_host_ports.update_from(other)
+
+        return merged_target_host_ports
+
+    def update_from(self, other: "TargetHostPorts"):
+        """
+        Merge another scan's ports into these ports
+
+        See `PortScanDataDict.merge()` for how the results of scanning a port are combined.
+
+        :param other: The results of another scan of the same target host
+        """
+        self.tcp_ports.merge(other.tcp_ports)
+        self.udp_ports.merge(other.udp_ports)
+
     def __getitem__(self, protocol: NetworkProtocol):
         if protocol == NetworkProtocol.TCP:
             return self.tcp_ports
@@ -67,5 +788,139 @@ class TargetHost(MutableInfectionMonkeyBaseModel):
     def __hash__(self):
         return hash(self.ip)
 
+    def __reduce_ex__(self, protocol):
+        # The binary format is much faster to pickle, but it's only used when nothing is lost
+        if type(self) is not TargetHost or not self.ports_status._is_losslessly_encodable():
+            return super().__reduce_ex__(protocol)
+
+        return (
+            _unpickle_target_host,
+            (self.to_bytes(), self.model_fields_set, self.ports_status.model_fields_set),
+        )
+
+    def merge(self, other: "TargetHost") -> Self:
+        """
+        Create a target host that combines this target host's results with another's
+
+        See `update_from()` for how the results are combined.
+
+        :param other: Another target host with the same IP
+        :return: A new target host. Neither this target host nor `other` is modified.
+        :raises ValueError: If `other` has a different IP
+        """
+        self._check_same_ip(other)
+
+        merged_target_host = self.__class__.model_construct(
+            ip=self.ip,
+            operating_system=self.operating_system,
+            icmp=self.icmp,
+            ports_status=self.ports_status.merge(other.ports_status),
+        )
+        merged_target_host._update_fields_from(other)
+
+        return merged_target_host
+
+    def update_from(self, other: "TargetHost"):
+        """
+        Merge another target host's results into this target host
+
+        A known operating system is kept over an unknown one. Otherwise, the operating system of
+        `other` is used. The target host responded to ICMP if either target host did. Ports are
+        merged with `TargetHostPorts.update_from()`.
+
+        :param other: Another target host with the same IP
+        :raises ValueError: If `other` has a different IP
+        """
+        self._check_same_ip(other)
+
+        self._update_fields_from(other)
+        self.ports_status.update_from(other.ports_status)
+
+    def _check_same_ip(self, other: "TargetHost"):
+        if other.ip != self.ip:
+            raise ValueError(f"Can't merge target host {other.ip} into target host {self.ip}")
+
+    def _update_fields_from(self, other: "TargetHost"):
+        if other.operating_system is not None and other.operating_system != self.operating_system:
+            self.operating_system = other.operating_system
+        if other.icmp and not self.icmp:
+            self.icmp = True
+
+    def to_bytes(self) -> bytes:
+        """
+        Encode the target host in a compact binary format
+
+        See `TargetHostPorts.to_bytes()` for details.
+
+        :return: The encoded target host, which can be decoded with `from_bytes()`
+        """
+        header = _TARGET_HOST_HEADER.pack(
+            _ENCODING_VERSION,
+            self.ip.packed,
+            _OPERATING_SYSTEM_CODES[self.operating_system],
+            self.icmp,
+        )
+        return header + self.ports_status.to_bytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Self:
+        """
+        Decode a target host that was encoded with `to_bytes()`
+
+        :param data: The encoded target host
+        :return: The decoded target host
+        :raises ValueError: If `data` is not a valid encoding
+        """
+        view = memoryview(data)
+        (version, ip, operating_system, icmp), offset = _unpack(_TARGET_HOST_HEADER, view, 0)
+        if version != _ENCODING_VERSION:
+            raise ValueError(f"Unsupported encoding version: {version}")
+        if operating_system >= len(_OPERATING_SYSTEMS):
+            raise ValueError(f"Invalid operating system code: {operating_system}")
+
+        ports_status, offset = TargetHostPorts._decode(view, offset)
+        _check_fully_decoded(view, offset)
+
+        return cls.model_construct(
+            ip=IPv4Address(ip),
+            operating_system=_OPERATING_SYSTEMS[operating_system],
+            icmp=bool(icmp),
+            ports_status=ports_status,
+        )
+
     def __str__(self):
         return pprint.pformat(self.to_json_dict())
+
+
+def _is_losslessly_encodable(port_scan_data_dict: PortScanDataDict) -> bool:
+    # Subclasses may store more than the encoding holds, and each PortScanData's `port` field is
+    # encoded as the key that it's stored under
+    if type(port_scan_data_dict) is CompactPortScanDataDict:
+        return True
+
+    return type(port_scan_data_dict) is PortScanDataDict and all(
+        type(port_scan_data) is PortScanData and port_scan_data.port == port
+        for port, port_scan_data in port_scan_data_dict.data.items()
+    )
+
+
+def _unpickle_target_host_ports(data: bytes, fields_set: Set[str]) -> TargetHostPorts:
+    target_host_ports = TargetHostPorts.from_bytes(data)
+    _set_fields_set(target_host_ports, fields_set)
+
+    return target_host_ports
+
+
+def _unpickle_target_host(
+    data: bytes, fields_set: Set[str], ports_status_fields_set: Set[str]
+) -> TargetHost:
+    target_host = TargetHost.from_bytes(data)
+    _set_fields_set(target_host, fields_set)
+    _set_fields_set(target_host.ports_status, ports_status_fields_set)
+
+    return target_host
+
+
+def _set_fields_set(model: MutableInfectionMonkeyBaseModel, fields_set: Set[str]):
+    # from_bytes() builds models with model_construct(), which marks every field as set
+    object.__setattr__(model, "__pydantic_fields_set__", set(fields_set))
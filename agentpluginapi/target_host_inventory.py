@@ -0,0 +1,206 @@
+from bisect import bisect_left, insort
+from ipaddress import IPv4Address, IPv4Network
+from operator import itemgetter
+from typing import (
+    Dict,
+    Final,
+    FrozenSet,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from monkeytypes import NetworkProtocol, NetworkService, OperatingSystem
+
+from .target_host import TargetHost
+
+_IndexKey = Hashable
+
+# Every target host is indexed under this key, so its index is the sorted list of all IPs
+_ALL_TARGET_HOSTS: Final = "all"
+_OPERATING_SYSTEM: Final = "operating_system"
+_ICMP: Final = "icmp"
+_INDEXED_PROTOCOLS: Final = (NetworkProtocol.TCP, NetworkProtocol.UDP)
+_IPV4_ADDRESS_SPACE_SIZE: Final = 2**32
+
+
+def _get_index_keys(target_host: TargetHost) -> FrozenSet[_IndexKey]:
+    keys: Set[_IndexKey] = {
+        _ALL_TARGET_HOSTS,
+        (_OPERATING_SYSTEM, target_host.operating_system),
+        (_ICMP, target_host.icmp),
+    }
+
+    for protocol in _INDEXED_PROTOCOLS:
+        ports = target_host.ports_status[protocol]
+        keys.update((protocol, service) for service in ports.get_open_services())
+
+    return frozenset(keys)
+
+
+class TargetHostInventory:
+    """
+    A collection of target hosts that can be queried by subnet, operating system, ICMP response,
+    and open service
+
+    Target hosts are keyed by IP. Each index is a list of IPs, as integers, that is kept sorted, so
+    a query binary searches for the subnet in the smallest relevant index and only visits the
+    target hosts in that part of it. Queries are O(log n + k), where k is the number of target
+    hosts in the subnet that match the most selective criterion.
+
+    Target hosts are indexed when they are added. If a target host is modified after it is added,
+    add it again to update the indexes.
+    """
+
+    def __init__(self, target_hosts: Iterable[TargetHost] = ()):
+        """
+        :param target_hosts: Target hosts to add to the inventory
+        """
+        self._target_hosts: Dict[int, TargetHost] = {}
+        self._index_keys: Dict[int, FrozenSet[_IndexKey]] = {}
+        self._indexes: Dict[_IndexKey, List[int]] = {_ALL_TARGET_HOSTS: []}
+
+        self.update(target_hosts)
+
+    def __len__(self) -> int:
+        return len(self._target_hosts)
+
+    def __iter__(self) -> Iterator[TargetHost]:
+        """
+        Iterate over the target hosts in order of IP
+        """
+        return (self._target_hosts[ip] for ip in list(self._indexes[_ALL_TARGET_HOSTS]))
+
+    def __contains__(self, ip: object) -> bool:
+        if isinstance(ip, TargetHost):
+            ip = ip.ip
+
+        try:
+            return int(IPv4Address(ip)) in self._target_hosts  # type: ignore [arg-type]
+        except ValueError:
+            return False
+
+    def __getitem__(self, ip: Union[IPv4Address, str]) -> TargetHost:
+        return self._target_hosts[int(IPv4Address(ip))]
+
+    def get(
+        self, ip: Union[IPv4Address, str], default: Optional[TargetHost] = None
+    ) -> Optional[TargetHost]:
+        return self._target_hosts.get(int(IPv4Address(ip)), default)
+
+    def add(self, target_host: TargetHost):
+        """
+        Add a target host, replacing any target host with the same IP
+
+        :param target_host: The target host to add
+        """
+        ip = int(target_host.ip)
+        for key in self._store(ip, target_host):
+            insort(self._indexes.setdefault(key, []), ip)
+
+    def update(self, target_hosts: Iterable[TargetHost]):
+        """
+        Add many target hosts at once
+
+        Each index is sorted once, so this is much faster than adding the target hosts one at a
+        time. If several target hosts have the same IP, the last one is kept.
+
+        :param target_hosts: The target hosts to add
+        """
+        latest_target_hosts = {int(target_host.ip): target_host for target_host in target_hosts}
+        added_ips: Dict[_IndexKey, List[int]] = {}
+
+        for ip, target_host in latest_target_hosts.items():
+            for key in self._store(ip, target_host):
+                added_ips.setdefault(key, []).append(ip)
+
+        for key, ips in added_ips.items():
+            index = self._indexes.setdefault(key, [])
+            index.extend(ips)
+            index.sort()
+
+    def remove(self, ip: Union[IPv4Address, str]) -> TargetHost:
+        """
+        Remove a target host
+
+        :param ip: The IP of the target host to remove
+        :return: The target host that was removed
+        :raises KeyError: If there is no target host with the IP
+        """
+        int_ip = int(IPv4Address(ip))
+        if int_ip not in self._target_hosts:
+            raise KeyError(ip)
+
+        self._remove_from_indexes(int_ip)
+        del self._index_keys[int_ip]
+        return self._target_hosts.pop(int_ip)
+
+    def _store(self, ip: int, target_host: TargetHost) -> FrozenSet[_IndexKey]:
+        # The caller is responsible for adding the IP to the indexes under the returned keys
+        if ip in self._target_hosts:
+            self._remove_from_indexes(ip)
+
+        index_keys = _get_index_keys(target_host)
+        self._target_hosts[ip] = target_host
+        self._index_keys[ip] = index_keys
+
+        return index_keys
+
+    def _remove_from_indexes(self, ip: int):
+        for key in self._index_keys[ip]:
+            index = self._indexes[key]
+            del index[bisect_left(index, ip)]
+
+    def find(
+        self,
+        network: Optional[Union[IPv4Network, str]] = None,
+        *,
+        operating_system: Optional[OperatingSystem] = None,
+        icmp: Optional[bool] = None,
+        open_service: Optional[Tuple[NetworkProtocol, NetworkService]] = None,
+    ) -> List[TargetHost]:
+        """
+        Find the target hosts that match all of the given criteria
+
+        Criteria that are None are ignored, so `find()` returns all target hosts.
+
+        :param network: The subnet that the target hosts are in, e.g. "10.2.0.0/16"
+        :param operating_system: The operating system of the target hosts
+        :param icmp: Whether the target hosts responded to ICMP
+        :param open_service: A protocol and a service that has an open port on the target hosts,
+                             e.g. `(NetworkProtocol.TCP, NetworkService.SMB)`
+        :return: The matching target hosts, in order of IP
+        :raises ValueError: If `network` is not a valid IPv4 network
+        """
+        required_keys: Set[_IndexKey] = set()
+        if operating_system is not None:
+            required_keys.add((_OPERATING_SYSTEM, operating_system))
+        if icmp is not None:
+            required_keys.add((_ICMP, icmp))
+        if open_service is not None:
+            required_keys.add(tuple(open_service))
+
+        first_ip, end_ip = 0, _IPV4_ADDRESS_SPACE_SIZE
+        if network is not None:
+            network = IPv4Network(network)
+            first_ip = int(network.network_address)
+            end_ip = int(network.broadcast_address) + 1
+
+        # Only the part of the smallest index that is in the network needs to be visited
+        index_ranges = []
+        for key in required_keys or {_ALL_TARGET_HOSTS}:
+            index = self._indexes.get(key, [])
+            start = bisect_left(index, first_ip)
+            index_ranges.append((bisect_left(index, end_ip, lo=start) - start, start, index))
+        size, start, index = min(index_ranges, key=itemgetter(0))
+
+        return [
+            self._target_hosts[ip]
+            for ip in index[start : start + size]
+            if required_keys <= self._index_keys[ip]
+        ]
@@ -0,0 +1,91 @@
+from ipaddress import IPv4Address
+from typing import BinaryIO, Dict, Final, Iterable, Iterator, Optional
+
+from monkeytypes import InfectionMonkeyBaseModel, NetworkPort, OperatingSystem
+from pydantic import TypeAdapter, ValidationError
+
+from .port_scan_data import PortScanData
+from .target_host import TargetHost, TargetHostPorts
+
+_NEWLINE: Final = b"\n"
+
+
+class _TargetHostPortsRecord(InfectionMonkeyBaseModel):
+    tcp_ports: Dict[NetworkPort, PortScanData]
+    udp_ports: Dict[NetworkPort, PortScanData]
+
+
+class _TargetHostRecord(InfectionMonkeyBaseModel):
+    # Mirrors the JSON representation of TargetHost, whose PortScanDataDicts can't be validated
+    # from JSON
+    ip: IPv4Address
+    operating_system: Optional[OperatingSystem] = None
+    icmp: bool = False
+    ports_status: _TargetHostPortsRecord
+
+
+# Building serializers and validators is expensive, so they are built once and shared by all calls
+_target_host_serializer: Final[TypeAdapter[TargetHost]] = TypeAdapter(TargetHost)
+_target_host_record_validator: Final[TypeAdapter[_TargetHostRecord]] = TypeAdapter(
+    _TargetHostRecord
+)
+
+
+def dump_target_hosts_jsonl(target_hosts: Iterable[TargetHost], file: BinaryIO) -> int:
+    """
+    Write target hosts to a file as JSON Lines
+
+    Each target host is serialized and written on its own line as it is retrieved from
+    `target_hosts`, so writing a generator of target hosts uses a constant amount of memory. Each
+    line is the same JSON as `TargetHost.model_dump_json()` produces.
+
+    :param target_hosts: The target hosts to write
+    :param file: A binary file-like object to write the target hosts to
+    :return: The number of target hosts that were written
+    """
+    count = 0
+    for target_host in target_hosts:
+        file.write(_target_host_serializer.dump_json(target_host))
+        file.write(_NEWLINE)
+        count += 1
+
+    return count
+
+
+def load_target_hosts_jsonl(file: BinaryIO, compact_storage: bool = False) -> Iterator[TargetHost]:
+    """
+    Read target hosts that were written by `dump_target_hosts_jsonl()`
+
+    The file is read one line at a time as the returned iterator is consumed, so reading uses a
+    constant amount of memory beyond the target hosts that the caller keeps. Blank lines are
+    skipped.
+
+    :param file: A binary file-like object to read the target hosts from
+    :param compact_storage: Whether the target hosts' ports are stored in CompactPortScanDataDicts
+    :return: An iterator of the target hosts in the file
+    :raises ValueError: If a line is not a valid target host
+    """
+    for line_number, line in enumerate(file, start=1):
+        if line.isspace():
+            continue
+
+        try:
+            record = _target_host_record_validator.validate_json(line)
+        except ValidationError as err:
+            raise ValueError(f"Invalid target host on line {line_number}: {err}") from err
+
+        yield _target_host_from_record(record, compact_storage)
+
+
+def _target_host_from_record(record: _TargetHostRecord, compact_storage: bool) -> TargetHost:
+    ports_status = TargetHostPorts.with_compact_storage() if compact_storage else TargetHostPorts()
+    # The record has already been validated, so its contents are not validated again
+    ports_status.tcp_ports.update_validated(record.ports_status.tcp_ports)
+    ports_status.udp_ports.update_validated(record.ports_status.udp_ports)
+
+    return TargetHost.model_construct(
+        ip=record.ip,
+        operating_system=record.operating_system,
+        icmp=record.icmp,
+        ports_status=ports_status,
+    )
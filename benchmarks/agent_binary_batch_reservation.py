@@ -0,0 +1,135 @@
+"""
+Compares reserving 10,000 Agent binary downloads one at a time and in a batch
+
+The registrar in this benchmark compiles wrapper templates and acquires its lock the way an HTTP
+server registrar would, so the difference between the cases is the per-call overhead that
+reserve_downloads() and clear_reservations() avoid.
+
+Run with `python -m benchmarks.agent_binary_batch_reservation` from the repository root.
+"""
+
+import threading
+import timeit
+from ipaddress import IPv4Address
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from monkeytypes import OperatingSystem
+
+from agentpluginapi import (
+    AgentBinaryDownloadRequest,
+    AgentBinaryDownloadTicket,
+    AgentBinaryWrapperTemplate,
+    IHTTPAgentBinaryServerRegistrar,
+    ReservationID,
+)
+
+NUM_REQUESTS = 10_000
+REPEAT = 5
+TEMPLATE = b"#!/bin/sh\n" + b"# padding\n" * 100 + b"$(agent_binary)b\n"
+
+
+class _HTTPAgentBinaryServerRegistrar(IHTTPAgentBinaryServerRegistrar):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reservations: Dict[ReservationID, AgentBinaryWrapperTemplate | None] = {}
+        self._next_id = 0
+
+    def reserve_download(
+        self,
+        operating_system: OperatingSystem,
+        requestor_ip: IPv4Address,
+        agent_binary_wrapper_template: Optional[bytes],
+    ) -> AgentBinaryDownloadTicket:
+        compiled_template = _compile(agent_binary_wrapper_template)
+        with self._lock:
+            return self._reserve(compiled_template)
+
+    def reserve_compiled_download(
+        self,
+        operating_system: OperatingSystem,
+        requestor_ip: IPv4Address,
+        agent_binary_wrapper_template: AgentBinaryWrapperTemplate,
+    ) -> AgentBinaryDownloadTicket:
+        with self._lock:
+            return self._reserve(agent_binary_wrapper_template)
+
+    def reserve_downloads(
+        self, requests: Sequence[AgentBinaryDownloadRequest]
+    ) -> List[AgentBinaryDownloadTicket]:
+        # Requests usually share a few templates, so each distinct template is compiled only once
+        compiled_templates: Dict[
+            bytes | AgentBinaryWrapperTemplate | None, AgentBinaryWrapperTemplate | None
+        ] = {}
+        templates = []
+        for request in requests:
+            template = request.agent_binary_wrapper_template
+            if template not in compiled_templates:
+                compiled_templates[template] = _compile(template)
+            templates.append(compiled_templates[template])
+
+        with self._lock:
+            return [self._reserve(template) for template in templates]
+
+    def clear_reservation(self, reservation_id: ReservationID):
+        with self._lock:
+            del self._reservations[reservation_id]
+
+    def clear_reservations(self, reservation_ids: Iterable[ReservationID]):
+        with self._lock:
+            for reservation_id in reservation_ids:
+                del self._reservations[reservation_id]
+
+    def _reserve(
+        self, agent_binary_wrapper_template: AgentBinaryWrapperTemplate | None
+    ) -> AgentBinaryDownloadTicket:
+        reservation_id = str(self._next_id)
+        self._next_id += 1
+        self._reservations[reservation_id] = agent_binary_wrapper_template
+
+        return AgentBinaryDownloadTicket(
+            reservation_id, f"http://127.0.0.1/{reservation_id}", threading.Event()
+        )
+
+
+def _compile(
+    agent_binary_wrapper_template: bytes | AgentBinaryWrapperTemplate | None,
+) -> AgentBinaryWrapperTemplate | None:
+    if isinstance(agent_binary_wrapper_template, bytes):
+        return AgentBinaryWrapperTemplate(agent_binary_wrapper_template)
+
+    return agent_binary_wrapper_template
+
+
+def main():
+    requests = [
+        AgentBinaryDownloadRequest(OperatingSystem.LINUX, IPv4Address(0x0A000000 + i), TEMPLATE)
+        for i in range(NUM_REQUESTS)
+    ]
+
+    def reserve_and_clear_each():
+        registrar = _HTTPAgentBinaryServerRegistrar()
+        tickets = [
+            registrar.reserve_download(request.operating_system, request.requestor_ip, TEMPLATE)
+            for request in requests
+        ]
+        for ticket in tickets:
+            registrar.clear_reservation(ticket.id)
+
+    def reserve_and_clear_batch():
+        registrar = _HTTPAgentBinaryServerRegistrar()
+        tickets = registrar.reserve_downloads(requests)
+        registrar.clear_reservations(ticket.id for ticket in tickets)
+
+    cases = {
+        "reserve_download()": reserve_and_clear_each,
+        "reserve_downloads()": reserve_and_clear_batch,
+    }
+
+    for name, fn in cases.items():
+        best_sec = min(timeit.repeat(fn, number=1, repeat=REPEAT))
+        us_per_request = best_sec / NUM_REQUESTS * 1e6
+        print(f"{name:<24}{best_sec * 1e3:>10.1f} ms total{us_per_request:>10.2f} µs/request")
+
+
+if __name__ == "__main__":
+    main()
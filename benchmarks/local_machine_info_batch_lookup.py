@@ -0,0 +1,45 @@
+"""
+Compares resolving the interface to every address in a /16 one at a time and in a batch
+
+Run with `python -m benchmarks.local_machine_info_batch_lookup` from the repository root.
+"""
+
+import timeit
+from ipaddress import IPv4Interface, IPv4Network
+from pathlib import Path
+
+from monkeytypes import OperatingSystem
+
+from agentpluginapi import LocalMachineInfo
+
+REPEAT = 3
+TARGET_NETWORK = IPv4Network("10.2.0.0/16")
+
+
+def main():
+    local_machine_info = LocalMachineInfo(
+        operating_system=OperatingSystem.LINUX,
+        temporary_directory=Path("/tmp"),
+        network_interfaces=frozenset(
+            IPv4Interface(f"10.{i // 256}.{i % 256}.1/24") for i in range(512)
+        ),
+    )
+    targets = list(TARGET_NETWORK)
+
+    cases = {
+        "get_interface_to_target()": lambda: [
+            local_machine_info.get_interface_to_target(t) for t in targets
+        ],
+        "get_interfaces_to_targets()": lambda: local_machine_info.get_interfaces_to_targets(
+            targets
+        ),
+    }
+
+    print(f"{len(targets)} targets, {len(local_machine_info.network_interfaces)} interfaces")
+    for name, fn in cases.items():
+        best_sec = min(timeit.repeat(fn, number=1, repeat=REPEAT))
+        print(f"{name:<32}{best_sec * 1e3:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
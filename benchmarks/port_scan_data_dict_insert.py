@@ -0,0 +1,50 @@
+"""
+Compares the per-port cost of inserting 65,535 ports into a PortScanDataDict
+
+Run with `python -m benchmarks.port_scan_data_dict_insert` from the repository root.
+"""
+
+import timeit
+from collections import UserDict
+
+from monkeytypes import NetworkPort, PortStatus
+from pydantic import TypeAdapter
+
+from agentpluginapi import PortScanData, PortScanDataDict
+
+NUM_PORTS = 65535
+REPEAT = 3
+
+
+class _UncachedValidatorPortScanDataDict(UserDict[NetworkPort, PortScanData]):
+    # The PortScanDataDict.__setitem__() implementation from before the validators were cached
+    def __setitem__(self, key: NetworkPort, value: PortScanData):
+        TypeAdapter(NetworkPort).validate_python(key)
+        PortScanData.model_validate(value)
+        super().__setitem__(key, value)
+
+
+def main():
+    port_scan_data = {
+        port: PortScanData(port=port, status=PortStatus.OPEN) for port in range(1, NUM_PORTS + 1)
+    }
+
+    def set_each(dict_type):
+        d = dict_type()
+        for port, psd in port_scan_data.items():
+            d[port] = psd
+
+    cases = {
+        "__setitem__ (uncached validator)": lambda: set_each(_UncachedValidatorPortScanDataDict),
+        "__setitem__": lambda: set_each(PortScanDataDict),
+        "bulk_update()": lambda: PortScanDataDict().bulk_update(port_scan_data),
+    }
+
+    for name, fn in cases.items():
+        best_sec = min(timeit.repeat(fn, number=1, repeat=REPEAT))
+        ns_per_port = best_sec / NUM_PORTS * 1e9
+        print(f"{name:<36}{best_sec * 1e3:>10.1f} ms total{ns_per_port:>10.0f} ns/port")
+
+
+if __name__ == "__main__":
+    main()
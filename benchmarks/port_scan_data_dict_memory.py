@@ -0,0 +1,65 @@
+"""
+Compares the memory used to hold ~1M scanned ports in TargetHostPorts
+
+Run with `python -m benchmarks.port_scan_data_dict_memory` from the repository root.
+"""
+
+import gc
+import tracemalloc
+from typing import Callable, Dict, List
+
+from monkeytypes import NetworkProtocol, NetworkService, PortStatus
+
+from agentpluginapi import PortScanData, TargetHostPorts
+
+NUM_HOSTS = 16
+PORTS_PER_HOST = 65535
+
+
+def scan_host() -> dict[int, PortScanData]:
+    return {
+        port: PortScanData(
+            port=port,
+            status=PortStatus.OPEN if port % 100 == 0 else PortStatus.CLOSED,
+            protocol=NetworkProtocol.TCP,
+            service=NetworkService.HTTP if port == 80 else NetworkService.UNKNOWN,
+            banner="HTTP/1.1 200 OK" if port == 80 else None,
+        )
+        for port in range(1, PORTS_PER_HOST + 1)
+    }
+
+
+def measure(create_target_host_ports: Callable[[], TargetHostPorts]) -> int:
+    gc.collect()
+    tracemalloc.start()
+
+    hosts: List[TargetHostPorts] = []
+    for _ in range(NUM_HOSTS):
+        target_host_ports = create_target_host_ports()
+        target_host_ports.tcp_ports.bulk_update(scan_host())
+        hosts.append(target_host_ports)
+
+    gc.collect()
+    used_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return used_bytes
+
+
+def main():
+    num_ports = NUM_HOSTS * PORTS_PER_HOST
+    cases: Dict[str, Callable[[], TargetHostPorts]] = {
+        "PortScanDataDict": TargetHostPorts,
+        "CompactPortScanDataDict": TargetHostPorts.with_compact_storage,
+    }
+
+    print(f"{num_ports} ports across {NUM_HOSTS} hosts")
+    for name, create_target_host_ports in cases.items():
+        used_bytes = measure(create_target_host_ports)
+        print(
+            f"{name:<28}{used_bytes / 2**20:>10.1f} MiB{used_bytes / num_ports:>10.1f} bytes/port"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Compares returning port scan results from 16 worker processes by pickling them and by writing
+them into a SharedPortScanStore
+
+Run with `python -m benchmarks.shared_port_scan_store_sweep` from the repository root.
+"""
+
+import multiprocessing
+import time
+from ipaddress import IPv4Address
+from typing import Dict, List, Optional
+
+from monkeytypes import NetworkProtocol, NetworkService, PortStatus
+
+from agentpluginapi import PortScanData, SharedPortScanStore, TargetHostPorts
+
+NUM_PROCESSES = 16
+NUM_TARGETS = 64
+PORTS = range(1, 8193)
+TARGET_IPS = [IPv4Address("10.0.0.1") + index for index in range(NUM_TARGETS)]
+REPEAT = 3
+
+_store: Optional[SharedPortScanStore] = None
+
+
+def scan_target(target_ip: IPv4Address) -> Dict[int, PortScanData]:
+    # Simulates a TCP port sweep in which about 1 port in 100 is open
+    return {
+        port: PortScanData(
+            port=port,
+            status=PortStatus.OPEN if (int(target_ip) + port) % 100 == 0 else PortStatus.CLOSED,
+            protocol=NetworkProtocol.TCP,
+            service=NetworkService.HTTP if port == 80 else NetworkService.UNKNOWN,
+        )
+        for port in PORTS
+    }
+
+
+def scan_and_return(target_ip: IPv4Address) -> TargetHostPorts:
+    target_host_ports = TargetHostPorts()
+    target_host_ports.tcp_ports.bulk_update(scan_target(target_ip))
+    return target_host_ports
+
+
+def attach_store(store: SharedPortScanStore):
+    # The store is attached when it is unpickled, so it only needs to be kept
+    global _store
+    _store = store
+
+
+def scan_and_store(target_ip: IPv4Address):
+    assert _store is not None
+    _store.get_target_host_ports(target_ip).tcp_ports.bulk_update(scan_target(target_ip))
+
+
+def sweep_with_pickling() -> int:
+    with multiprocessing.Pool(NUM_PROCESSES) as pool:
+        results: List[TargetHostPorts] = pool.map(scan_and_return, TARGET_IPS)
+
+    return sum(len(target_host_ports.tcp_ports.open) for target_host_ports in results)
+
+
+def sweep_with_shared_port_scan_store() -> int:
+    with SharedPortScanStore(TARGET_IPS) as store:
+        with multiprocessing.Pool(NUM_PROCESSES, attach_store, (store,)) as pool:
+            pool.map(scan_and_store, TARGET_IPS)
+
+        return sum(
+            len(store.get_target_host_ports(target_ip).tcp_ports.open) for target_ip in TARGET_IPS
+        )
+
+
+def main():
+    cases = {
+        "pickled TargetHostPorts": sweep_with_pickling,
+        "SharedPortScanStore": sweep_with_shared_port_scan_store,
+    }
+
+    num_ports = NUM_TARGETS * len(PORTS)
+    print(f"{num_ports} ports on {NUM_TARGETS} targets swept by {NUM_PROCESSES} processes")
+    open_ports = set()
+    for name, sweep in cases.items():
+        times_sec = []
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            open_ports.add(sweep())
+            times_sec.append(time.perf_counter() - start)
+
+        best_sec = min(times_sec)
+        print(
+            f"{name:<28}{best_sec * 1e3:>10.1f} ms total{best_sec / num_ports * 1e9:>10.0f} ns/port"
+        )
+
+    assert len(open_ports) == 1
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Compares the cost of encoding and decoding 10,000 TargetHosts as JSON and as compact binary
+
+Run with `python -m benchmarks.target_host_codec` from the repository root.
+"""
+
+import json
+import pickle
+import timeit
+from ipaddress import IPv4Address
+from typing import Any, Callable, Dict, List, Tuple
+
+from monkeytypes import NetworkProtocol, NetworkService, OperatingSystem, PortStatus
+
+from agentpluginapi import PortScanData, PortScanDataDict, TargetHost, TargetHostPorts
+
+NUM_HOSTS = 10_000
+TCP_PORTS = (
+    21,
+    22,
+    23,
+    25,
+    80,
+    110,
+    135,
+    139,
+    143,
+    443,
+    445,
+    993,
+    995,
+    1433,
+    3306,
+    3389,
+    5432,
+    5900,
+    5985,
+    5986,
+    6379,
+    8000,
+    8008,
+    8080,
+    8443,
+    8888,
+    9200,
+    11211,
+    27017,
+    50000,
+)
+UDP_PORTS = (53, 123, 161, 500)
+REPEAT = 3
+
+
+def create_target_host(index: int, compact: bool) -> TargetHost:
+    target_host = TargetHost(
+        ip=IPv4Address("10.0.0.0") + index,
+        operating_system=OperatingSystem.LINUX if index % 2 else OperatingSystem.WINDOWS,
+        icmp=True,
+        ports_status=TargetHostPorts.with_compact_storage() if compact else TargetHostPorts(),
+    )
+    target_host.ports_status.tcp_ports.bulk_update(
+        {
+            port: PortScanData(
+                port=port,
+                status=PortStatus.OPEN if port in (22, 80, 443) else PortStatus.CLOSED,
+                protocol=NetworkProtocol.TCP,
+                service=NetworkService.HTTP if port == 80 else NetworkService.UNKNOWN,
+                banner="HTTP/1.1 200 OK\r\nServer: nginx/1.18.0" if port == 80 else None,
+            )
+            for port in TCP_PORTS
+        }
+    )
+    target_host.ports_status.udp_ports.bulk_update(
+        {
+            port: PortScanData(port=port, status=PortStatus.CLOSED, protocol=NetworkProtocol.UDP)
+            for port in UDP_PORTS
+        }
+    )
+
+    return target_host
+
+
+def _ports_from_json(ports: Dict[str, Any]) -> PortScanDataDict:
+    port_scan_data_dict = PortScanDataDict()
+    port_scan_data_dict.bulk_update({int(port): psd for port, psd in ports.items()})
+    return port_scan_data_dict
+
+
+def from_json(encoded_target_host: str) -> TargetHost:
+    # TargetHost can't validate its own JSON, so the PortScanDataDicts are rebuilt by hand
+    target_host = json.loads(encoded_target_host)
+    ports_status = target_host.pop("ports_status")
+    return TargetHost(
+        **target_host,
+        ports_status=TargetHostPorts(
+            tcp_ports=_ports_from_json(ports_status["tcp_ports"]),
+            udp_ports=_ports_from_json(ports_status["udp_ports"]),
+        ),
+    )
+
+
+def main():
+    target_hosts = [create_target_host(index, compact=False) for index in range(NUM_HOSTS)]
+    compact_target_hosts = [create_target_host(index, compact=True) for index in range(NUM_HOSTS)]
+
+    Codec = Tuple[List[TargetHost], Callable[[TargetHost], Any], Callable[[Any], TargetHost]]
+    codecs: Dict[str, Codec] = {
+        "model_dump_json()": (target_hosts, TargetHost.model_dump_json, from_json),
+        "to_bytes()": (target_hosts, TargetHost.to_bytes, TargetHost.from_bytes),
+        "to_bytes() (compact)": (compact_target_hosts, TargetHost.to_bytes, TargetHost.from_bytes),
+        "pickle": (target_hosts, pickle.dumps, pickle.loads),
+    }
+
+    print(f"{NUM_HOSTS} hosts with {len(TCP_PORTS)} TCP and {len(UDP_PORTS)} UDP ports each")
+    for name, (hosts, encode, decode) in codecs.items():
+        encoded_hosts: List[Any] = [encode(target_host) for target_host in hosts]
+        assert decode(encoded_hosts[0]) == hosts[0]
+
+        encode_sec = min(timeit.repeat(lambda: list(map(encode, hosts)), number=1, repeat=REPEAT))
+        decode_sec = min(
+            timeit.repeat(lambda: list(map(decode, encoded_hosts)), number=1, repeat=REPEAT)
+        )
+        bytes_per_host = sum(map(len, encoded_hosts)) / NUM_HOSTS
+
+        print(
+            f"{name:<24}{encode_sec * 1e3:>10.1f} ms encode{decode_sec * 1e3:>10.1f} ms decode"
+            f"{bytes_per_host:>10.0f} bytes/host"
+        )
+
+
+if __name__ == "__main__":
+    main()
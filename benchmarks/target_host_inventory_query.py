@@ -0,0 +1,73 @@
+"""
+Compares finding the target hosts in a subnet that have SMB open in a set and in a
+TargetHostInventory
+
+Run with `python -m benchmarks.target_host_inventory_query` from the repository root.
+"""
+
+import timeit
+from ipaddress import IPv4Address, IPv4Network
+from typing import Callable, Dict, List, Set
+
+from monkeytypes import NetworkProtocol, NetworkService, OperatingSystem, PortStatus
+
+from agentpluginapi import PortScanData, TargetHost, TargetHostInventory
+
+NUM_HOSTS = 2**16
+FIRST_IP = IPv4Address("10.0.0.0")
+SMB_HOST_INTERVAL = 20
+NETWORKS = ("10.0.12.0/24", "10.0.0.0/18")
+NUMBER = 10
+REPEAT = 3
+
+
+def create_target_hosts() -> List[TargetHost]:
+    target_hosts = []
+    for index in range(NUM_HOSTS):
+        target_host = TargetHost(ip=FIRST_IP + index, operating_system=OperatingSystem.WINDOWS)
+        if index % SMB_HOST_INTERVAL == 0:
+            target_host.ports_status.tcp_ports[445] = PortScanData(
+                port=445,
+                status=PortStatus.OPEN,
+                protocol=NetworkProtocol.TCP,
+                service=NetworkService.SMB,
+            )
+        target_hosts.append(target_host)
+
+    return target_hosts
+
+
+def find_in_set(target_hosts: Set[TargetHost], network: IPv4Network) -> List[TargetHost]:
+    return sorted(
+        (
+            target_host
+            for target_host in target_hosts
+            if target_host.ip in network
+            and target_host.ports_status.tcp_ports.get_open_service_ports(NetworkService.SMB)
+        ),
+        key=lambda target_host: target_host.ip,
+    )
+
+
+def main():
+    target_hosts = create_target_hosts()
+    target_host_set = set(target_hosts)
+    inventory = TargetHostInventory(target_hosts)
+
+    print(f"{NUM_HOSTS} hosts, 1 in {SMB_HOST_INTERVAL} with SMB open")
+    for network in map(IPv4Network, NETWORKS):
+        cases: Dict[str, Callable[[], List[TargetHost]]] = {
+            "set (linear scan)": lambda: find_in_set(target_host_set, network),
+            "TargetHostInventory.find()": lambda: inventory.find(
+                network, open_service=(NetworkProtocol.TCP, NetworkService.SMB)
+            ),
+        }
+        assert len({tuple(fn()) for fn in cases.values()}) == 1
+
+        for name, fn in cases.items():
+            best_sec = min(timeit.repeat(fn, number=NUMBER, repeat=REPEAT)) / NUMBER
+            print(f"{str(network):<16}{name:<32}{best_sec * 1e6:>12.1f} µs/query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Compares the time and peak memory needed to save and reload the results of a /16 scan
+
+Run with `python -m benchmarks.target_host_jsonl` from the repository root.
+"""
+
+import json
+import tempfile
+import time
+import tracemalloc
+from ipaddress import IPv4Address
+from typing import Any, BinaryIO, Callable, Dict, Iterator, Tuple
+
+from monkeytypes import NetworkProtocol, NetworkService, OperatingSystem, PortStatus
+
+from agentpluginapi import (
+    PortScanData,
+    PortScanDataDict,
+    TargetHost,
+    TargetHostPorts,
+    dump_target_hosts_jsonl,
+    load_target_hosts_jsonl,
+)
+
+NUM_HOSTS = 2**16
+TCP_PORTS = (22, 80, 443, 445, 3389)
+
+
+def generate_target_hosts() -> Iterator[TargetHost]:
+    for index in range(NUM_HOSTS):
+        target_host = TargetHost(
+            ip=IPv4Address("10.0.0.0") + index,
+            operating_system=OperatingSystem.LINUX,
+            icmp=True,
+        )
+        target_host.ports_status.tcp_ports.bulk_update(
+            {
+                port: PortScanData(
+                    port=port,
+                    status=PortStatus.OPEN if port == 80 else PortStatus.CLOSED,
+                    protocol=NetworkProtocol.TCP,
+                    service=NetworkService.HTTP if port == 80 else NetworkService.UNKNOWN,
+                    banner="HTTP/1.1 200 OK" if port == 80 else None,
+                )
+                for port in TCP_PORTS
+            }
+        )
+        yield target_host
+
+
+def dump_json_document(file: BinaryIO):
+    # The JSON document has to be built in memory before it can be written
+    target_hosts = [target_host.to_json_dict() for target_host in generate_target_hosts()]
+    file.write(json.dumps(target_hosts).encode())
+
+
+def _ports_from_json(ports: Dict[str, Any]) -> PortScanDataDict:
+    port_scan_data_dict = PortScanDataDict()
+    port_scan_data_dict.bulk_update({int(port): psd for port, psd in ports.items()})
+    return port_scan_data_dict
+
+
+def load_json_document(file: BinaryIO):
+    for target_host in json.load(file):
+        ports_status = target_host.pop("ports_status")
+        TargetHost(
+            **target_host,
+            ports_status=TargetHostPorts(
+                tcp_ports=_ports_from_json(ports_status["tcp_ports"]),
+                udp_ports=_ports_from_json(ports_status["udp_ports"]),
+            ),
+        )
+
+
+def dump_jsonl(file: BinaryIO):
+    dump_target_hosts_jsonl(generate_target_hosts(), file)
+
+
+def load_jsonl(file: BinaryIO):
+    for _ in load_target_hosts_jsonl(file):
+        pass
+
+
+def measure(fn: Callable[[BinaryIO], None], file: BinaryIO) -> Tuple[float, int]:
+    file.seek(0)
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    fn(file)
+
+    elapsed_sec = time.perf_counter() - start
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed_sec, peak_bytes
+
+
+def main():
+    cases = {
+        "JSON document": (dump_json_document, load_json_document),
+        "dump/load_target_hosts_jsonl()": (dump_jsonl, load_jsonl),
+    }
+
+    print(f"{NUM_HOSTS} hosts with {len(TCP_PORTS)} TCP ports each (timed under tracemalloc)")
+    for name, (dump, load) in cases.items():
+        with tempfile.TemporaryFile() as file:
+            dump_sec, dump_peak_bytes = measure(dump, file)
+            file.truncate()
+            load_sec, load_peak_bytes = measure(load, file)
+
+        print(
+            f"{name:<32}{dump_sec:>8.1f} s dump{dump_peak_bytes / 2**10:>10.0f} KiB peak"
+            f"{load_sec:>8.1f} s load{load_peak_bytes / 2**10:>10.0f} KiB peak"
+        )
+
+
+if __name__ == "__main__":
+    main()
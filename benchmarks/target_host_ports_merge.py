@@ -0,0 +1,75 @@
+"""
+Compares the cost of merging the results of two full TCP scans of a target host
+
+Run with `python -m benchmarks.target_host_ports_merge` from the repository root.
+"""
+
+import time
+from typing import Callable, Dict
+
+from monkeytypes import NetworkProtocol, NetworkService, PortStatus
+
+from agentpluginapi import PortScanData, PortScanDataDict, TargetHostPorts
+
+NUM_PORTS = 65535
+REPEAT = 3
+
+
+def scan(open_port_interval: int, service: NetworkService) -> TargetHostPorts:
+    tcp_ports = PortScanDataDict()
+    tcp_ports.bulk_update(
+        {
+            port: PortScanData(
+                port=port,
+                status=PortStatus.OPEN if port % open_port_interval == 0 else PortStatus.CLOSED,
+                protocol=NetworkProtocol.TCP,
+                service=service if port % open_port_interval == 0 else NetworkService.UNKNOWN,
+            )
+            for port in range(1, NUM_PORTS + 1)
+        }
+    )
+    return TargetHostPorts(tcp_ports=tcp_ports)
+
+
+def merge_with_setitem(target_host_ports: TargetHostPorts, other: TargetHostPorts):
+    # How results were merged before TargetHostPorts.update_from(): every port is re-inserted
+    for port, port_scan_data in other.tcp_ports.items():
+        current = target_host_ports.tcp_ports.get(port)
+        if current is not None and current.status == PortStatus.OPEN:
+            continue
+        target_host_ports.tcp_ports[port] = port_scan_data
+
+
+def time_merge(
+    merge: Callable[[TargetHostPorts, TargetHostPorts], None],
+    first_scan: TargetHostPorts,
+    second_scan: TargetHostPorts,
+) -> float:
+    times_sec = []
+    for _ in range(REPEAT):
+        target_host_ports = TargetHostPorts(tcp_ports=first_scan.tcp_ports.copy())
+
+        start = time.perf_counter()
+        merge(target_host_ports, second_scan)
+        times_sec.append(time.perf_counter() - start)
+
+    return min(times_sec)
+
+
+def main():
+    first_scan = scan(100, NetworkService.UNKNOWN)
+    second_scan = scan(1000, NetworkService.HTTP)
+
+    cases: Dict[str, Callable[[TargetHostPorts, TargetHostPorts], None]] = {
+        "__setitem__": merge_with_setitem,
+        "update_from()": TargetHostPorts.update_from,
+    }
+
+    for name, merge in cases.items():
+        best_sec = time_merge(merge, first_scan, second_scan)
+        ns_per_port = best_sec / NUM_PORTS * 1e9
+        print(f"{name:<24}{best_sec * 1e3:>10.1f} ms total{ns_per_port:>10.0f} ns/port")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Compares the cost of selecting 10,000 free TCP ports with BitmapTCPPortSelector
+
+Reading the ports in use from the OS on every selection, as a selector that enumerates the open
+sockets would, is compared to reading them at most once per refresh interval.
+
+Run with `python -m benchmarks.tcp_port_selector_selection` from the repository root.
+"""
+
+import timeit
+
+from agentpluginapi import BitmapTCPPortSelector
+
+NUM_SELECTIONS = 10_000
+REPEAT = 3
+
+
+def main():
+    def select_each(refresh_interval_sec: float):
+        tcp_port_selector = BitmapTCPPortSelector(refresh_interval_sec=refresh_interval_sec)
+        for _ in range(NUM_SELECTIONS):
+            tcp_port_selector.get_free_tcp_port(preferred_ports=[8080])
+
+    def select_batch():
+        tcp_port_selector = BitmapTCPPortSelector()
+        tcp_port_selector.get_free_tcp_ports(NUM_SELECTIONS, preferred_ports=[8080])
+
+    cases = {
+        "get_free_tcp_port() (read OS every call)": lambda: select_each(0),
+        "get_free_tcp_port() (cached bitmap)": lambda: select_each(1.0),
+        "get_free_tcp_ports()": select_batch,
+    }
+
+    for name, fn in cases.items():
+        best_sec = min(timeit.repeat(fn, number=1, repeat=REPEAT))
+        us_per_selection = best_sec / NUM_SELECTIONS * 1e6
+        print(f"{name:<44}{best_sec * 1e3:>10.1f} ms total{us_per_selection:>10.2f} µs/port")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import pytest
+
+from agentpluginapi import AGENT_BINARY_PLACEHOLDER, AgentBinaryWrapperTemplate
+
+AGENT_BINARY = b"\x7fELF agent binary"
+
+
+@pytest.mark.parametrize(
+    "template",
+    [
+        b"#!/bin/sh\nbase64 -d <<EOF\n" + AGENT_BINARY_PLACEHOLDER + b"\nEOF\n",
+        AGENT_BINARY_PLACEHOLDER + b" suffix",
+        b"prefix " + AGENT_BINARY_PLACEHOLDER,
+        AGENT_BINARY_PLACEHOLDER,
+        AGENT_BINARY_PLACEHOLDER + b" and " + AGENT_BINARY_PLACEHOLDER,
+    ],
+)
+def test_agent_binary_wrapper_template(template: bytes):
+    expected_payload = template.replace(AGENT_BINARY_PLACEHOLDER, AGENT_BINARY)
+
+    wrapper_template = AgentBinaryWrapperTemplate(template)
+
+    assert wrapper_template.render(AGENT_BINARY) == expected_payload
+    assert b"".join(wrapper_template.get_buffers(memoryview(AGENT_BINARY))) == expected_payload
+    assert wrapper_template.get_size(len(AGENT_BINARY)) == len(expected_payload)
+
+
+def test_agent_binary_wrapper_template__does_not_copy_agent_binary():
+    wrapper_template = AgentBinaryWrapperTemplate(b"prefix " + AGENT_BINARY_PLACEHOLDER)
+    agent_binary = bytearray(AGENT_BINARY)
+
+    buffers = wrapper_template.get_buffers(agent_binary)
+    agent_binary[0:4] = b"MZ\x90\x00"
+
+    assert buffers[1] == agent_binary
+
+
+@pytest.mark.parametrize("template", [b"", b"no placeholder", b"$(agent_binary)"])
+def test_agent_binary_wrapper_template__no_placeholder(template: bytes):
+    with pytest.raises(ValueError):
+        AgentBinaryWrapperTemplate(template)
@@ -0,0 +1,75 @@
+import pytest
+
+from agentpluginapi import DOWNLOAD_URL_PLACEHOLDER, OTP_PLACEHOLDER, AgentCommandTemplate
+
+DOWNLOAD_URL = "http://10.0.0.1:5000/abc"
+OTP = "otp-1234"
+
+
+@pytest.mark.parametrize(
+    "template",
+    [
+        f"wget -O /tmp/agent {DOWNLOAD_URL_PLACEHOLDER}; MONKEY_OTP={OTP_PLACEHOLDER} /tmp/agent",
+        f"{DOWNLOAD_URL_PLACEHOLDER}{OTP_PLACEHOLDER}",
+        f"{OTP_PLACEHOLDER} {DOWNLOAD_URL_PLACEHOLDER} {OTP_PLACEHOLDER}",
+        f"curl {DOWNLOAD_URL_PLACEHOLDER} && {DOWNLOAD_URL_PLACEHOLDER} {OTP_PLACEHOLDER}",
+    ],
+)
+def test_render(template: str):
+    expected_command = template.replace(DOWNLOAD_URL_PLACEHOLDER, DOWNLOAD_URL).replace(
+        OTP_PLACEHOLDER, OTP
+    )
+
+    command_template = AgentCommandTemplate(template)
+
+    assert command_template.includes_otp
+    assert command_template.render(DOWNLOAD_URL, OTP) == expected_command
+
+
+def test_render__without_otp():
+    command_template = AgentCommandTemplate(f"wget {DOWNLOAD_URL_PLACEHOLDER}")
+
+    assert not command_template.includes_otp
+    assert command_template.render(DOWNLOAD_URL) == f"wget {DOWNLOAD_URL}"
+
+
+def test_render__missing_otp():
+    command_template = AgentCommandTemplate(f"MONKEY_OTP={OTP_PLACEHOLDER} /tmp/agent")
+
+    with pytest.raises(ValueError):
+        command_template.render(DOWNLOAD_URL)
+
+
+def test_render__substituted_values_are_not_placeholders():
+    command_template = AgentCommandTemplate(f"{DOWNLOAD_URL_PLACEHOLDER} {OTP_PLACEHOLDER}")
+
+    command = command_template.render(OTP_PLACEHOLDER, "otp")
+
+    assert command == f"{OTP_PLACEHOLDER} otp"
+
+
+def test_equality():
+    assert AgentCommandTemplate(f"wget {DOWNLOAD_URL_PLACEHOLDER}") == AgentCommandTemplate(
+        f"wget {DOWNLOAD_URL_PLACEHOLDER}"
+    )
+
+
+@pytest.mark.parametrize("include_otp", [False, True])
+def test_from_built_command(include_otp: bool):
+    command = f"wget {DOWNLOAD_URL_PLACEHOLDER}; MONKEY_OTP={OTP_PLACEHOLDER} /tmp/agent"
+
+    command_template = AgentCommandTemplate.from_built_command(command, include_otp)
+
+    assert command_template == AgentCommandTemplate(command)
+
+
+@pytest.mark.parametrize(
+    "command, include_otp",
+    [
+        ("wget %24%28download_url%29", False),
+        (f"wget {DOWNLOAD_URL_PLACEHOLDER}; /tmp/agent", True),
+    ],
+)
+def test_from_built_command__missing_placeholder(command: str, include_otp: bool):
+    with pytest.raises(ValueError):
+        AgentCommandTemplate.from_built_command(command, include_otp)
@@ -0,0 +1,321 @@
+import asyncio
+import hashlib
+import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from ipaddress import IPv4Address
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from monkeytypes import Credentials, OperatingSystem, Password, Username
+
+from agentpluginapi import (
+    AgentBinaryDownloadRequest,
+    AgentBinaryWrapperTemplate,
+    AsyncAgentBinaryRepositoryAdapter,
+    AsyncAgentEventPublisherAdapter,
+    AsyncAgentOTPProviderAdapter,
+    AsyncHTTPAgentBinaryServerRegistrarAdapter,
+    AsyncPropagationCredentialsRepositoryAdapter,
+    IAgentBinaryRepository,
+    IAgentEventPublisher,
+    IAgentOTPProvider,
+    IAsyncAgentBinaryRepository,
+    IAsyncAgentEventPublisher,
+    IAsyncAgentOTPProvider,
+    IAsyncHTTPAgentBinaryServerRegistrar,
+    IAsyncPropagationCredentialsRepository,
+    IHTTPAgentBinaryServerRegistrar,
+    IPropagationCredentialsRepository,
+    RetrievalError,
+    SyncAgentBinaryRepositoryAdapter,
+    SyncAgentEventPublisherAdapter,
+    SyncAgentOTPProviderAdapter,
+    SyncHTTPAgentBinaryServerRegistrarAdapter,
+    SyncPropagationCredentialsRepositoryAdapter,
+)
+
+AGENT_BINARY = b"agent binary"
+OTP = "otp"
+CREDENTIALS = [
+    Credentials(identity=Username(username="user"), secret=Password(password="pass")),
+    Credentials(identity=Username(username="user2"), secret=None),
+]
+IP = IPv4Address("10.0.0.1")
+WRAPPER_TEMPLATE = AgentBinaryWrapperTemplate(b"#!/bin/sh\n$(agent_binary)b")
+
+
+@pytest.fixture
+def event_loop_in_thread():
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    yield loop
+
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def test_async_agent_binary_repository_adapter():
+    agent_binary_repository = MagicMock(spec=IAgentBinaryRepository)
+    agent_binary_repository.get_agent_binary.return_value = io.BytesIO(AGENT_BINARY)
+    adapter = AsyncAgentBinaryRepositoryAdapter(agent_binary_repository)
+
+    agent_binary = asyncio.run(adapter.get_agent_binary(OperatingSystem.LINUX))
+
+    assert agent_binary.getvalue() == AGENT_BINARY
+    agent_binary_repository.get_agent_binary.assert_called_once_with(OperatingSystem.LINUX)
+
+
+def test_async_agent_binary_repository_adapter__forwards_optional_methods():
+    agent_binary_repository = MagicMock(spec=IAgentBinaryRepository)
+    adapter = AsyncAgentBinaryRepositoryAdapter(agent_binary_repository)
+
+    async def use_repository():
+        await adapter.open_agent_binary(OperatingSystem.LINUX)
+        await adapter.get_agent_binary_view(OperatingSystem.LINUX)
+        await adapter.get_agent_binary_size(OperatingSystem.LINUX)
+        await adapter.get_agent_binary_sha256(OperatingSystem.LINUX)
+
+    asyncio.run(use_repository())
+
+    agent_binary_repository.open_agent_binary.assert_called_once_with(OperatingSystem.LINUX)
+    agent_binary_repository.get_agent_binary_view.assert_called_once_with(OperatingSystem.LINUX)
+    agent_binary_repository.get_agent_binary_size.assert_called_once_with(OperatingSystem.LINUX)
+    agent_binary_repository.get_agent_binary_sha256.assert_called_once_with(OperatingSystem.LINUX)
+
+
+class InMemoryAsyncAgentBinaryRepository(IAsyncAgentBinaryRepository):
+    async def get_agent_binary(self, operating_system: OperatingSystem) -> io.BytesIO:
+        return io.BytesIO(AGENT_BINARY)
+
+
+def test_async_agent_binary_repository__defaults():
+    agent_binary_repository = InMemoryAsyncAgentBinaryRepository()
+
+    async def use_repository():
+        with await agent_binary_repository.open_agent_binary(OperatingSystem.LINUX) as f:
+            assert f.read() == AGENT_BINARY
+        view = await agent_binary_repository.get_agent_binary_view(OperatingSystem.LINUX)
+        assert view == AGENT_BINARY
+        size = await agent_binary_repository.get_agent_binary_size(OperatingSystem.LINUX)
+        assert size == len(AGENT_BINARY)
+        sha256 = await agent_binary_repository.get_agent_binary_sha256(OperatingSystem.LINUX)
+        assert sha256 == hashlib.sha256(AGENT_BINARY).hexdigest()
+
+    asyncio.run(use_repository())
+
+
+def test_async_adapter__raises_errors():
+    agent_binary_repository = MagicMock(spec=IAgentBinaryRepository)
+    agent_binary_repository.get_agent_binary.side_effect = RetrievalError
+    adapter = AsyncAgentBinaryRepositoryAdapter(agent_binary_repository)
+
+    with pytest.raises(RetrievalError):
+        asyncio.run(adapter.get_agent_binary(OperatingSystem.LINUX))
+
+
+def test_async_adapter__bounded_by_executor():
+    max_workers = 2
+    lock = threading.Lock()
+    running = 0
+    max_running = 0
+
+    def get_otp() -> str:
+        nonlocal running, max_running
+        with lock:
+            running += 1
+            max_running = max(max_running, running)
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+        return OTP
+
+    otp_provider = MagicMock(spec=IAgentOTPProvider)
+    otp_provider.get_otp.side_effect = get_otp
+
+    async def get_otps():
+        return await asyncio.gather(*(adapter.get_otp() for _ in range(10)))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        adapter = AsyncAgentOTPProviderAdapter(otp_provider, executor)
+        otps = asyncio.run(get_otps())
+
+    assert otps == [OTP] * 10
+    assert max_running <= max_workers
+
+
+def test_async_http_agent_binary_server_registrar_adapter():
+    registrar = MagicMock(spec=IHTTPAgentBinaryServerRegistrar)
+    adapter = AsyncHTTPAgentBinaryServerRegistrarAdapter(registrar)
+    requests = [AgentBinaryDownloadRequest(OperatingSystem.LINUX, IP)]
+
+    async def use_registrar():
+        await adapter.reserve_download(OperatingSystem.WINDOWS, IP, None)
+        await adapter.reserve_compiled_download(OperatingSystem.LINUX, IP, WRAPPER_TEMPLATE)
+        await adapter.reserve_downloads(requests)
+        await adapter.clear_reservation("1")
+        await adapter.clear_reservations(iter(["2", "3"]))
+
+    asyncio.run(use_registrar())
+
+    registrar.reserve_download.assert_called_once_with(OperatingSystem.WINDOWS, IP, None)
+    registrar.reserve_compiled_download.assert_called_once_with(
+        OperatingSystem.LINUX, IP, WRAPPER_TEMPLATE
+    )
+    registrar.reserve_downloads.assert_called_once_with(requests)
+    registrar.clear_reservation.assert_called_once_with("1")
+    registrar.clear_reservations.assert_called_once_with(["2", "3"])
+
+
+def test_async_agent_event_publisher_adapter():
+    agent_event_publisher = MagicMock(spec=IAgentEventPublisher)
+    adapter = AsyncAgentEventPublisherAdapter(agent_event_publisher)
+    event = MagicMock()
+
+    asyncio.run(adapter.publish(event))
+
+    agent_event_publisher.publish.assert_called_once_with(event)
+
+
+def test_async_propagation_credentials_repository_adapter():
+    propagation_credentials_repository = MagicMock(spec=IPropagationCredentialsRepository)
+    propagation_credentials_repository.get_credentials.return_value = iter(CREDENTIALS)
+    adapter = AsyncPropagationCredentialsRepositoryAdapter(propagation_credentials_repository)
+
+    asyncio.run(adapter.add_credentials(iter(CREDENTIALS)))
+    credentials = asyncio.run(adapter.get_credentials())
+
+    propagation_credentials_repository.add_credentials.assert_called_once_with(CREDENTIALS)
+    assert credentials == CREDENTIALS
+
+
+def test_async_propagation_credentials_repository_adapter__subscribe():
+    propagation_credentials_repository = MagicMock(spec=IPropagationCredentialsRepository)
+    adapter = AsyncPropagationCredentialsRepositoryAdapter(propagation_credentials_repository)
+    callback = MagicMock()
+
+    asyncio.run(adapter.subscribe_to_new_credentials(callback))
+    asyncio.run(adapter.unsubscribe_from_new_credentials(callback))
+
+    propagation_credentials_repository.subscribe_to_new_credentials.assert_called_once_with(
+        callback
+    )
+    propagation_credentials_repository.unsubscribe_from_new_credentials.assert_called_once_with(
+        callback
+    )
+
+
+def test_sync_agent_binary_repository_adapter(event_loop_in_thread):
+    agent_binary_repository = AsyncMock(spec=IAsyncAgentBinaryRepository)
+    agent_binary_repository.get_agent_binary.return_value = io.BytesIO(AGENT_BINARY)
+    adapter = SyncAgentBinaryRepositoryAdapter(agent_binary_repository, event_loop_in_thread)
+
+    assert adapter.get_agent_binary(OperatingSystem.LINUX).getvalue() == AGENT_BINARY
+
+
+def test_sync_agent_binary_repository_adapter__forwards_optional_methods(event_loop_in_thread):
+    agent_binary_repository = AsyncMock(spec=IAsyncAgentBinaryRepository)
+    adapter = SyncAgentBinaryRepositoryAdapter(agent_binary_repository, event_loop_in_thread)
+
+    adapter.open_agent_binary(OperatingSystem.LINUX)
+    adapter.get_agent_binary_view(OperatingSystem.LINUX)
+    adapter.get_agent_binary_size(OperatingSystem.LINUX)
+    adapter.get_agent_binary_sha256(OperatingSystem.LINUX)
+
+    agent_binary_repository.open_agent_binary.assert_awaited_once_with(OperatingSystem.LINUX)
+    agent_binary_repository.get_agent_binary_view.assert_awaited_once_with(OperatingSystem.LINUX)
+    agent_binary_repository.get_agent_binary_size.assert_awaited_once_with(OperatingSystem.LINUX)
+    agent_binary_repository.get_agent_binary_sha256.assert_awaited_once_with(OperatingSystem.LINUX)
+
+
+def test_sync_adapter__raises_errors(event_loop_in_thread):
+    agent_binary_repository = AsyncMock(spec=IAsyncAgentBinaryRepository)
+    agent_binary_repository.get_agent_binary.side_effect = RetrievalError
+    adapter = SyncAgentBinaryRepositoryAdapter(agent_binary_repository, event_loop_in_thread)
+
+    with pytest.raises(RetrievalError):
+        adapter.get_agent_binary(OperatingSystem.LINUX)
+
+
+def test_sync_adapter__raises_on_event_loop_thread():
+    otp_provider = AsyncMock(spec=IAsyncAgentOTPProvider)
+
+    async def get_otp_on_event_loop():
+        adapter = SyncAgentOTPProviderAdapter(otp_provider, asyncio.get_running_loop())
+        adapter.get_otp()
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(get_otp_on_event_loop())
+
+
+def test_sync_agent_otp_provider_adapter(event_loop_in_thread):
+    otp_provider = AsyncMock(spec=IAsyncAgentOTPProvider)
+    otp_provider.get_otp.return_value = OTP
+    adapter = SyncAgentOTPProviderAdapter(otp_provider, event_loop_in_thread)
+
+    assert adapter.get_otp() == OTP
+
+
+def test_sync_http_agent_binary_server_registrar_adapter(event_loop_in_thread):
+    registrar = AsyncMock(spec=IAsyncHTTPAgentBinaryServerRegistrar)
+    adapter = SyncHTTPAgentBinaryServerRegistrarAdapter(registrar, event_loop_in_thread)
+    requests = [AgentBinaryDownloadRequest(OperatingSystem.LINUX, IP)]
+
+    adapter.reserve_download(OperatingSystem.WINDOWS, IP, None)
+    adapter.reserve_compiled_download(OperatingSystem.LINUX, IP, WRAPPER_TEMPLATE)
+    adapter.reserve_downloads(requests)
+    adapter.clear_reservation("1")
+    adapter.clear_reservations(iter(["2", "3"]))
+
+    registrar.reserve_download.assert_awaited_once_with(OperatingSystem.WINDOWS, IP, None)
+    registrar.reserve_compiled_download.assert_awaited_once_with(
+        OperatingSystem.LINUX, IP, WRAPPER_TEMPLATE
+    )
+    registrar.reserve_downloads.assert_awaited_once_with(requests)
+    registrar.clear_reservation.assert_awaited_once_with("1")
+    registrar.clear_reservations.assert_awaited_once_with(["2", "3"])
+
+
+def test_sync_agent_event_publisher_adapter(event_loop_in_thread):
+    agent_event_publisher = AsyncMock(spec=IAsyncAgentEventPublisher)
+    adapter = SyncAgentEventPublisherAdapter(agent_event_publisher, event_loop_in_thread)
+    event = MagicMock()
+
+    adapter.publish(event)
+
+    agent_event_publisher.publish.assert_awaited_once_with(event)
+
+
+def test_sync_propagation_credentials_repository_adapter(event_loop_in_thread):
+    propagation_credentials_repository = AsyncMock(spec=IAsyncPropagationCredentialsRepository)
+    propagation_credentials_repository.get_credentials.return_value = CREDENTIALS
+    adapter = SyncPropagationCredentialsRepositoryAdapter(
+        propagation_credentials_repository, event_loop_in_thread
+    )
+
+    adapter.add_credentials(iter(CREDENTIALS))
+
+    propagation_credentials_repository.add_credentials.assert_awaited_once_with(CREDENTIALS)
+    assert adapter.get_credentials() == CREDENTIALS
+
+
+def test_sync_propagation_credentials_repository_adapter__subscribe(event_loop_in_thread):
+    propagation_credentials_repository = AsyncMock(spec=IAsyncPropagationCredentialsRepository)
+    adapter = SyncPropagationCredentialsRepositoryAdapter(
+        propagation_credentials_repository, event_loop_in_thread
+    )
+    callback = MagicMock()
+
+    adapter.subscribe_to_new_credentials(callback)
+    adapter.unsubscribe_from_new_credentials(callback)
+
+    propagation_credentials_repository.subscribe_to_new_credentials.assert_awaited_once_with(
+        callback
+    )
+    propagation_credentials_repository.unsubscribe_from_new_credentials.assert_awaited_once_with(
+        callback
+    )
@@ -0,0 +1,213 @@
+import threading
+from typing import Final, Iterable, List, Sequence
+from unittest.mock import MagicMock
+from uuid import UUID
+
+import pytest
+from monkeyevents import AbstractAgentEvent, AgentShutdownEvent
+
+from agentpluginapi import BackgroundAgentEventPublisher, IAgentEventPublisher, OverflowPolicy
+
+AGENT_ID: Final = UUID("9614480d-471b-4568-86b5-cb922a34ed8a")
+EVENTS: Final[Sequence[AbstractAgentEvent]] = [
+    AgentShutdownEvent(source=AGENT_ID, timestamp=i) for i in range(1000)
+]
+
+
+class SlowAgentEventPublisher(IAgentEventPublisher):
+    def __init__(self):
+        self.events: List[AbstractAgentEvent] = []
+        self.release = threading.Event()
+        self.publishing = threading.Event()
+
+    def publish(self, event: AbstractAgentEvent):
+        self.publish_many([event])
+
+    def publish_many(self, events: Iterable[AbstractAgentEvent]):
+        self.publishing.set()
+        self.release.wait()
+        self.events.extend(events)
+
+
+@pytest.fixture
+def slow_publisher() -> SlowAgentEventPublisher:
+    return SlowAgentEventPublisher()
+
+
+def test_publish__does_not_wait_for_publisher(slow_publisher):
+    background_publisher = BackgroundAgentEventPublisher(slow_publisher)
+    background_publisher.start()
+
+    for event in EVENTS[:100]:
+        background_publisher.publish(event)
+    assert background_publisher.metrics.published_events == 0
+
+    slow_publisher.release.set()
+    background_publisher.stop()
+
+    assert slow_publisher.events == EVENTS[:100]
+
+
+def test_stop__delivers_queued_events(slow_publisher):
+    slow_publisher.release.set()
+    background_publisher = BackgroundAgentEventPublisher(slow_publisher, max_batch_size=7)
+    background_publisher.start()
+
+    background_publisher.publish_many(EVENTS[:1000])
+    background_publisher.stop()
+
+    assert slow_publisher.events == EVENTS[:1000]
+    metrics = background_publisher.metrics
+    assert metrics.queue_depth == 0
+    assert metrics.published_events == 1000
+    assert metrics.dropped_events == 0
+
+
+def test_stop__without_start(slow_publisher):
+    slow_publisher.release.set()
+    background_publisher = BackgroundAgentEventPublisher(slow_publisher)
+
+    background_publisher.publish_many(EVENTS[:10])
+    background_publisher.stop()
+
+    assert slow_publisher.events == EVENTS[:10]
+
+
+def test_publish__after_stop(slow_publisher):
+    background_publisher = BackgroundAgentEventPublisher(slow_publisher)
+    background_publisher.start()
+    background_publisher.stop()
+
+    with pytest.raises(RuntimeError):
+        background_publisher.publish(EVENTS[0])
+
+
+def test_start__twice(slow_publisher):
+    slow_publisher.release.set()
+    background_publisher = BackgroundAgentEventPublisher(slow_publisher)
+    background_publisher.start()
+
+    with pytest.raises(RuntimeError):
+        background_publisher.start()
+
+    background_publisher.stop()
+
+
+def test_publish__drops_when_full(slow_publisher):
+    background_publisher = BackgroundAgentEventPublisher(slow_publisher, max_queue_size=5)
+    background_publisher.start()
+    background_publisher.publish(EVENTS[0])
+    slow_publisher.publishing.wait()
+
+    for event in EVENTS[1:10]:
+        background_publisher.publish(event)
+    metrics = background_publisher.metrics
+    slow_publisher.release.set()
+    background_publisher.stop()
+
+    assert metrics.queue_depth == 5
+    assert metrics.dropped_events == 4
+    assert slow_publisher.events == EVENTS[:6]
+
+
+def test_publish__blocks_when_full(slow_publisher):
+    background_publisher = BackgroundAgentEventPublisher(
+        slow_publisher, max_queue_size=5, overflow_policy=OverflowPolicy.BLOCK
+    )
+    background_publisher.start()
+    background_publisher.publish(EVENTS[0])
+    slow_publisher.publishing.wait()
+
+    publishing_thread = threading.Thread(
+        target=background_publisher.publish_many, args=(EVENTS[1:10],)
+    )
+    publishing_thread.start()
+    publishing_thread.join(timeout=0.1)
+    assert publishing_thread.is_alive()
+
+    slow_publisher.release.set()
+    publishing_thread.join()
+    background_publisher.stop()
+
+    assert background_publisher.metrics.dropped_events == 0
+    assert slow_publisher.events == EVENTS[:10]
+
+
+def test_stop__rejects_blocked_events(slow_publisher):
+    background_publisher = BackgroundAgentEventPublisher(
+        slow_publisher, max_queue_size=5, overflow_policy=OverflowPolicy.BLOCK
+    )
+    background_publisher.start()
+    background_publisher.publish(EVENTS[0])
+    slow_publisher.publishing.wait()
+    errors: List[RuntimeError] = []
+
+    def publish_many():
+        try:
+            background_publisher.publish_many(EVENTS[1:10])
+        except RuntimeError as err:
+            errors.append(err)
+
+    publishing_thread = threading.Thread(target=publish_many)
+    publishing_thread.start()
+    publishing_thread.join(timeout=0.1)
+    stopping_thread = threading.Thread(target=background_publisher.stop)
+    stopping_thread.start()
+    stopping_thread.join(timeout=0.1)
+
+    slow_publisher.release.set()
+    stopping_thread.join()
+    publishing_thread.join()
+
+    assert len(errors) == 1
+    assert slow_publisher.events == EVENTS[:6]
+
+
+def test_publish__blocks_when_full_without_start(slow_publisher):
+    slow_publisher.release.set()
+    background_publisher = BackgroundAgentEventPublisher(
+        slow_publisher, max_queue_size=2, overflow_policy=OverflowPolicy.BLOCK
+    )
+
+    with pytest.raises(RuntimeError):
+        background_publisher.publish_many(EVENTS[:3])
+    background_publisher.stop()
+
+    assert slow_publisher.events == EVENTS[:2]
+
+
+def test_metrics__latency(slow_publisher):
+    slow_publisher.release.set()
+    background_publisher = BackgroundAgentEventPublisher(slow_publisher)
+    background_publisher.start()
+
+    background_publisher.publish_many(EVENTS[:10])
+    background_publisher.stop()
+
+    metrics = background_publisher.metrics
+    assert metrics.max_latency_sec > 0
+    assert 0 < metrics.mean_latency_sec <= metrics.max_latency_sec
+
+
+def test_publish__logs_errors(caplog):
+    publisher = MagicMock(spec=IAgentEventPublisher)
+    publisher.publish_many.side_effect = Exception("Boom")
+    background_publisher = BackgroundAgentEventPublisher(publisher)
+    background_publisher.start()
+
+    background_publisher.publish_many(EVENTS[:3])
+    background_publisher.stop()
+
+    assert "Boom" in caplog.text
+    assert background_publisher.metrics.failed_events == 3
+    assert background_publisher.metrics.published_events == 0
+
+
+@pytest.mark.parametrize("max_queue_size, max_batch_size", [(0, 10), (10, 0)])
+def test_init__invalid_sizes(max_queue_size, max_batch_size):
+    with pytest.raises(ValueError):
+        BackgroundAgentEventPublisher(
+            MagicMock(spec=IAgentEventPublisher),
+            max_queue_size=max_queue_size,
+            max_batch_size=max_batch_size,
+        )
@@ -0,0 +1,162 @@
+import threading
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from agentpluginapi import BitmapTCPPortSelector
+
+PROC_NET_TCP = """\
+  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode
+   0: 0100007F:1F90 00000000:0000 0A 00000000:00000000 00:00000000 00000000     0        0 1 1
+   1: 00000000:1F91 00000000:0000 0A 00000000:00000000 00:00000000 00000000     0        0 2 1
+"""
+PROC_NET_TCP6 = """\
+  sl  local_address                         remote_address                        st tx_queue
+   0: 00000000000000000000000000000000:1F92 00000000000000000000000000000000:0000 0A 00000000
+"""
+PORTS_IN_USE = [8080, 8081, 8082]
+
+
+@pytest.fixture
+def proc_net_tcp_paths(tmp_path: Path) -> List[Path]:
+    tcp = tmp_path / "tcp"
+    tcp6 = tmp_path / "tcp6"
+    tcp.write_text(PROC_NET_TCP)
+    tcp6.write_text(PROC_NET_TCP6)
+
+    return [tcp, tcp6]
+
+
+@pytest.fixture
+def tcp_port_selector(proc_net_tcp_paths: List[Path]) -> BitmapTCPPortSelector:
+    return BitmapTCPPortSelector(proc_net_tcp_paths=proc_net_tcp_paths)
+
+
+def test_get_free_tcp_port__skips_ports_in_use(tcp_port_selector):
+    port = tcp_port_selector.get_free_tcp_port(min_range=8080, max_range=8083)
+
+    assert port == 8083
+
+
+def test_get_free_tcp_port__preferred_ports(tcp_port_selector):
+    port = tcp_port_selector.get_free_tcp_port(preferred_ports=[8080, 8081, 9000, 9001])
+
+    assert port == 9000
+
+
+@pytest.mark.parametrize("invalid_port", [-1, 65536, 70000])
+def test_get_free_tcp_port__skips_invalid_preferred_ports(tcp_port_selector, invalid_port):
+    port = tcp_port_selector.get_free_tcp_port(
+        min_range=9000, max_range=9000, preferred_ports=[invalid_port]
+    )
+
+    assert port == 9000
+
+
+def test_get_free_tcp_port__preferred_ports_outside_range(tcp_port_selector):
+    port = tcp_port_selector.get_free_tcp_port(
+        min_range=9000, max_range=9001, preferred_ports=[1000]
+    )
+
+    assert port == 1000
+
+
+def test_get_free_tcp_port__skips_leased_ports(tcp_port_selector):
+    first_port = tcp_port_selector.get_free_tcp_port(min_range=9000, max_range=9001)
+    second_port = tcp_port_selector.get_free_tcp_port(min_range=9000, max_range=9001)
+    third_port = tcp_port_selector.get_free_tcp_port(min_range=9000, max_range=9001)
+
+    assert {first_port, second_port} == {9000, 9001}
+    assert third_port is None
+
+
+def test_get_free_tcp_port__lease_expires(tcp_port_selector):
+    tcp_port_selector.get_free_tcp_port(preferred_ports=[9000], lease_time_sec=0)
+
+    assert tcp_port_selector.get_free_tcp_port(preferred_ports=[9000]) == 9000
+
+
+def test_get_free_tcp_port__no_ports_available(tcp_port_selector):
+    assert tcp_port_selector.get_free_tcp_port(min_range=8080, max_range=8082) is None
+
+
+def test_get_free_tcp_port__os_ports_are_cached(tcp_port_selector, proc_net_tcp_paths):
+    tcp_port_selector.get_free_tcp_port(min_range=9000, max_range=9000)
+    proc_net_tcp_paths[0].write_text(PROC_NET_TCP.splitlines()[0])
+
+    assert tcp_port_selector.get_free_tcp_port(min_range=8080, max_range=8080) is None
+
+
+def test_get_free_tcp_port__os_ports_are_refreshed(proc_net_tcp_paths):
+    tcp_port_selector = BitmapTCPPortSelector(
+        refresh_interval_sec=0, proc_net_tcp_paths=proc_net_tcp_paths
+    )
+    tcp_port_selector.get_free_tcp_port(min_range=9000, max_range=9000)
+    proc_net_tcp_paths[0].write_text(PROC_NET_TCP.splitlines()[0])
+
+    assert tcp_port_selector.get_free_tcp_port(min_range=8080, max_range=8080) == 8080
+
+
+def test_get_free_tcp_port__missing_proc_files(tmp_path):
+    tcp_port_selector = BitmapTCPPortSelector(proc_net_tcp_paths=[tmp_path / "missing"])
+
+    assert tcp_port_selector.get_free_tcp_port(preferred_ports=[8080]) == 8080
+
+
+def test_get_free_tcp_ports(tcp_port_selector):
+    ports = tcp_port_selector.get_free_tcp_ports(
+        5, min_range=8080, max_range=8090, preferred_ports=[8080, 8090]
+    )
+
+    assert len(ports) == 5
+    assert len(set(ports)) == 5
+    assert ports[0] == 8090
+    assert not set(ports) & set(PORTS_IN_USE)
+    assert all(8080 <= port <= 8090 for port in ports)
+
+
+def test_get_free_tcp_ports__not_enough_ports(tcp_port_selector):
+    ports = tcp_port_selector.get_free_tcp_ports(5, min_range=8080, max_range=8084)
+
+    assert sorted(ports) == [8083, 8084]
+
+
+def test_release(tcp_port_selector):
+    ports = tcp_port_selector.get_free_tcp_ports(2, min_range=9000, max_range=9001)
+
+    tcp_port_selector.release(ports)
+
+    assert sorted(tcp_port_selector.get_free_tcp_ports(2, min_range=9000, max_range=9001)) == [
+        9000,
+        9001,
+    ]
+
+
+def test_release__then_lease_again(tcp_port_selector):
+    tcp_port_selector.get_free_tcp_port(preferred_ports=[9000], lease_time_sec=0)
+    tcp_port_selector.release([9000, 9001])
+    tcp_port_selector.get_free_tcp_port(preferred_ports=[9000], lease_time_sec=60)
+
+    # The expired first lease must not release the second one
+    assert tcp_port_selector.get_free_tcp_port(min_range=9000, max_range=9000) is None
+
+
+def test_get_free_tcp_port__concurrent_callers(tcp_port_selector):
+    num_threads = 8
+    ports_per_thread = 100
+    selected_ports: List[int] = []
+    lock = threading.Lock()
+
+    def select_ports():
+        ports = [tcp_port_selector.get_free_tcp_port() for _ in range(ports_per_thread)]
+        with lock:
+            selected_ports.extend(ports)
+
+    threads = [threading.Thread(target=select_ports) for _ in range(num_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(selected_ports)) == num_threads * ports_per_thread
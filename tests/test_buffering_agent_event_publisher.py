@@ -0,0 +1,187 @@
+import threading
+import time
+from typing import Final, Iterable, List, Sequence
+from unittest.mock import MagicMock
+from uuid import UUID
+
+import pytest
+from monkeyevents import AbstractAgentEvent, AgentShutdownEvent
+
+from agentpluginapi import BufferingAgentEventPublisher, IAgentEventPublisher, OverflowPolicy
+
+MAX_BATCH_SIZE = 3
+AGENT_ID: Final = UUID("9614480d-471b-4568-86b5-cb922a34ed8a")
+EVENTS: Final[Sequence[AbstractAgentEvent]] = [
+    AgentShutdownEvent(source=AGENT_ID, timestamp=i) for i in range(1000)
+]
+
+
+class RecordingAgentEventPublisher(IAgentEventPublisher):
+    def __init__(self):
+        self.batches: List[List[AbstractAgentEvent]] = []
+        self.release = threading.Event()
+        self.release.set()
+        self.publishing = threading.Event()
+
+    def publish(self, event: AbstractAgentEvent):
+        self.publish_many([event])
+
+    def publish_many(self, events: Iterable[AbstractAgentEvent]):
+        self.publishing.set()
+        self.release.wait()
+        self.batches.append(list(events))
+
+    @property
+    def events(self) -> List[AbstractAgentEvent]:
+        return [event for batch in self.batches for event in batch]
+
+
+@pytest.fixture
+def recording_publisher() -> RecordingAgentEventPublisher:
+    return RecordingAgentEventPublisher()
+
+
+def test_publish_many__default_publishes_each_event():
+    publisher = MagicMock(spec=IAgentEventPublisher)
+    events = [MagicMock() for _ in range(3)]
+
+    IAgentEventPublisher.publish_many(publisher, events)
+
+    assert [call.args[0] for call in publisher.publish.call_args_list] == events
+
+
+def test_publish__publishes_full_batches(recording_publisher):
+    buffering_publisher = BufferingAgentEventPublisher(
+        recording_publisher, max_batch_size=MAX_BATCH_SIZE
+    )
+
+    for event in EVENTS[:7]:
+        buffering_publisher.publish(event)
+
+    assert recording_publisher.batches == [EVENTS[0:3], EVENTS[3:6]]
+
+
+def test_publish_many__publishes_full_batches(recording_publisher):
+    buffering_publisher = BufferingAgentEventPublisher(
+        recording_publisher, max_batch_size=MAX_BATCH_SIZE
+    )
+
+    buffering_publisher.publish_many(EVENTS[:8])
+
+    assert recording_publisher.batches == [EVENTS[0:3], EVENTS[3:6]]
+
+
+def test_flush__publishes_partial_batch(recording_publisher):
+    buffering_publisher = BufferingAgentEventPublisher(
+        recording_publisher, max_batch_size=MAX_BATCH_SIZE
+    )
+
+    buffering_publisher.publish_many(EVENTS[:4])
+    buffering_publisher.flush()
+
+    assert recording_publisher.batches == [EVENTS[0:3], EVENTS[3:4]]
+
+
+def test_flush__empty(recording_publisher):
+    buffering_publisher = BufferingAgentEventPublisher(recording_publisher)
+
+    buffering_publisher.flush()
+
+    assert recording_publisher.batches == []
+
+
+def test_start__publishes_after_delay(recording_publisher):
+    buffering_publisher = BufferingAgentEventPublisher(
+        recording_publisher, max_batch_size=MAX_BATCH_SIZE, max_batch_delay_sec=0.01
+    )
+    buffering_publisher.start()
+
+    buffering_publisher.publish(EVENTS[0])
+    deadline = time.monotonic() + 5
+    while not recording_publisher.events and time.monotonic() < deadline:
+        time.sleep(0.01)
+    buffering_publisher.stop()
+
+    assert recording_publisher.events == EVENTS[:1]
+
+
+def test_stop__publishes_queued_events(recording_publisher):
+    buffering_publisher = BufferingAgentEventPublisher(
+        recording_publisher, max_batch_size=MAX_BATCH_SIZE, max_batch_delay_sec=60
+    )
+    buffering_publisher.start()
+
+    buffering_publisher.publish_many(EVENTS[:5])
+    buffering_publisher.stop()
+
+    assert recording_publisher.events == EVENTS[:5]
+
+
+def test_publish__drop_policy(recording_publisher):
+    buffering_publisher = BufferingAgentEventPublisher(
+        recording_publisher,
+        max_batch_size=MAX_BATCH_SIZE,
+        max_queue_size=MAX_BATCH_SIZE,
+        overflow_policy=OverflowPolicy.DROP,
+    )
+    recording_publisher.release.clear()
+    publishing_thread = threading.Thread(
+        target=buffering_publisher.publish_many, args=(EVENTS[:3],)
+    )
+    publishing_thread.start()
+    recording_publisher.publishing.wait()
+
+    # The queue is drained, so these fill it back up and then overflow
+    buffering_publisher.publish_many(EVENTS[3:8])
+    recording_publisher.release.set()
+    publishing_thread.join()
+    buffering_publisher.flush()
+
+    assert buffering_publisher.dropped_events == 2
+    assert recording_publisher.events == EVENTS[:6]
+
+
+def test_publish__block_policy(recording_publisher):
+    buffering_publisher = BufferingAgentEventPublisher(
+        recording_publisher,
+        max_batch_size=MAX_BATCH_SIZE,
+        max_queue_size=MAX_BATCH_SIZE,
+        overflow_policy=OverflowPolicy.BLOCK,
+    )
+    recording_publisher.release.clear()
+    first_thread = threading.Thread(target=buffering_publisher.publish_many, args=(EVENTS[:3],))
+    first_thread.start()
+    recording_publisher.publishing.wait()
+
+    second_thread = threading.Thread(target=buffering_publisher.publish_many, args=(EVENTS[3:8],))
+    second_thread.start()
+    second_thread.join(timeout=0.1)
+    assert second_thread.is_alive()
+
+    recording_publisher.release.set()
+    first_thread.join()
+    second_thread.join()
+    buffering_publisher.flush()
+
+    assert buffering_publisher.dropped_events == 0
+    assert recording_publisher.events == EVENTS[:8]
+
+
+def test_publish__logs_errors(caplog):
+    publisher = MagicMock(spec=IAgentEventPublisher)
+    publisher.publish_many.side_effect = Exception("Boom")
+    buffering_publisher = BufferingAgentEventPublisher(publisher, max_batch_size=1)
+
+    buffering_publisher.publish(EVENTS[0])
+
+    assert "Boom" in caplog.text
+
+
+@pytest.mark.parametrize("max_batch_size, max_queue_size", [(0, 10), (10, 5)])
+def test_init__invalid_sizes(max_batch_size, max_queue_size):
+    with pytest.raises(ValueError):
+        BufferingAgentEventPublisher(
+            MagicMock(spec=IAgentEventPublisher),
+            max_batch_size=max_batch_size,
+            max_queue_size=max_queue_size,
+        )
@@ -0,0 +1,130 @@
+import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from monkeytypes import OperatingSystem
+
+from agentpluginapi import CachingAgentBinaryRepository, IAgentBinaryRepository, RetrievalError
+
+AGENT_BINARIES = {
+    OperatingSystem.LINUX: b"linux agent binary" * 1000,
+    OperatingSystem.WINDOWS: b"windows agent binary",
+}
+NUM_PARALLEL_CALLERS = 50
+
+
+def get_agent_binary(operating_system: OperatingSystem) -> io.BytesIO:
+    # Give the other callers a chance to pile up while the agent binary is being retrieved
+    time.sleep(0.05)
+    return io.BytesIO(AGENT_BINARIES[operating_system])
+
+
+@pytest.fixture
+def mock_agent_binary_repository() -> IAgentBinaryRepository:
+    mock_agent_binary_repository = MagicMock(spec=IAgentBinaryRepository)
+    mock_agent_binary_repository.get_agent_binary.side_effect = get_agent_binary
+
+    return mock_agent_binary_repository
+
+
+@pytest.fixture
+def caching_agent_binary_repository(mock_agent_binary_repository, tmp_path: Path):
+    caching_agent_binary_repository = CachingAgentBinaryRepository(
+        mock_agent_binary_repository, tmp_path
+    )
+    yield caching_agent_binary_repository
+    caching_agent_binary_repository.close()
+
+
+def test_get_agent_binary_view__single_fetch_for_parallel_callers(
+    caching_agent_binary_repository, mock_agent_binary_repository
+):
+    barrier = threading.Barrier(NUM_PARALLEL_CALLERS)
+
+    def get_agent_binary_bytes(_) -> bytes:
+        barrier.wait()
+        with caching_agent_binary_repository.get_agent_binary_view(OperatingSystem.LINUX) as view:
+            return bytes(view)
+
+    with ThreadPoolExecutor(max_workers=NUM_PARALLEL_CALLERS) as executor:
+        agent_binaries = list(executor.map(get_agent_binary_bytes, range(NUM_PARALLEL_CALLERS)))
+
+    assert mock_agent_binary_repository.get_agent_binary.call_count == 1
+    assert all(ab == AGENT_BINARIES[OperatingSystem.LINUX] for ab in agent_binaries)
+
+
+def test_get_agent_binary_view__read_only(caching_agent_binary_repository):
+    with caching_agent_binary_repository.get_agent_binary_view(OperatingSystem.LINUX) as view:
+        assert view.readonly
+        with pytest.raises(TypeError):
+            view[0] = 0
+
+
+@pytest.mark.parametrize("operating_system", AGENT_BINARIES.keys())
+def test_cached_agent_binary(
+    caching_agent_binary_repository, mock_agent_binary_repository, operating_system
+):
+    expected_agent_binary = AGENT_BINARIES[operating_system]
+
+    assert caching_agent_binary_repository.get_agent_binary(operating_system).getvalue() == (
+        expected_agent_binary
+    )
+    with caching_agent_binary_repository.open_agent_binary(operating_system) as agent_binary:
+        assert agent_binary.read() == expected_agent_binary
+    assert caching_agent_binary_repository.get_agent_binary_size(operating_system) == len(
+        expected_agent_binary
+    )
+    assert mock_agent_binary_repository.get_agent_binary.call_count == 1
+
+
+def test_agent_binary_stored_in_cache_directory(caching_agent_binary_repository, tmp_path: Path):
+    caching_agent_binary_repository.get_agent_binary_size(OperatingSystem.WINDOWS)
+
+    (cached_file,) = tmp_path.iterdir()
+    assert cached_file.read_bytes() == AGENT_BINARIES[OperatingSystem.WINDOWS]
+
+
+def test_empty_agent_binary(mock_agent_binary_repository, tmp_path: Path):
+    mock_agent_binary_repository.get_agent_binary.side_effect = lambda _: io.BytesIO()
+    caching_agent_binary_repository = CachingAgentBinaryRepository(
+        mock_agent_binary_repository, tmp_path
+    )
+
+    with caching_agent_binary_repository.get_agent_binary_view(OperatingSystem.LINUX) as view:
+        assert len(view) == 0
+
+
+def test_retrieval_error_not_cached(caching_agent_binary_repository, mock_agent_binary_repository):
+    mock_agent_binary_repository.get_agent_binary.side_effect = [
+        RetrievalError(),
+        io.BytesIO(AGENT_BINARIES[OperatingSystem.LINUX]),
+    ]
+
+    with pytest.raises(RetrievalError):
+        caching_agent_binary_repository.get_agent_binary(OperatingSystem.LINUX)
+
+    assert caching_agent_binary_repository.get_agent_binary(OperatingSystem.LINUX).getvalue() == (
+        AGENT_BINARIES[OperatingSystem.LINUX]
+    )
+
+
+def test_close__deletes_cached_agent_binaries(caching_agent_binary_repository, tmp_path: Path):
+    caching_agent_binary_repository.get_agent_binary_size(OperatingSystem.LINUX)
+    caching_agent_binary_repository.get_agent_binary_size(OperatingSystem.WINDOWS)
+
+    caching_agent_binary_repository.close()
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_cache_directory_missing(mock_agent_binary_repository, tmp_path: Path):
+    caching_agent_binary_repository = CachingAgentBinaryRepository(
+        mock_agent_binary_repository, tmp_path / "missing"
+    )
+
+    with pytest.raises(RetrievalError):
+        caching_agent_binary_repository.get_agent_binary(OperatingSystem.LINUX)
@@ -0,0 +1,92 @@
+import hashlib
+import io
+
+import pytest
+from monkeytypes import OperatingSystem
+
+from agentpluginapi import IAgentBinaryRepository
+
+AGENT_BINARIES = {
+    OperatingSystem.LINUX: b"linux agent binary" * 1000,
+    OperatingSystem.WINDOWS: b"windows agent binary",
+}
+
+
+class InMemoryAgentBinaryRepository(IAgentBinaryRepository):
+    def get_agent_binary(self, operating_system: OperatingSystem) -> io.BytesIO:
+        return io.BytesIO(AGENT_BINARIES[operating_system])
+
+
+class ReusingAgentBinaryRepository(IAgentBinaryRepository):
+    # Returns the same file-like object every time, as repositories that cache agent binaries may
+    def __init__(self):
+        self._agent_binaries = {
+            operating_system: io.BytesIO(agent_binary)
+            for operating_system, agent_binary in AGENT_BINARIES.items()
+        }
+
+    def get_agent_binary(self, operating_system: OperatingSystem) -> io.BytesIO:
+        return self._agent_binaries[operating_system]
+
+
+@pytest.fixture(params=[InMemoryAgentBinaryRepository, ReusingAgentBinaryRepository])
+def agent_binary_repository(request) -> IAgentBinaryRepository:
+    return request.param()
+
+
+@pytest.mark.parametrize("operating_system", AGENT_BINARIES.keys())
+def test_open_agent_binary(
+    agent_binary_repository: IAgentBinaryRepository, operating_system: OperatingSystem
+):
+    with agent_binary_repository.open_agent_binary(operating_system) as agent_binary:
+        assert agent_binary.read() == AGENT_BINARIES[operating_system]
+
+
+@pytest.mark.parametrize("operating_system", AGENT_BINARIES.keys())
+def test_get_agent_binary_size(
+    agent_binary_repository: IAgentBinaryRepository, operating_system: OperatingSystem
+):
+    size = agent_binary_repository.get_agent_binary_size(operating_system)
+
+    assert size == len(AGENT_BINARIES[operating_system])
+
+
+@pytest.mark.parametrize("operating_system", AGENT_BINARIES.keys())
+def test_get_agent_binary_sha256(
+    agent_binary_repository: IAgentBinaryRepository, operating_system: OperatingSystem
+):
+    sha256 = agent_binary_repository.get_agent_binary_sha256(operating_system)
+
+    assert sha256 == hashlib.sha256(AGENT_BINARIES[operating_system]).hexdigest()
+
+
+@pytest.mark.parametrize("operating_system", AGENT_BINARIES.keys())
+def test_get_agent_binary_view(
+    agent_binary_repository: IAgentBinaryRepository, operating_system: OperatingSystem
+):
+    with agent_binary_repository.get_agent_binary_view(operating_system) as view:
+        assert view.readonly
+        assert view == AGENT_BINARIES[operating_system]
+
+
+@pytest.mark.parametrize("operating_system", AGENT_BINARIES.keys())
+def test_default_methods_dont_close_or_move_agent_binary(operating_system: OperatingSystem):
+    agent_binary_repository = ReusingAgentBinaryRepository()
+    agent_binary = agent_binary_repository.get_agent_binary(operating_system)
+    agent_binary.seek(5)
+
+    agent_binary_repository.get_agent_binary_size(operating_system)
+    agent_binary_repository.get_agent_binary_sha256(operating_system)
+    agent_binary_repository.open_agent_binary(operating_system).close()
+
+    assert agent_binary.tell() == 5
+    assert agent_binary.read() == AGENT_BINARIES[operating_system][5:]
+
+
+def test_get_agent_binary_sha256__ignores_position():
+    agent_binary_repository = ReusingAgentBinaryRepository()
+    agent_binary_repository.get_agent_binary(OperatingSystem.LINUX).seek(0, io.SEEK_END)
+
+    sha256 = agent_binary_repository.get_agent_binary_sha256(OperatingSystem.LINUX)
+
+    assert sha256 == hashlib.sha256(AGENT_BINARIES[OperatingSystem.LINUX]).hexdigest()
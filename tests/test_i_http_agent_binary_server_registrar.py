@@ -0,0 +1,143 @@
+import threading
+from ipaddress import IPv4Address
+from typing import Dict, List, Optional
+from uuid import uuid4
+
+import pytest
+from monkeytypes import OperatingSystem
+
+from agentpluginapi import (
+    AgentBinaryDownloadRequest,
+    AgentBinaryDownloadTicket,
+    AgentBinaryWrapperTemplate,
+    IHTTPAgentBinaryServerRegistrar,
+    ReservationID,
+)
+
+TEMPLATE = b"#!/bin/sh\n$(agent_binary)b"
+
+
+class InMemoryHTTPAgentBinaryServerRegistrar(IHTTPAgentBinaryServerRegistrar):
+    def __init__(self):
+        self.reservations: Dict[ReservationID, AgentBinaryDownloadRequest] = {}
+
+    def reserve_download(
+        self,
+        operating_system: OperatingSystem,
+        requestor_ip: IPv4Address,
+        agent_binary_wrapper_template: Optional[bytes],
+    ) -> AgentBinaryDownloadTicket:
+        reservation_id = str(uuid4())
+        self.reservations[reservation_id] = AgentBinaryDownloadRequest(
+            operating_system, requestor_ip, agent_binary_wrapper_template
+        )
+
+        return AgentBinaryDownloadTicket(
+            reservation_id, f"http://127.0.0.1/{reservation_id}", threading.Event()
+        )
+
+    def clear_reservation(self, reservation_id: ReservationID):
+        del self.reservations[reservation_id]
+
+
+@pytest.fixture
+def registrar() -> InMemoryHTTPAgentBinaryServerRegistrar:
+    return InMemoryHTTPAgentBinaryServerRegistrar()
+
+
+@pytest.fixture
+def requests() -> List[AgentBinaryDownloadRequest]:
+    return [
+        AgentBinaryDownloadRequest(OperatingSystem.LINUX, IPv4Address(f"10.0.0.{i}"), TEMPLATE)
+        for i in range(1, 6)
+    ] + [AgentBinaryDownloadRequest(OperatingSystem.WINDOWS, IPv4Address("10.0.0.6"))]
+
+
+def test_reserve_downloads(
+    registrar: InMemoryHTTPAgentBinaryServerRegistrar,
+    requests: List[AgentBinaryDownloadRequest],
+):
+    tickets = registrar.reserve_downloads(requests)
+
+    assert len(tickets) == len(requests)
+    for ticket, request in zip(tickets, requests):
+        reservation = registrar.reservations[ticket.id]
+        assert reservation.operating_system == request.operating_system
+        assert reservation.requestor_ip == request.requestor_ip
+
+
+def test_reserve_downloads__passes_templates_unchanged(
+    registrar: InMemoryHTTPAgentBinaryServerRegistrar,
+    requests: List[AgentBinaryDownloadRequest],
+):
+    tickets = registrar.reserve_downloads(requests)
+
+    templates = [
+        registrar.reservations[ticket.id].agent_binary_wrapper_template for ticket in tickets
+    ]
+    assert templates == [request.agent_binary_wrapper_template for request in requests]
+    assert all(template is TEMPLATE for template in templates[:5])
+
+
+def test_reserve_downloads__compiled_template(
+    registrar: InMemoryHTTPAgentBinaryServerRegistrar,
+):
+    requests = [
+        AgentBinaryDownloadRequest(
+            OperatingSystem.LINUX, IPv4Address("10.0.0.1"), AgentBinaryWrapperTemplate(TEMPLATE)
+        )
+    ]
+
+    (ticket,) = registrar.reserve_downloads(requests)
+
+    assert registrar.reservations[ticket.id].agent_binary_wrapper_template == TEMPLATE
+
+
+def test_reserve_compiled_download__default_reserves_template_bytes(
+    registrar: InMemoryHTTPAgentBinaryServerRegistrar,
+):
+    ticket = registrar.reserve_compiled_download(
+        OperatingSystem.LINUX, IPv4Address("10.0.0.1"), AgentBinaryWrapperTemplate(TEMPLATE)
+    )
+
+    assert registrar.reservations[ticket.id].agent_binary_wrapper_template == TEMPLATE
+
+
+def test_reserve_downloads__template_without_placeholder(
+    registrar: InMemoryHTTPAgentBinaryServerRegistrar,
+):
+    template = b"#!/bin/sh\n"
+    requests = [
+        AgentBinaryDownloadRequest(OperatingSystem.LINUX, IPv4Address("10.0.0.1"), template)
+    ]
+
+    (ticket,) = registrar.reserve_downloads(requests)
+
+    assert registrar.reservations[ticket.id].agent_binary_wrapper_template == template
+
+
+def test_reserve_downloads__empty(registrar: InMemoryHTTPAgentBinaryServerRegistrar):
+    assert registrar.reserve_downloads([]) == []
+
+
+def test_clear_reservations(
+    registrar: InMemoryHTTPAgentBinaryServerRegistrar,
+    requests: List[AgentBinaryDownloadRequest],
+):
+    tickets = registrar.reserve_downloads(requests)
+
+    registrar.clear_reservations(ticket.id for ticket in tickets[:3])
+
+    assert set(registrar.reservations.keys()) == {ticket.id for ticket in tickets[3:]}
+
+
+def test_clear_reservations__unregistered(
+    registrar: InMemoryHTTPAgentBinaryServerRegistrar,
+    requests: List[AgentBinaryDownloadRequest],
+):
+    tickets = registrar.reserve_downloads(requests)
+
+    with pytest.raises(KeyError):
+        registrar.clear_reservations([str(uuid4())] + [ticket.id for ticket in tickets])
+
+    assert registrar.reservations == {}
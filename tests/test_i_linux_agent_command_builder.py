@@ -1,8 +1,16 @@
 from pathlib import PurePosixPath
+from urllib.parse import quote
 
 import pytest
 
-from agentpluginapi import DropperExecutionMode, LinuxRunOptions, LinuxSetPermissionsOptions
+from agentpluginapi import (
+    DropperExecutionMode,
+    ILinuxAgentCommandBuilder,
+    LinuxDownloadMethod,
+    LinuxDownloadOptions,
+    LinuxRunOptions,
+    LinuxSetPermissionsOptions,
+)
 
 
 @pytest.mark.parametrize(
@@ -34,3 +42,124 @@ def test_linux_otp_present_for_dropper_script():
             dropper_destination_path=None,
             include_otp=False,
         )
+
+
+class FakeLinuxAgentCommandBuilder(ILinuxAgentCommandBuilder):
+    def __init__(self):
+        self._command = ""
+
+    def build_download_command(self, download_options: LinuxDownloadOptions):
+        self._command += (
+            f"wget -O {download_options.agent_destination_path} {download_options.download_url}; "
+        )
+
+    def build_set_permissions_command(self, set_permissions_options: LinuxSetPermissionsOptions):
+        self._command += (
+            f"chmod {set_permissions_options.permissions:o} "
+            f"{set_permissions_options.agent_destination_path}; "
+        )
+
+    def build_run_command(self, run_options: LinuxRunOptions):
+        self._command += f"{run_options.agent_destination_path} m0nk3y"
+        if run_options.otp is not None:
+            self._command += f" --otp {run_options.otp}"
+
+    def get_command(self) -> str:
+        return self._command
+
+    def reset_command(self):
+        self._command = ""
+
+
+AGENT_DESTINATION_PATH = PurePosixPath("/tmp/agent")
+DOWNLOAD_OPTIONS = LinuxDownloadOptions(
+    agent_destination_path=AGENT_DESTINATION_PATH,
+    download_method=LinuxDownloadMethod.WGET,
+    download_url="http://unused",
+)
+SET_PERMISSIONS_OPTIONS = LinuxSetPermissionsOptions(agent_destination_path=AGENT_DESTINATION_PATH)
+
+
+def test_linux_run_options__otp_without_include_otp():
+    with pytest.raises(ValueError):
+        LinuxRunOptions(
+            agent_destination_path=AGENT_DESTINATION_PATH,
+            dropper_execution_mode=DropperExecutionMode.NONE,
+            include_otp=False,
+            otp="abc",
+        )
+
+
+@pytest.mark.parametrize("include_otp", [False, True])
+def test_build_command_template(include_otp: bool):
+    run_options = LinuxRunOptions(
+        agent_destination_path=AGENT_DESTINATION_PATH,
+        dropper_execution_mode=DropperExecutionMode.NONE,
+        include_otp=include_otp,
+    )
+    builder = FakeLinuxAgentCommandBuilder()
+
+    command_template = builder.build_command_template(
+        DOWNLOAD_OPTIONS, SET_PERMISSIONS_OPTIONS, run_options
+    )
+
+    download_url = "http://10.0.0.1:5000/abc"
+    otp = "0tp" if include_otp else None
+    builder.build_download_command(
+        DOWNLOAD_OPTIONS.model_copy(update={"download_url": download_url})
+    )
+    builder.build_set_permissions_command(SET_PERMISSIONS_OPTIONS)
+    builder.build_run_command(run_options.model_copy(update={"otp": otp}))
+    assert command_template.render(download_url, otp) == builder.get_command()
+    assert command_template.includes_otp == include_otp
+
+
+def test_build_command_template__default_run_options():
+    builder = FakeLinuxAgentCommandBuilder()
+
+    command_template = builder.build_command_template(
+        DOWNLOAD_OPTIONS,
+        SET_PERMISSIONS_OPTIONS,
+        LinuxRunOptions(
+            agent_destination_path=AGENT_DESTINATION_PATH,
+            dropper_execution_mode=DropperExecutionMode.SCRIPT,
+        ),
+    )
+
+    assert command_template.includes_otp
+
+
+def test_build_command_template__otp_ignored():
+    class OTPIgnoringLinuxAgentCommandBuilder(FakeLinuxAgentCommandBuilder):
+        def build_run_command(self, run_options: LinuxRunOptions):
+            super().build_run_command(run_options.model_copy(update={"otp": None}))
+
+    with pytest.raises(ValueError):
+        OTPIgnoringLinuxAgentCommandBuilder().build_command_template(
+            DOWNLOAD_OPTIONS,
+            SET_PERMISSIONS_OPTIONS,
+            LinuxRunOptions(
+                agent_destination_path=AGENT_DESTINATION_PATH,
+                dropper_execution_mode=DropperExecutionMode.NONE,
+            ),
+        )
+
+
+def test_build_command_template__download_url_quoted():
+    class QuotingLinuxAgentCommandBuilder(FakeLinuxAgentCommandBuilder):
+        def build_download_command(self, download_options: LinuxDownloadOptions):
+            quoted_url = quote(download_options.download_url, safe=":/")
+            super().build_download_command(
+                download_options.model_copy(update={"download_url": quoted_url})
+            )
+
+    with pytest.raises(ValueError):
+        QuotingLinuxAgentCommandBuilder().build_command_template(
+            DOWNLOAD_OPTIONS,
+            SET_PERMISSIONS_OPTIONS,
+            LinuxRunOptions(
+                agent_destination_path=AGENT_DESTINATION_PATH,
+                dropper_execution_mode=DropperExecutionMode.NONE,
+                include_otp=False,
+            ),
+        )
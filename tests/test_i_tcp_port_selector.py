@@ -0,0 +1,69 @@
+from typing import Optional, Sequence
+from unittest.mock import MagicMock
+
+from monkeytypes import NetworkPort
+
+from agentpluginapi import ITCPPortSelector
+
+
+class SequentialTCPPortSelector(ITCPPortSelector):
+    def __init__(self, available_ports: Sequence[NetworkPort]):
+        self._available_ports = list(available_ports)
+
+    def get_free_tcp_port(
+        self,
+        min_range: int = 1024,
+        max_range: int = 65535,
+        lease_time_sec: float = 30,
+        preferred_ports: Sequence[NetworkPort] = [],
+    ) -> Optional[NetworkPort]:
+        if not self._available_ports:
+            return None
+
+        return self._available_ports.pop(0)
+
+
+def test_get_free_tcp_ports():
+    tcp_port_selector = SequentialTCPPortSelector([5000, 5001, 5002, 5003])
+
+    assert tcp_port_selector.get_free_tcp_ports(3) == [5000, 5001, 5002]
+
+
+def test_get_free_tcp_ports__not_enough_ports():
+    tcp_port_selector = SequentialTCPPortSelector([5000, 5001])
+
+    assert tcp_port_selector.get_free_tcp_ports(3) == [5000, 5001]
+
+
+def test_get_free_tcp_ports__retries_duplicate_ports():
+    tcp_port_selector = SequentialTCPPortSelector([5000, 5000, 5001, 5001, 5002])
+
+    assert tcp_port_selector.get_free_tcp_ports(3) == [5000, 5001, 5002]
+
+
+def test_get_free_tcp_ports__gives_up_on_duplicate_ports():
+    tcp_port_selector = MagicMock(spec=ITCPPortSelector)
+    tcp_port_selector.get_free_tcp_port.return_value = 5000
+
+    assert ITCPPortSelector.get_free_tcp_ports(tcp_port_selector, 3) == [5000]
+    assert tcp_port_selector.get_free_tcp_port.call_count == 5
+
+
+def test_get_free_tcp_ports__passes_arguments():
+    tcp_port_selector = MagicMock(spec=ITCPPortSelector)
+    tcp_port_selector.get_free_tcp_port.side_effect = [7000, 7001]
+
+    ports = ITCPPortSelector.get_free_tcp_ports(
+        tcp_port_selector, 2, min_range=7000, max_range=8000, lease_time_sec=5, preferred_ports=[80]
+    )
+
+    assert ports == [7000, 7001]
+    tcp_port_selector.get_free_tcp_port.assert_called_with(7000, 8000, 5, [80])
+
+
+def test_release__default_does_nothing():
+    tcp_port_selector = SequentialTCPPortSelector([5000])
+
+    tcp_port_selector.release([5000])
+
+    assert tcp_port_selector.get_free_tcp_ports(2) == [5000]
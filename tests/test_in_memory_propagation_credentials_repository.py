@@ -0,0 +1,220 @@
+from typing import Iterable
+from unittest.mock import MagicMock
+
+import pytest
+from monkeytypes import Credentials, EmailAddress, LMHash, NTHash, Password, SSHKeypair, Username
+
+from agentpluginapi import (
+    InMemoryPropagationCredentialsRepository,
+    IPropagationCredentialsRepository,
+)
+
+NT_HASH = "C1C58F96CDF212B50837BC11A00BE47C"
+LM_HASH = "299BD128C1101FD6299BD128C1101FD6"
+
+USER_PASSWORD = Credentials(identity=Username(username="user"), secret=Password(password="pass"))
+USER_NT_HASH = Credentials(identity=Username(username="user"), secret=NTHash(nt_hash=NT_HASH))
+ADMIN_PASSWORD = Credentials(identity=Username(username="admin"), secret=Password(password="admin"))
+ADMIN_LM_HASH = Credentials(identity=Username(username="admin"), secret=LMHash(lm_hash=LM_HASH))
+EMAIL_PASSWORD = Credentials(
+    identity=EmailAddress(email_address="user@example.com"), secret=Password(password="pass")
+)
+USER_ONLY = Credentials(identity=Username(username="root"), secret=None)
+PASSWORD_ONLY = Credentials(identity=None, secret=Password(password="secret"))
+SSH_KEYPAIR = Credentials(
+    identity=Username(username="root"),
+    secret=SSHKeypair(public_key="public", private_key="private"),
+)
+
+NEW_CREDENTIALS = Credentials(identity=Username(username="new"), secret=Password(password="stolen"))
+
+ALL_CREDENTIALS = [
+    USER_PASSWORD,
+    USER_NT_HASH,
+    ADMIN_PASSWORD,
+    ADMIN_LM_HASH,
+    EMAIL_PASSWORD,
+    USER_ONLY,
+    PASSWORD_ONLY,
+    SSH_KEYPAIR,
+]
+
+
+@pytest.fixture
+def repository() -> InMemoryPropagationCredentialsRepository:
+    repository = InMemoryPropagationCredentialsRepository()
+    repository.add_credentials(ALL_CREDENTIALS)
+
+    return repository
+
+
+def test_get_credentials(repository):
+    assert repository.get_credentials() == ALL_CREDENTIALS
+
+
+def test_add_credentials__ignores_duplicates(repository):
+    repository.add_credentials(
+        [
+            Credentials(identity=Username(username="user"), secret=Password(password="pass")),
+            USER_PASSWORD,
+        ]
+    )
+
+    assert repository.get_credentials() == ALL_CREDENTIALS
+    assert repository.find_credentials(username="user") == [USER_PASSWORD, USER_NT_HASH]
+
+
+def test_add_credentials__from_generator():
+    repository = InMemoryPropagationCredentialsRepository()
+
+    repository.add_credentials(c for c in [USER_PASSWORD, USER_PASSWORD])
+
+    assert repository.get_credentials() == [USER_PASSWORD]
+
+
+@pytest.mark.parametrize(
+    "criteria, expected_credentials",
+    [
+        ({}, ALL_CREDENTIALS),
+        (
+            {"identity_type": Username},
+            [USER_PASSWORD, USER_NT_HASH, ADMIN_PASSWORD, ADMIN_LM_HASH, USER_ONLY, SSH_KEYPAIR],
+        ),
+        ({"identity_type": EmailAddress}, [EMAIL_PASSWORD]),
+        (
+            {"secret_type": Password},
+            [USER_PASSWORD, ADMIN_PASSWORD, EMAIL_PASSWORD, PASSWORD_ONLY],
+        ),
+        ({"secret_type": SSHKeypair}, [SSH_KEYPAIR]),
+        (
+            {"identity_type": Username, "secret_type": Password},
+            [USER_PASSWORD, ADMIN_PASSWORD],
+        ),
+        ({"username": "admin"}, [ADMIN_PASSWORD, ADMIN_LM_HASH]),
+        ({"username": "admin", "secret_type": LMHash}, [ADMIN_LM_HASH]),
+        ({"username": "nobody"}, []),
+        ({"username": "user", "identity_type": EmailAddress}, []),
+    ],
+)
+def test_find_credentials(repository, criteria, expected_credentials):
+    assert repository.find_credentials(**criteria) == expected_credentials
+    # The default implementation must agree with the indexed one
+    assert (
+        IPropagationCredentialsRepository.find_credentials(repository, **criteria)
+        == expected_credentials
+    )
+
+
+def test_find_credentials__default_filters_get_credentials():
+    repository = MagicMock(spec=IPropagationCredentialsRepository)
+    repository.get_credentials.return_value = iter(ALL_CREDENTIALS)
+
+    credentials = IPropagationCredentialsRepository.find_credentials(repository, secret_type=NTHash)
+
+    assert credentials == [USER_NT_HASH]
+
+
+def test_get_credentials_since(repository):
+    generation, credentials = repository.get_credentials_since(0)
+    assert credentials == ALL_CREDENTIALS
+
+    repository.add_credentials([USER_PASSWORD, NEW_CREDENTIALS])
+    new_generation, new_credentials = repository.get_credentials_since(generation)
+
+    assert new_generation == generation + 1
+    assert new_credentials == [NEW_CREDENTIALS]
+    assert repository.get_credentials_since(new_generation).credentials == []
+
+
+@pytest.mark.parametrize("generation", [-1, len(ALL_CREDENTIALS) + 1])
+def test_get_credentials_since__invalid_generation(repository, generation):
+    with pytest.raises(ValueError):
+        repository.get_credentials_since(generation)
+
+
+def test_get_credentials_since__default_returns_all_credentials():
+    # Repositories may keep their credentials in a set, so the default can't tell which are new
+    repository = MagicMock(spec=IPropagationCredentialsRepository)
+    repository.get_credentials.return_value = set(ALL_CREDENTIALS)
+    generation, _ = IPropagationCredentialsRepository.get_credentials_since(repository, 0)
+    repository.get_credentials.return_value = set(ALL_CREDENTIALS + [NEW_CREDENTIALS])
+
+    generation, credentials = IPropagationCredentialsRepository.get_credentials_since(
+        repository, generation
+    )
+
+    assert generation == 0
+    assert set(credentials) == set(ALL_CREDENTIALS + [NEW_CREDENTIALS])
+
+
+def test_get_credentials_since__default_invalid_generation():
+    repository = MagicMock(spec=IPropagationCredentialsRepository)
+    repository.get_credentials.return_value = ALL_CREDENTIALS
+
+    with pytest.raises(ValueError):
+        IPropagationCredentialsRepository.get_credentials_since(repository, 1)
+
+
+def test_subscribe_to_new_credentials(repository):
+    callback = MagicMock()
+    repository.subscribe_to_new_credentials(callback)
+
+    repository.add_credentials([USER_PASSWORD])
+    repository.add_credentials([USER_PASSWORD, NEW_CREDENTIALS])
+
+    callback.assert_called_once_with([NEW_CREDENTIALS])
+
+
+def test_unsubscribe_from_new_credentials(repository):
+    callback = MagicMock()
+    repository.subscribe_to_new_credentials(callback)
+    repository.unsubscribe_from_new_credentials(callback)
+
+    repository.add_credentials([NEW_CREDENTIALS])
+
+    callback.assert_not_called()
+
+
+def test_subscribe_to_new_credentials__callback_can_use_repository(repository):
+    received = []
+    repository.subscribe_to_new_credentials(
+        lambda _: received.append(repository.get_credentials_since(0).generation)
+    )
+
+    repository.add_credentials([NEW_CREDENTIALS])
+
+    assert received == [len(ALL_CREDENTIALS) + 1]
+
+
+def test_subscribe_to_new_credentials__callback_errors_are_logged(repository, caplog):
+    failing_callback = MagicMock(side_effect=Exception("Boom"))
+    callback = MagicMock()
+    repository.subscribe_to_new_credentials(failing_callback)
+    repository.subscribe_to_new_credentials(callback)
+
+    repository.add_credentials([NEW_CREDENTIALS])
+
+    assert "Boom" in caplog.text
+    callback.assert_called_once_with([NEW_CREDENTIALS])
+
+
+class MinimalPropagationCredentialsRepository(IPropagationCredentialsRepository):
+    def add_credentials(self, credentials_to_add: Iterable[Credentials]):
+        pass
+
+    def get_credentials(self) -> Iterable[Credentials]:
+        return []
+
+
+def test_subscribe_to_new_credentials__optional():
+    repository = MinimalPropagationCredentialsRepository()
+
+    with pytest.raises(NotImplementedError):
+        repository.subscribe_to_new_credentials(MagicMock())
+
+
+def test_unsubscribe_from_new_credentials__default_not_registered():
+    repository = MinimalPropagationCredentialsRepository()
+
+    with pytest.raises(ValueError):
+        repository.unsubscribe_from_new_credentials(MagicMock())
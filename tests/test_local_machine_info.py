@@ -1,7 +1,10 @@
+import copy
+import pickle
 from ipaddress import IPv4Address, IPv4Interface
 from pathlib import Path
 from types import MappingProxyType
 from typing import Final
+from unittest.mock import MagicMock
 
 import pytest
 from monkeytypes import OperatingSystem
@@ -48,6 +51,12 @@ EXCLUDED_IPS: Final = (
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_interface_to_target_cache():
+    # Many tests share LOCAL_MACHINE_INFO_OBJECT, but patch how interfaces are found
+    LocalMachineInfo.invalidate_route_table_cache()
+
+
 def test_local_machine_info__serialization():
     serialized_lmi = LOCAL_MACHINE_INFO_OBJECT.to_json_dict()
     serialized_lmi["network_interfaces"].sort()
@@ -77,6 +86,32 @@ def test_target_reachable(ip):
     assert LOCAL_MACHINE_INFO_OBJECT.get_interface_to_target(ip) == INCLUDED_IPS[ip]
 
 
+@pytest.mark.parametrize(
+    "ip, expected_interface",
+    [
+        (IPv4Address("10.1.2.3"), IPv4Interface("10.0.0.1/8")),
+        (IPv4Address("10.2.2.3"), IPv4Interface("10.2.0.1/16")),
+        (IPv4Address("10.2.3.3"), IPv4Interface("10.2.3.1/24")),
+    ],
+)
+def test_target_reachable__most_specific_interface(
+    ip: IPv4Address, expected_interface: IPv4Interface
+):
+    lmi = LocalMachineInfo(
+        operating_system=OperatingSystem.LINUX,
+        temporary_directory=Path("temp"),
+        network_interfaces=frozenset(
+            [
+                IPv4Interface("10.2.0.1/16"),
+                IPv4Interface("10.0.0.1/8"),
+                IPv4Interface("10.2.3.1/24"),
+            ]
+        ),
+    )
+
+    assert lmi.get_interface_to_target(ip) == expected_interface
+
+
 @pytest.mark.parametrize("ip", EXCLUDED_IPS)
 def test_target_unreachable(ip, monkeypatch):
     monkeypatch.setattr(
@@ -93,3 +128,187 @@ def test_empirical_fallback(monkeypatch, ip):
         lambda *args, **kwargs: INTERFACES[2].ip,
     )
     assert LOCAL_MACHINE_INFO_OBJECT.get_interface_to_target(ip) == INTERFACES[2]
+
+
+ROUTES: Final = [
+    (0, 0, "10.0.0.1", b"eth0", "10.0.0.5"),
+    (0x0A000000, 0xFFFF0000, "0.0.0.0", b"eth0", "10.0.0.5"),
+    (0x0A000500, 0xFFFFFF00, "0.0.0.0", b"tun0", "10.8.0.2"),
+    (0x7F000000, 0xFF000000, "0.0.0.0", b"lo", "127.0.0.1"),
+]
+
+
+@pytest.fixture
+def mock_get_routes(monkeypatch):
+    mock_get_routes = MagicMock(return_value=ROUTES)
+    monkeypatch.setattr("agentpluginapi.LocalMachineInfo.get_routes", mock_get_routes)
+    monkeypatch.setattr("agentpluginapi.local_machine_info.sys.platform", "linux")
+    LocalMachineInfo.invalidate_route_table_cache()
+
+    yield mock_get_routes
+
+    LocalMachineInfo.invalidate_route_table_cache()
+
+
+@pytest.mark.parametrize(
+    "ip, expected_interface_ip",
+    [
+        (IPv4Address("8.8.8.8"), IPv4Address("10.0.0.5")),
+        (IPv4Address("10.0.3.4"), IPv4Address("10.0.0.5")),
+        (IPv4Address("10.0.5.4"), IPv4Address("10.8.0.2")),
+        (IPv4Address("10.8.0.2"), IPv4Address("10.8.0.2")),
+        (IPv4Address("127.0.0.2"), IPv4Address("127.0.0.1")),
+    ],
+)
+def test_empirical_get_interface_to_target(
+    mock_get_routes, ip: IPv4Address, expected_interface_ip: IPv4Address
+):
+    assert LOCAL_MACHINE_INFO_OBJECT._empirical_get_interface_to_target(ip) == expected_interface_ip
+
+
+def test_empirical_get_interface_to_target__routes_cached(mock_get_routes):
+    for ip in EXCLUDED_IPS:
+        LOCAL_MACHINE_INFO_OBJECT._empirical_get_interface_to_target(ip)
+
+    assert mock_get_routes.call_count == 1
+
+
+def test_empirical_get_interface_to_target__invalidate_route_table_cache(mock_get_routes):
+    LOCAL_MACHINE_INFO_OBJECT._empirical_get_interface_to_target(EXCLUDED_IPS[0])
+    LocalMachineInfo.invalidate_route_table_cache()
+    LOCAL_MACHINE_INFO_OBJECT._empirical_get_interface_to_target(EXCLUDED_IPS[0])
+
+    assert mock_get_routes.call_count == 2
+
+
+def test_get_interfaces_to_targets(mock_get_routes):
+    lmi = LocalMachineInfo(
+        operating_system=OperatingSystem.LINUX,
+        temporary_directory=Path("temp"),
+        network_interfaces=frozenset(
+            [*INTERFACES[:2], IPv4Interface("10.0.0.5/32"), IPv4Interface("10.8.0.2/32")]
+        ),
+    )
+    targets = [*INCLUDED_IPS, *EXCLUDED_IPS, IPv4Address("10.0.5.4"), IPv4Address("8.8.8.8")]
+
+    interfaces_to_targets = lmi.get_interfaces_to_targets(targets)
+
+    assert interfaces_to_targets == {t: lmi.get_interface_to_target(t) for t in targets}
+    assert interfaces_to_targets[IPv4Address("192.168.1.10")] == INTERFACES[0]
+    assert interfaces_to_targets[IPv4Address("10.0.5.4")] == IPv4Interface("10.8.0.2/32")
+    assert interfaces_to_targets[IPv4Address("8.8.8.8")] == IPv4Interface("10.0.0.5/32")
+
+
+def test_get_interfaces_to_targets__no_interface(monkeypatch):
+    monkeypatch.setattr(
+        "agentpluginapi.LocalMachineInfo._empirical_get_interfaces_to_targets",
+        lambda *args, **kwargs: {},
+    )
+
+    interfaces_to_targets = LOCAL_MACHINE_INFO_OBJECT.get_interfaces_to_targets(EXCLUDED_IPS)
+
+    assert interfaces_to_targets == {ip: None for ip in EXCLUDED_IPS}
+
+
+def test_get_interfaces_to_targets__empty():
+    assert LOCAL_MACHINE_INFO_OBJECT.get_interfaces_to_targets([]) == {}
+
+
+def test_get_interface_to_target__cached(monkeypatch):
+    mock_empirical_get_interface_to_target = MagicMock(return_value=INTERFACES[2].ip)
+    monkeypatch.setattr(
+        "agentpluginapi.LocalMachineInfo._empirical_get_interface_to_target",
+        mock_empirical_get_interface_to_target,
+    )
+    lmi = LocalMachineInfo(**LOCAL_MACHINE_INFO_DICT)
+
+    for _ in range(3):
+        assert lmi.get_interface_to_target(EXCLUDED_IPS[0]) == INTERFACES[2]
+    assert lmi.get_interface_to_target(EXCLUDED_IPS[1]) == INTERFACES[2]
+
+    assert mock_empirical_get_interface_to_target.call_count == 2
+    cache_info = lmi.interface_to_target_cache_info
+    assert (cache_info.hits, cache_info.misses, cache_info.currsize) == (2, 2, 2)
+
+
+def test_get_interface_to_target__cache_cleared_on_route_table_invalidation(monkeypatch):
+    mock_empirical_get_interface_to_target = MagicMock(return_value=INTERFACES[2].ip)
+    monkeypatch.setattr(
+        "agentpluginapi.LocalMachineInfo._empirical_get_interface_to_target",
+        mock_empirical_get_interface_to_target,
+    )
+    lmi = LocalMachineInfo(**LOCAL_MACHINE_INFO_DICT)
+
+    lmi.get_interface_to_target(EXCLUDED_IPS[0])
+    LocalMachineInfo.invalidate_route_table_cache()
+    lmi.get_interface_to_target(EXCLUDED_IPS[0])
+
+    assert mock_empirical_get_interface_to_target.call_count == 2
+    assert lmi.interface_to_target_cache_info.currsize == 1
+
+
+def test_get_interface_to_target__cache_bounded(monkeypatch):
+    monkeypatch.setattr("agentpluginapi.local_machine_info.INTERFACE_TO_TARGET_CACHE_SIZE", 2)
+    lmi = LocalMachineInfo(**LOCAL_MACHINE_INFO_DICT)
+
+    for ip in INCLUDED_IPS:
+        lmi.get_interface_to_target(ip)
+
+    assert lmi.interface_to_target_cache_info.currsize == 2
+
+
+def test_local_machine_info__copies_do_not_share_cache():
+    LOCAL_MACHINE_INFO_OBJECT.get_interface_to_target(next(iter(INCLUDED_IPS)))
+
+    lmi_copy = pickle.loads(pickle.dumps(LOCAL_MACHINE_INFO_OBJECT))
+
+    assert lmi_copy == LOCAL_MACHINE_INFO_OBJECT
+    assert lmi_copy.interface_to_target_cache_info.currsize == 0
+
+
+@pytest.mark.parametrize(
+    "copy_fn",
+    [
+        lambda lmi, update: lmi.model_copy(update=update),
+        lambda lmi, update: lmi.model_copy(update=update, deep=True),
+    ],
+)
+def test_local_machine_info__copy_with_different_interfaces(copy_fn):
+    lmi = LocalMachineInfo(**LOCAL_MACHINE_INFO_DICT)
+    target = IPv4Address("10.0.0.7")
+    lmi.get_interfaces_to_targets([target])
+    new_interface = IPv4Interface("10.0.0.5/24")
+
+    lmi_copy = copy_fn(lmi, {"network_interfaces": frozenset({new_interface})})
+
+    assert lmi_copy.get_interfaces_to_targets([target]) == {target: new_interface}
+    assert lmi.get_interfaces_to_targets([target]) == {target: INTERFACES[2]}
+
+
+@pytest.mark.parametrize("deep", [False, True])
+def test_get_interface_to_target__copy_with_different_interfaces(deep):
+    lmi = LocalMachineInfo(**LOCAL_MACHINE_INFO_DICT)
+    target = IPv4Address("10.0.0.7")
+    lmi.get_interface_to_target(target)
+    new_interface = IPv4Interface("10.0.0.5/24")
+
+    lmi_copy = lmi.model_copy(update={"network_interfaces": frozenset({new_interface})}, deep=deep)
+
+    assert lmi_copy.interface_to_target_cache_info.currsize == 0
+    assert lmi_copy.get_interface_to_target(target) == new_interface
+    assert lmi.get_interface_to_target(target) == INTERFACES[2]
+    assert lmi.interface_to_target_cache_info.hits == 1
+
+
+@pytest.mark.parametrize("copy_fn", [copy.copy, copy.deepcopy, LocalMachineInfo.model_copy])
+def test_local_machine_info__copy(copy_fn):
+    lmi = LocalMachineInfo(**LOCAL_MACHINE_INFO_DICT)
+    lmi.get_interfaces_to_targets(INCLUDED_IPS)
+
+    lmi.get_interface_to_target(next(iter(INCLUDED_IPS)))
+
+    lmi_copy = copy_fn(lmi)
+
+    assert lmi_copy == lmi
+    assert lmi_copy.interface_to_target_cache_info.currsize == 0
+    assert lmi_copy.get_interfaces_to_targets(INCLUDED_IPS) == INCLUDED_IPS
@@ -0,0 +1,158 @@
+import itertools
+import threading
+import time
+from typing import Callable, List
+from unittest.mock import MagicMock
+
+import pytest
+
+from agentpluginapi import IAgentOTPProvider, PrefetchingAgentOTPProvider
+
+POOL_SIZE = 4
+
+
+class CountingAgentOTPProvider(IAgentOTPProvider):
+    def __init__(self):
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self.get_otps_calls: List[int] = []
+
+    def get_otp(self) -> str:
+        with self._lock:
+            return f"otp-{next(self._counter)}"
+
+    def get_otps(self, count: int) -> List[str]:
+        self.get_otps_calls.append(count)
+        return super().get_otps(count)
+
+
+def wait_for(condition: Callable[[], bool]):
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline, "Timed out"
+        time.sleep(0.001)
+
+
+@pytest.fixture
+def otp_provider() -> CountingAgentOTPProvider:
+    return CountingAgentOTPProvider()
+
+
+@pytest.fixture
+def prefetching_otp_provider(otp_provider):
+    prefetching_otp_provider = PrefetchingAgentOTPProvider(otp_provider, pool_size=POOL_SIZE)
+    yield prefetching_otp_provider
+    prefetching_otp_provider.stop()
+
+
+def test_get_otps__default_calls_get_otp():
+    otp_provider = MagicMock(spec=IAgentOTPProvider)
+    otp_provider.get_otp.side_effect = ["a", "b", "c"]
+
+    assert IAgentOTPProvider.get_otps(otp_provider, 3) == ["a", "b", "c"]
+
+
+def test_get_otp__not_started(otp_provider, prefetching_otp_provider):
+    assert prefetching_otp_provider.get_otp() == "otp-0"
+    assert otp_provider.get_otps_calls == []
+
+
+def test_get_otp__from_pool(otp_provider, prefetching_otp_provider):
+    prefetching_otp_provider.start()
+    wait_for(lambda: otp_provider.get_otps_calls == [POOL_SIZE])
+    prefetching_otp_provider.stop()
+
+    otps = [prefetching_otp_provider.get_otp() for _ in range(POOL_SIZE)]
+
+    assert otps == [f"otp-{i}" for i in range(POOL_SIZE)]
+
+
+def test_get_otps__from_pool_and_provider(otp_provider, prefetching_otp_provider):
+    prefetching_otp_provider.start()
+    wait_for(lambda: otp_provider.get_otps_calls == [POOL_SIZE])
+    prefetching_otp_provider.stop()
+
+    otps = prefetching_otp_provider.get_otps(POOL_SIZE + 2)
+
+    assert otps == [f"otp-{i}" for i in range(POOL_SIZE + 2)]
+    assert otp_provider.get_otps_calls == [POOL_SIZE, 2]
+
+
+def test_get_otp__refills_pool(otp_provider, prefetching_otp_provider):
+    prefetching_otp_provider.start()
+    wait_for(lambda: otp_provider.get_otps_calls == [POOL_SIZE])
+
+    prefetching_otp_provider.get_otps(POOL_SIZE - 1)
+
+    wait_for(lambda: otp_provider.get_otps_calls == [POOL_SIZE, POOL_SIZE - 1])
+
+
+def test_get_otp__discards_expired_otps(otp_provider):
+    prefetching_otp_provider = PrefetchingAgentOTPProvider(
+        otp_provider, pool_size=POOL_SIZE, max_otp_age_sec=0.01
+    )
+    prefetching_otp_provider.start()
+    wait_for(lambda: len(otp_provider.get_otps_calls) >= 1)
+    prefetching_otp_provider.stop()
+
+    time.sleep(0.02)
+    otp = prefetching_otp_provider.get_otp()
+
+    # All of the prefetched OTPs expired, so a new one is retrieved
+    assert otp == f"otp-{sum(otp_provider.get_otps_calls)}"
+
+
+def test_refill__logs_errors(caplog):
+    otp_provider = MagicMock(spec=IAgentOTPProvider)
+    otp_provider.get_otps.side_effect = RuntimeError("Boom")
+    prefetching_otp_provider = PrefetchingAgentOTPProvider(otp_provider, pool_size=POOL_SIZE)
+
+    prefetching_otp_provider.start()
+    wait_for(lambda: otp_provider.get_otps.called)
+    prefetching_otp_provider.stop()
+
+    assert "Boom" in caplog.text
+
+
+@pytest.mark.parametrize("pool_size, max_otp_age_sec", [(0, 60), (10, 0)])
+def test_init__invalid_arguments(pool_size, max_otp_age_sec):
+    with pytest.raises(ValueError):
+        PrefetchingAgentOTPProvider(
+            MagicMock(spec=IAgentOTPProvider),
+            pool_size=pool_size,
+            max_otp_age_sec=max_otp_age_sec,
+        )
+
+
+def test_start__already_started(prefetching_otp_provider):
+    prefetching_otp_provider.start()
+
+    with pytest.raises(RuntimeError):
+        prefetching_otp_provider.start()
+
+
+def test_start__after_stop(otp_provider, prefetching_otp_provider):
+    prefetching_otp_provider.start()
+    wait_for(lambda: otp_provider.get_otps_calls == [POOL_SIZE])
+    prefetching_otp_provider.stop()
+    prefetching_otp_provider.get_otps(POOL_SIZE)
+
+    prefetching_otp_provider.start()
+
+    wait_for(lambda: otp_provider.get_otps_calls == [POOL_SIZE, POOL_SIZE])
+
+
+def test_refill__backs_off_when_otps_expire_before_they_arrive(caplog):
+    otp_provider = MagicMock(spec=IAgentOTPProvider)
+    otp_provider.get_otps.side_effect = lambda count: time.sleep(0.05) or ["otp"] * count
+    prefetching_otp_provider = PrefetchingAgentOTPProvider(
+        otp_provider, pool_size=POOL_SIZE, max_otp_age_sec=0.01
+    )
+
+    prefetching_otp_provider.start()
+    time.sleep(0.3)
+    prefetching_otp_provider.stop()
+
+    # Without backing off, the OTPs would be retrieved about 6 times
+    assert otp_provider.get_otps.call_count <= 4
+    assert "expired" in caplog.text
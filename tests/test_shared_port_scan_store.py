@@ -0,0 +1,203 @@
+import multiprocessing
+import pickle
+from ipaddress import IPv4Address
+
+import pytest
+from monkeytypes import NetworkProtocol, NetworkService, PortStatus
+
+from agentpluginapi import (
+    CompactPortScanDataDict,
+    PortScanData,
+    PortScanDataDict,
+    SharedPortScanDataDict,
+    SharedPortScanStore,
+    TargetHostPorts,
+)
+
+TARGET_IPS = ["10.0.0.1", "10.0.0.2"]
+PORT_SCAN_DATA = {
+    22: PortScanData(
+        port=22, status=PortStatus.OPEN, protocol=NetworkProtocol.TCP, service=NetworkService.SSH
+    ),
+    80: PortScanData(port=80, status=PortStatus.OPEN, service=NetworkService.HTTP),
+    443: PortScanData(port=443, status=PortStatus.CLOSED, protocol=NetworkProtocol.TCP),
+    65535: PortScanData(port=65535, status=PortStatus.CLOSED),
+}
+
+
+@pytest.fixture
+def shared_port_scan_data_dict() -> SharedPortScanDataDict:
+    return SharedPortScanDataDict(memoryview(bytearray(65536)))
+
+
+@pytest.fixture
+def store():
+    with SharedPortScanStore(TARGET_IPS) as store:
+        yield store
+
+
+def test_shared_port_scan_data_dict__set_get(shared_port_scan_data_dict: SharedPortScanDataDict):
+    shared_port_scan_data_dict.bulk_update(PORT_SCAN_DATA)
+    shared_port_scan_data_dict[8080] = PortScanData(port=8080, status=PortStatus.OPEN)
+
+    assert len(shared_port_scan_data_dict) == len(PORT_SCAN_DATA) + 1
+    assert list(shared_port_scan_data_dict) == [22, 80, 443, 8080, 65535]
+    assert shared_port_scan_data_dict[22] == PORT_SCAN_DATA[22]
+    assert 8080 in shared_port_scan_data_dict
+    assert 8081 not in shared_port_scan_data_dict
+    assert "22" not in shared_port_scan_data_dict
+    with pytest.raises(KeyError):
+        shared_port_scan_data_dict[8081]
+
+
+def test_shared_port_scan_data_dict__queries(shared_port_scan_data_dict: SharedPortScanDataDict):
+    shared_port_scan_data_dict.bulk_update(PORT_SCAN_DATA)
+
+    assert shared_port_scan_data_dict.open == {22, 80}
+    assert shared_port_scan_data_dict.closed == {443, 65535}
+    assert shared_port_scan_data_dict.get_open_service_ports(NetworkService.HTTP) == {80}
+    assert shared_port_scan_data_dict.get_open_service_ports(NetworkService.SMB) == set()
+    assert shared_port_scan_data_dict.get_protocol_ports(NetworkProtocol.TCP) == {22, 443}
+    assert shared_port_scan_data_dict.get_open_services() == {
+        NetworkService.SSH,
+        NetworkService.HTTP,
+    }
+
+
+def test_shared_port_scan_data_dict__delete(shared_port_scan_data_dict: SharedPortScanDataDict):
+    shared_port_scan_data_dict.bulk_update(PORT_SCAN_DATA)
+
+    del shared_port_scan_data_dict[22]
+
+    assert 22 not in shared_port_scan_data_dict
+    assert shared_port_scan_data_dict.open == {80}
+    with pytest.raises(KeyError):
+        del shared_port_scan_data_dict[22]
+
+
+def test_shared_port_scan_data_dict__clear(shared_port_scan_data_dict: SharedPortScanDataDict):
+    shared_port_scan_data_dict.bulk_update(PORT_SCAN_DATA)
+
+    shared_port_scan_data_dict.clear()
+
+    assert len(shared_port_scan_data_dict) == 0
+
+
+def test_shared_port_scan_data_dict__banner(shared_port_scan_data_dict: SharedPortScanDataDict):
+    with pytest.raises(ValueError):
+        shared_port_scan_data_dict.bulk_update(
+            {
+                22: PORT_SCAN_DATA[22],
+                80: PortScanData(port=80, status=PortStatus.OPEN, banner="nginx"),
+            }
+        )
+
+    assert len(shared_port_scan_data_dict) == 0
+
+
+def test_shared_port_scan_data_dict__copy(shared_port_scan_data_dict: SharedPortScanDataDict):
+    shared_port_scan_data_dict.bulk_update(PORT_SCAN_DATA)
+
+    port_scan_data_dict_copy = shared_port_scan_data_dict.copy()
+    del port_scan_data_dict_copy[22]
+
+    assert isinstance(port_scan_data_dict_copy, CompactPortScanDataDict)
+    assert shared_port_scan_data_dict == PORT_SCAN_DATA
+
+
+def test_shared_port_scan_data_dict__merge(shared_port_scan_data_dict: SharedPortScanDataDict):
+    shared_port_scan_data_dict.bulk_update(PORT_SCAN_DATA)
+
+    shared_port_scan_data_dict.merge(
+        PortScanDataDict(
+            {
+                22: PortScanData(port=22, status=PortStatus.CLOSED),
+                443: PortScanData(port=443, status=PortStatus.OPEN),
+            }
+        )
+    )
+
+    assert shared_port_scan_data_dict.open == {22, 80, 443}
+
+
+def test_shared_port_scan_data_dict__invalid_table():
+    with pytest.raises(ValueError):
+        SharedPortScanDataDict(memoryview(bytearray(1024)))
+
+
+def test_store__get_target_host_ports(store: SharedPortScanStore):
+    target_host_ports = store.get_target_host_ports("10.0.0.1")
+    target_host_ports.tcp_ports.bulk_update(PORT_SCAN_DATA)
+
+    assert store.get_target_host_ports(IPv4Address("10.0.0.1")).tcp_ports == PORT_SCAN_DATA
+    assert len(store.get_target_host_ports("10.0.0.1").udp_ports) == 0
+    assert len(store.get_target_host_ports("10.0.0.2").tcp_ports) == 0
+    assert store.target_ips == tuple(map(IPv4Address, TARGET_IPS))
+    assert "10.0.0.2" in store
+    assert "10.0.0.3" not in store
+    with pytest.raises(KeyError):
+        store.get_target_host_ports("10.0.0.3")
+
+
+def test_store__target_host_ports_serialization(store: SharedPortScanStore):
+    target_host_ports = store.get_target_host_ports("10.0.0.1")
+    target_host_ports.udp_ports.bulk_update(PORT_SCAN_DATA)
+
+    decoded_target_host_ports = TargetHostPorts.from_bytes(target_host_ports.to_bytes())
+
+    assert decoded_target_host_ports == target_host_ports
+    assert decoded_target_host_ports.to_json_dict() == target_host_ports.to_json_dict()
+
+
+def test_store__attach(store: SharedPortScanStore):
+    attached_store = SharedPortScanStore.attach(store.name)
+    attached_store.get_target_host_ports("10.0.0.2").tcp_ports.bulk_update(PORT_SCAN_DATA)
+    attached_store.close()
+
+    assert store.get_target_host_ports("10.0.0.2").tcp_ports == PORT_SCAN_DATA
+
+
+def test_store__pickle(store: SharedPortScanStore):
+    unpickled_store = pickle.loads(pickle.dumps(store))
+    store.get_target_host_ports("10.0.0.1").tcp_ports.bulk_update(PORT_SCAN_DATA)
+
+    assert unpickled_store.get_target_host_ports("10.0.0.1").tcp_ports == PORT_SCAN_DATA
+    unpickled_store.close()
+
+
+def _write_port_scan_data(store: SharedPortScanStore, target_ip: str):
+    store.get_target_host_ports(target_ip).tcp_ports.bulk_update(PORT_SCAN_DATA)
+    store.close()
+
+
+def test_store__written_by_another_process(store: SharedPortScanStore):
+    process = multiprocessing.Process(target=_write_port_scan_data, args=(store, "10.0.0.2"))
+    process.start()
+    process.join()
+
+    assert process.exitcode == 0
+    assert store.get_target_host_ports("10.0.0.2").tcp_ports == PORT_SCAN_DATA
+
+
+def test_store__close(store: SharedPortScanStore):
+    target_host_ports = store.get_target_host_ports("10.0.0.1")
+
+    store.close()
+
+    with pytest.raises(ValueError):
+        target_host_ports.tcp_ports[22] = PORT_SCAN_DATA[22]
+    with pytest.raises(KeyError):
+        store.get_target_host_ports("10.0.0.1")
+
+
+def test_store__unlinked_on_exit():
+    with SharedPortScanStore(TARGET_IPS) as store:
+        name = store.name
+
+    with pytest.raises(FileNotFoundError):
+        SharedPortScanStore.attach(name)
+
+
+def test_store__no_target_ips():
+    with pytest.raises(ValueError):
+        SharedPortScanStore([])
@@ -1,9 +1,18 @@
+import copy
+import pickle
 from typing import Any
+from unittest.mock import MagicMock
 
 import pytest
-from monkeytypes import NetworkPort, NetworkProtocol, NetworkService, PortStatus
-
-from agentpluginapi import PortScanData, PortScanDataDict, TargetHost, TargetHostPorts
+from monkeytypes import NetworkPort, NetworkProtocol, NetworkService, OperatingSystem, PortStatus
+
+from agentpluginapi import (
+    CompactPortScanDataDict,
+    PortScanData,
+    PortScanDataDict,
+    TargetHost,
+    TargetHostPorts,
+)
 
 
 def test_port_scan_data_dict__constructor():
@@ -60,6 +69,19 @@ def test_port_scan_data_dict_set__invalid_port(invalid_port):
         port_scan_data_dict[invalid_port] = VALID_PORT_SCAN_DATA
 
 
+@pytest.mark.parametrize("port_scan_data_dict_class", [PortScanDataDict, CompactPortScanDataDict])
+def test_port_scan_data_dict_set__coerced_port(port_scan_data_dict_class):
+    port_scan_data_dict = port_scan_data_dict_class()
+
+    port_scan_data_dict["80"] = PortScanData(port=80, status=PortStatus.OPEN)
+
+    assert list(port_scan_data_dict.keys()) == [80]
+    assert type(next(iter(port_scan_data_dict))) is int
+    target_host_ports = TargetHostPorts(tcp_ports=port_scan_data_dict)
+    assert TargetHostPorts.from_bytes(target_host_ports.to_bytes()) == target_host_ports
+    assert pickle.loads(pickle.dumps(port_scan_data_dict)) == port_scan_data_dict
+
+
 def test_closed_tcp_ports():
     expected_closed_ports = {2, 4}
     tcp_ports = PortScanDataDict(
@@ -159,3 +181,666 @@ def test_target_host__constructor_not_altered_when_setting_ports():
     other_host = create_target_host("10.0.0.2", [])
     assert len(other_host.ports_status.tcp_ports) == 0
 
+
+def test_port_scan_data_dict__bulk_update():
+    port_scan_data_dict = PortScanDataDict({NetworkPort(1): VALID_PORT_SCAN_DATA})
+
+    port_scan_data_dict.bulk_update(
+        {
+            NetworkPort(2): PortScanData(port=2, status=PortStatus.CLOSED),
+            NetworkPort(3): PortScanData(port=3, status=PortStatus.OPEN),
+        }
+    )
+
+    assert port_scan_data_dict == {
+        1: VALID_PORT_SCAN_DATA,
+        2: PortScanData(port=2, status=PortStatus.CLOSED),
+        3: PortScanData(port=3, status=PortStatus.OPEN),
+    }
+
+
+def test_port_scan_data_dict__bulk_update_does_not_copy_port_scan_data():
+    port_scan_data_dict = PortScanDataDict()
+
+    port_scan_data_dict.bulk_update({NetworkPort(1): VALID_PORT_SCAN_DATA})
+
+    assert port_scan_data_dict[1] is VALID_PORT_SCAN_DATA
+
+
+@pytest.mark.parametrize("invalid_port", INVALID_PORTS)
+def test_port_scan_data_dict_bulk_update__invalid_port(invalid_port):
+    port_scan_data_dict = PortScanDataDict()
+
+    with pytest.raises((ValueError, TypeError)):
+        port_scan_data_dict.bulk_update(
+            {NetworkPort(2): VALID_PORT_SCAN_DATA, invalid_port: VALID_PORT_SCAN_DATA}
+        )
+
+    assert len(port_scan_data_dict) == 0
+
+
+def test_port_scan_data_dict_bulk_update__invalid_port_scan_data():
+    port_scan_data_dict = PortScanDataDict()
+
+    with pytest.raises((ValueError, TypeError)):
+        port_scan_data_dict.bulk_update({NetworkPort(1): "not port scan data"})  # type: ignore
+
+
+def test_port_scan_data_dict__update_validated():
+    port_scan_data_dict = PortScanDataDict({NetworkPort(1): VALID_PORT_SCAN_DATA})
+    other = PortScanDataDict({NetworkPort(2): PortScanData(port=2, status=PortStatus.CLOSED)})
+
+    port_scan_data_dict.update_validated(other)
+
+    assert port_scan_data_dict == {
+        1: VALID_PORT_SCAN_DATA,
+        2: PortScanData(port=2, status=PortStatus.CLOSED),
+    }
+
+
+@pytest.mark.parametrize("port_scan_data_dict_class", [PortScanDataDict, CompactPortScanDataDict])
+def test_port_scan_data_dict_update_validated__mapping(port_scan_data_dict_class):
+    port_scan_data_dict = port_scan_data_dict_class({NetworkPort(1): VALID_PORT_SCAN_DATA})
+    other = {NetworkPort(2): PortScanData(port=2, status=PortStatus.CLOSED)}
+
+    port_scan_data_dict.update_validated(other)
+
+    assert port_scan_data_dict == {1: VALID_PORT_SCAN_DATA, **other}
+    assert port_scan_data_dict.closed == {2}
+
+
+def test_port_scan_data_dict__indexes_updated_on_overwrite():
+    psdd = PortScanDataDict({NetworkPort(1): PortScanData(port=1, status=PortStatus.CLOSED)})
+
+    psdd[1] = PortScanData(port=1, status=PortStatus.OPEN, service=NetworkService.SSH)
+
+    assert psdd.open == {1}
+    assert psdd.closed == set()
+    assert psdd.get_open_service_ports(NetworkService.SSH) == {1}
+
+
+def test_port_scan_data_dict__indexes_updated_on_delete():
+    psdd = PortScanDataDict(
+        {
+            NetworkPort(1): PortScanData(port=1, status=PortStatus.OPEN),
+            NetworkPort(2): PortScanData(port=2, status=PortStatus.CLOSED),
+        }
+    )
+
+    del psdd[1]
+    psdd.pop(2)
+
+    assert psdd.open == set()
+    assert psdd.closed == set()
+    assert psdd.get_open_service_ports(NetworkService.UNKNOWN) == set()
+
+
+def test_port_scan_data_dict__views_are_live():
+    psdd = PortScanDataDict()
+    open_ports = psdd.open
+
+    psdd[1] = VALID_PORT_SCAN_DATA
+
+    assert open_ports == {1}
+
+
+def test_port_scan_data_dict__views_are_read_only():
+    psdd = PortScanDataDict({NetworkPort(1): VALID_PORT_SCAN_DATA})
+
+    with pytest.raises(AttributeError):
+        psdd.open.add(2)  # type: ignore [attr-defined]
+
+
+@pytest.mark.parametrize(
+    "get_ports",
+    [
+        lambda psdd: psdd.open,
+        lambda psdd: psdd.closed,
+        lambda psdd: psdd.get_open_service_ports(NetworkService.SSH),
+    ],
+)
+def test_port_scan_data_dict__view_set_operators(get_ports):
+    psdd = PortScanDataDict(
+        {
+            NetworkPort(port): PortScanData(
+                port=port, status=PortStatus.OPEN, service=NetworkService.SSH
+            )
+            for port in (22, 80)
+        }
+        | {
+            NetworkPort(port): PortScanData(
+                port=port, status=PortStatus.CLOSED, service=NetworkService.SSH
+            )
+            for port in (23, 81)
+        }
+    )
+    ports = set(get_ports(psdd))
+    view = get_ports(psdd)
+
+    assert set(view - {80, 81}) == ports - {80, 81}
+    assert len(view - {80, 81}) == len(ports) - 1
+    assert len(view & {22, 23}) == 1
+    assert len(view | {1}) == len(ports) + 1
+    assert len(view ^ {1}) == len(ports) + 1
+    union = view | {1}
+    assert 1 in union
+    assert 1 in union
+    assert isinstance(union, frozenset)
+
+
+def test_port_scan_data_dict__get_open_services():
+    psdd = PortScanDataDict(
+        {
+            NetworkPort(1): PortScanData(
+                port=1, status=PortStatus.OPEN, service=NetworkService.SSH
+            ),
+            NetworkPort(2): PortScanData(
+                port=2, status=PortStatus.CLOSED, service=NetworkService.HTTP
+            ),
+            NetworkPort(3): PortScanData(port=3, status=PortStatus.OPEN),
+        }
+    )
+
+    assert psdd.get_open_services() == {NetworkService.SSH, NetworkService.UNKNOWN}
+
+    del psdd[1]
+    assert psdd.get_open_services() == {NetworkService.UNKNOWN}
+
+
+def test_port_scan_data_dict__get_protocol_ports():
+    psdd = PortScanDataDict(
+        {
+            NetworkPort(1): PortScanData(
+                port=1, status=PortStatus.OPEN, protocol=NetworkProtocol.TCP
+            ),
+            NetworkPort(2): PortScanData(
+                port=2, status=PortStatus.OPEN, protocol=NetworkProtocol.UDP
+            ),
+            NetworkPort(3): PortScanData(
+                port=3, status=PortStatus.CLOSED, protocol=NetworkProtocol.TCP
+            ),
+        }
+    )
+
+    assert psdd.get_protocol_ports(NetworkProtocol.TCP) == {1, 3}
+    assert psdd.get_protocol_ports(NetworkProtocol.UDP) == {2}
+    assert psdd.get_protocol_ports(NetworkProtocol.ICMP) == set()
+
+
+@pytest.mark.parametrize("copy_fn", [PortScanDataDict.copy, copy.copy, copy.deepcopy])
+def test_port_scan_data_dict__copy_has_independent_indexes(copy_fn):
+    psdd = PortScanDataDict({NetworkPort(1): VALID_PORT_SCAN_DATA})
+
+    psdd_copy = copy_fn(psdd)
+    psdd_copy[2] = PortScanData(port=2, status=PortStatus.OPEN)
+
+    assert psdd.open == {1}
+    assert psdd_copy.open == {1, 2}
+
+
+def test_port_scan_data_dict__ior_updates_indexes():
+    psdd = PortScanDataDict()
+
+    psdd |= PortScanDataDict({NetworkPort(1): VALID_PORT_SCAN_DATA})
+    psdd |= {NetworkPort(2): PortScanData(port=2, status=PortStatus.CLOSED)}
+
+    assert psdd.open == {1}
+    assert psdd.closed == {2}
+
+
+COMPACT_TEST_PORT_SCAN_DATA = {
+    NetworkPort(22): PortScanData(
+        port=22,
+        status=PortStatus.OPEN,
+        protocol=NetworkProtocol.TCP,
+        service=NetworkService.SSH,
+        banner="SSH-2.0-OpenSSH_8.9",
+    ),
+    NetworkPort(80): PortScanData(
+        port=80, status=PortStatus.OPEN, protocol=NetworkProtocol.TCP, service=NetworkService.HTTP
+    ),
+    NetworkPort(443): PortScanData(
+        port=443, status=PortStatus.CLOSED, protocol=NetworkProtocol.TCP
+    ),
+    NetworkPort(53): PortScanData(port=53, status=PortStatus.OPEN, protocol=NetworkProtocol.UDP),
+}
+
+
+def test_compact_port_scan_data_dict__constructor():
+    compact = CompactPortScanDataDict(COMPACT_TEST_PORT_SCAN_DATA)
+
+    assert compact == COMPACT_TEST_PORT_SCAN_DATA
+    assert compact == PortScanDataDict(COMPACT_TEST_PORT_SCAN_DATA)
+    assert list(compact) == sorted(COMPACT_TEST_PORT_SCAN_DATA)
+
+
+def test_compact_port_scan_data_dict__set_overwrite_delete():
+    compact = CompactPortScanDataDict()
+
+    compact[22] = COMPACT_TEST_PORT_SCAN_DATA[22]
+    compact[80] = COMPACT_TEST_PORT_SCAN_DATA[80]
+    compact[22] = PortScanData(port=22, status=PortStatus.CLOSED)
+    del compact[80]
+
+    assert compact == {22: PortScanData(port=22, status=PortStatus.CLOSED)}
+    assert 80 not in compact
+    with pytest.raises(KeyError):
+        compact[80]
+    with pytest.raises(KeyError):
+        del compact[80]
+
+
+@pytest.mark.parametrize("invalid_port", INVALID_PORTS)
+def test_compact_port_scan_data_dict_set__invalid_port(invalid_port):
+    compact = CompactPortScanDataDict()
+
+    with pytest.raises((ValueError, TypeError)):
+        compact[invalid_port] = VALID_PORT_SCAN_DATA
+
+
+@pytest.mark.parametrize("missing_port", [1, "string", None])
+def test_compact_port_scan_data_dict__missing_port(missing_port):
+    compact = CompactPortScanDataDict(COMPACT_TEST_PORT_SCAN_DATA)
+
+    assert missing_port not in compact
+    assert compact.get(missing_port) is None
+
+
+def test_compact_port_scan_data_dict__queries():
+    compact = CompactPortScanDataDict(COMPACT_TEST_PORT_SCAN_DATA)
+    psdd = PortScanDataDict(COMPACT_TEST_PORT_SCAN_DATA)
+
+    assert compact.open == psdd.open
+    assert compact.closed == psdd.closed
+    for service in NetworkService:
+        assert compact.get_open_service_ports(service) == psdd.get_open_service_ports(service)
+    for protocol in NetworkProtocol:
+        assert compact.get_protocol_ports(protocol) == psdd.get_protocol_ports(protocol)
+    assert compact.get_open_services() == psdd.get_open_services()
+
+
+def test_compact_port_scan_data_dict__bulk_update_many_ports():
+    port_scan_data = {
+        port: PortScanData(port=port, status=PortStatus(["open", "closed"][port % 2]))
+        for port in reversed(range(1000))
+    }
+    existing_port_scan_data = {NetworkPort(5000): PortScanData(port=5000, status=PortStatus.OPEN)}
+    compact = CompactPortScanDataDict(existing_port_scan_data)
+
+    compact.bulk_update(port_scan_data)
+
+    assert compact == {**port_scan_data, **existing_port_scan_data}
+    assert list(compact) == sorted(compact)
+    assert compact.closed == set(range(1, 1000, 2))
+
+
+def test_compact_port_scan_data_dict__clear():
+    compact = CompactPortScanDataDict(COMPACT_TEST_PORT_SCAN_DATA)
+
+    compact.clear()
+
+    assert len(compact) == 0
+    assert compact.open == set()
+
+
+def test_compact_port_scan_data_dict__copy():
+    compact = CompactPortScanDataDict(COMPACT_TEST_PORT_SCAN_DATA)
+
+    compact_copy = copy.copy(compact)
+    del compact_copy[22]
+
+    assert isinstance(compact_copy, CompactPortScanDataDict)
+    assert compact == COMPACT_TEST_PORT_SCAN_DATA
+    assert 22 not in compact_copy
+
+
+def test_target_host_ports__with_compact_storage():
+    thp = TargetHostPorts.with_compact_storage()
+    thp.tcp_ports.bulk_update(COMPACT_TEST_PORT_SCAN_DATA)
+
+    assert isinstance(thp.tcp_ports, CompactPortScanDataDict)
+    assert isinstance(thp.udp_ports, CompactPortScanDataDict)
+    assert (
+        thp.to_json_dict()
+        == TargetHostPorts(tcp_ports=PortScanDataDict(COMPACT_TEST_PORT_SCAN_DATA)).to_json_dict()
+    )
+
+
+def create_encodable_target_host(compact: bool) -> TargetHost:
+    ports_status = TargetHostPorts.with_compact_storage() if compact else TargetHostPorts()
+    ports_status.tcp_ports.bulk_update(COMPACT_TEST_PORT_SCAN_DATA)
+    ports_status.udp_ports[53] = PortScanData(
+        port=53, status=PortStatus.OPEN, protocol=NetworkProtocol.UDP, banner="dns \u2603"
+    )
+
+    return TargetHost(
+        ip="10.0.0.1",
+        operating_system=OperatingSystem.WINDOWS,
+        icmp=True,
+        ports_status=ports_status,
+    )
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_target_host__to_bytes_from_bytes(compact: bool):
+    target_host = create_encodable_target_host(compact)
+
+    decoded_target_host = TargetHost.from_bytes(target_host.to_bytes())
+
+    assert decoded_target_host == target_host
+    assert decoded_target_host.to_json_dict() == target_host.to_json_dict()
+    assert (
+        decoded_target_host.ports_status.tcp_ports.open == target_host.ports_status.tcp_ports.open
+    )
+    assert decoded_target_host.ports_status.udp_ports.get_protocol_ports(NetworkProtocol.UDP) == {
+        53
+    }
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_target_host__from_bytes_preserves_storage(compact: bool):
+    target_host = create_encodable_target_host(compact)
+
+    decoded_target_host = TargetHost.from_bytes(target_host.to_bytes())
+
+    for ports in (decoded_target_host.ports_status.tcp_ports, target_host.ports_status.udp_ports):
+        assert isinstance(ports, CompactPortScanDataDict) == compact
+
+
+def test_target_host__from_bytes_defaults():
+    target_host = TargetHost(ip="192.168.1.1")
+
+    decoded_target_host = TargetHost.from_bytes(target_host.to_bytes())
+
+    assert decoded_target_host == target_host
+    assert decoded_target_host.operating_system is None
+    assert decoded_target_host.icmp is False
+
+
+def test_target_host__from_bytes_is_mutable():
+    decoded_target_host = TargetHost.from_bytes(create_encodable_target_host(False).to_bytes())
+
+    decoded_target_host.ports_status.tcp_ports[8080] = PortScanData(
+        port=8080, status=PortStatus.OPEN
+    )
+    with pytest.raises(ValueError):
+        decoded_target_host.ip = "not an IP"
+
+    assert 8080 in decoded_target_host.ports_status.tcp_ports.open
+
+
+def test_target_host__to_bytes_banner_with_lone_surrogate():
+    target_host = TargetHost(ip="10.0.0.1")
+    target_host.ports_status.tcp_ports[21] = PortScanData(
+        port=21, status=PortStatus.OPEN, banner="\udcff"
+    )
+
+    decoded_target_host = TargetHost.from_bytes(target_host.to_bytes())
+
+    assert decoded_target_host.ports_status.tcp_ports[21].banner == "\udcff"
+
+
+def test_target_host__to_bytes_is_smaller_than_json():
+    target_host = create_encodable_target_host(False)
+
+    assert len(target_host.to_bytes()) < len(target_host.model_dump_json()) / 2
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_target_host__pickle(compact: bool):
+    target_host = create_encodable_target_host(compact)
+
+    unpickled_target_host = pickle.loads(pickle.dumps(target_host))
+
+    assert unpickled_target_host == target_host
+    assert unpickled_target_host is not target_host
+
+
+def test_target_host__pickle_keeps_fields_set():
+    target_host = TargetHost(ip="10.0.0.1")
+
+    unpickled_target_host = pickle.loads(pickle.dumps(target_host))
+
+    assert unpickled_target_host.model_fields_set == {"ip"}
+    assert unpickled_target_host.model_dump(exclude_unset=True) == target_host.model_dump(
+        exclude_unset=True
+    )
+
+
+class ExtendedTargetHost(TargetHost):
+    extra: int = 0
+
+
+def test_target_host__pickle_subclass():
+    target_host = ExtendedTargetHost(ip="10.0.0.1", extra=5)
+
+    unpickled_target_host = pickle.loads(pickle.dumps(target_host))
+
+    assert type(unpickled_target_host) is ExtendedTargetHost
+    assert unpickled_target_host.extra == 5
+
+
+def test_target_host__pickle_port_differs_from_key():
+    target_host = TargetHost(
+        ip="10.0.0.1",
+        ports_status=TargetHostPorts(
+            tcp_ports=PortScanDataDict({80: PortScanData(port=8080, status=PortStatus.OPEN)})
+        ),
+    )
+
+    unpickled_target_host = pickle.loads(pickle.dumps(target_host))
+
+    assert unpickled_target_host.ports_status.tcp_ports[80].port == 8080
+
+
+def test_target_host_ports__to_bytes_from_bytes():
+    thp = create_encodable_target_host(True).ports_status
+
+    decoded_thp = TargetHostPorts.from_bytes(thp.to_bytes())
+
+    assert decoded_thp == thp
+    assert isinstance(decoded_thp.tcp_ports, CompactPortScanDataDict)
+    assert pickle.loads(pickle.dumps(thp)) == thp
+
+
+def test_target_host__from_bytes_truncated():
+    encoded_target_host = create_encodable_target_host(False).to_bytes()
+
+    for length in range(len(encoded_target_host)):
+        with pytest.raises(ValueError):
+            TargetHost.from_bytes(encoded_target_host[:length])
+
+
+def test_target_host__from_bytes_trailing_bytes():
+    encoded_target_host = create_encodable_target_host(False).to_bytes()
+
+    with pytest.raises(ValueError):
+        TargetHost.from_bytes(encoded_target_host + b"\x00")
+
+
+@pytest.mark.parametrize(
+    "offset, value",
+    [
+        (0, 99),  # version
+        (5, 99),  # operating system
+        (17 + 2 * len(COMPACT_TEST_PORT_SCAN_DATA), 99),  # first TCP port status
+    ],
+)
+def test_target_host__from_bytes_invalid(offset: int, value: int):
+    encoded_target_host = bytearray(create_encodable_target_host(False).to_bytes())
+    encoded_target_host[offset] = value
+
+    with pytest.raises(ValueError):
+        TargetHost.from_bytes(bytes(encoded_target_host))
+
+
+@pytest.mark.parametrize(
+    "current, other, expected",
+    [
+        (
+            PortScanData(port=80, status=PortStatus.OPEN),
+            PortScanData(port=80, status=PortStatus.CLOSED),
+            PortScanData(port=80, status=PortStatus.OPEN),
+        ),
+        (
+            PortScanData(port=80, status=PortStatus.CLOSED),
+            PortScanData(port=80, status=PortStatus.OPEN),
+            PortScanData(port=80, status=PortStatus.OPEN),
+        ),
+        (
+            PortScanData(
+                port=80,
+                status=PortStatus.OPEN,
+                protocol=NetworkProtocol.TCP,
+                service=NetworkService.HTTP,
+                banner="nginx",
+            ),
+            PortScanData(port=80, status=PortStatus.OPEN),
+            PortScanData(
+                port=80,
+                status=PortStatus.OPEN,
+                protocol=NetworkProtocol.TCP,
+                service=NetworkService.HTTP,
+                banner="nginx",
+            ),
+        ),
+        (
+            PortScanData(port=80, status=PortStatus.OPEN, service=NetworkService.HTTP, banner="a"),
+            PortScanData(port=80, status=PortStatus.OPEN, service=NetworkService.HTTPS, banner="b"),
+            PortScanData(port=80, status=PortStatus.OPEN, service=NetworkService.HTTPS, banner="b"),
+        ),
+        (
+            PortScanData(port=80, status=PortStatus.CLOSED, banner="a"),
+            PortScanData(port=80, status=PortStatus.OPEN, service=NetworkService.HTTP),
+            PortScanData(port=80, status=PortStatus.OPEN, service=NetworkService.HTTP, banner="a"),
+        ),
+    ],
+)
+@pytest.mark.parametrize("port_scan_data_dict_class", [PortScanDataDict, CompactPortScanDataDict])
+def test_port_scan_data_dict__merge(
+    port_scan_data_dict_class, current: PortScanData, other: PortScanData, expected: PortScanData
+):
+    port_scan_data_dict = port_scan_data_dict_class({80: current})
+
+    port_scan_data_dict.merge(PortScanDataDict({80: other}))
+
+    assert port_scan_data_dict == {80: expected}
+    assert (80 in port_scan_data_dict.open) == (expected.status == PortStatus.OPEN)
+    assert (80 in port_scan_data_dict.get_open_service_ports(NetworkService.HTTP)) == (
+        expected.status == PortStatus.OPEN and expected.service == NetworkService.HTTP
+    )
+
+
+def test_port_scan_data_dict__merge_adds_ports():
+    port_scan_data_dict = PortScanDataDict({22: COMPACT_TEST_PORT_SCAN_DATA[22]})
+
+    port_scan_data_dict.merge(CompactPortScanDataDict(COMPACT_TEST_PORT_SCAN_DATA))
+
+    assert port_scan_data_dict == COMPACT_TEST_PORT_SCAN_DATA
+
+
+def test_port_scan_data_dict__merge_does_not_validate(monkeypatch):
+    other = PortScanDataDict(COMPACT_TEST_PORT_SCAN_DATA)
+    port_scan_data_dict = PortScanDataDict()
+    monkeypatch.setattr(
+        PortScanData, "model_validate", MagicMock(side_effect=AssertionError("validated"))
+    )
+
+    port_scan_data_dict.merge(other)
+
+    assert port_scan_data_dict == COMPACT_TEST_PORT_SCAN_DATA
+
+
+def test_port_scan_data_dict__merge_keeps_unchanged_port_scan_data():
+    current = PortScanData(port=80, status=PortStatus.OPEN, service=NetworkService.HTTP)
+    port_scan_data_dict = PortScanDataDict({80: current})
+
+    port_scan_data_dict.merge(
+        PortScanDataDict({80: PortScanData(port=80, status=PortStatus.CLOSED)})
+    )
+
+    assert port_scan_data_dict[80] is current
+
+
+def test_port_scan_data_dict__merge_invalid_type():
+    with pytest.raises(TypeError):
+        plain_dict = {NetworkPort(80): PortScanData(port=80, status=PortStatus.OPEN)}
+        PortScanDataDict().merge(plain_dict)  # type: ignore [arg-type]
+
+
+def test_target_host_ports__update_from():
+    thp = TargetHostPorts(tcp_ports=PortScanDataDict(COMPACT_TEST_PORT_SCAN_DATA))
+    udp_thp = TargetHostPorts(
+        udp_ports=PortScanDataDict({53: PortScanData(port=53, status=PortStatus.OPEN)})
+    )
+
+    thp.update_from(udp_thp)
+
+    assert thp.tcp_ports == COMPACT_TEST_PORT_SCAN_DATA
+    assert thp.udp_ports.open == {53}
+
+
+def test_target_host_ports__merge():
+    thp = TargetHostPorts.with_compact_storage()
+    thp.tcp_ports[443] = PortScanData(port=443, status=PortStatus.OPEN)
+    other = TargetHostPorts(tcp_ports=PortScanDataDict(COMPACT_TEST_PORT_SCAN_DATA))
+
+    merged_thp = thp.merge(other)
+
+    assert isinstance(merged_thp.tcp_ports, CompactPortScanDataDict)
+    assert merged_thp.tcp_ports.open == {
+        port for port, psd in COMPACT_TEST_PORT_SCAN_DATA.items() if psd.status == PortStatus.OPEN
+    } | {443}
+    assert thp.tcp_ports.keys() == {443}
+    assert other.tcp_ports == COMPACT_TEST_PORT_SCAN_DATA
+
+
+def test_target_host__update_from():
+    target_host = TargetHost(ip="10.0.0.1", operating_system=OperatingSystem.LINUX)
+    target_host.ports_status.tcp_ports[22] = PortScanData(port=22, status=PortStatus.OPEN)
+    other = TargetHost(ip="10.0.0.1", icmp=True)
+    other.ports_status.tcp_ports[22] = PortScanData(port=22, status=PortStatus.CLOSED)
+    other.ports_status.tcp_ports[80] = PortScanData(port=80, status=PortStatus.OPEN)
+
+    target_host.update_from(other)
+
+    assert target_host.operating_system == OperatingSystem.LINUX
+    assert target_host.icmp is True
+    assert target_host.ports_status.tcp_ports.open == {22, 80}
+
+
+def test_target_host__update_from_operating_system():
+    target_host = TargetHost(ip="10.0.0.1")
+
+    target_host.update_from(TargetHost(ip="10.0.0.1", operating_system=OperatingSystem.WINDOWS))
+
+    assert target_host.operating_system == OperatingSystem.WINDOWS
+
+
+def test_target_host__merge():
+    target_host = TargetHost(ip="10.0.0.1")
+    target_host.ports_status.tcp_ports[22] = PortScanData(port=22, status=PortStatus.OPEN)
+    other = TargetHost(ip="10.0.0.1", operating_system=OperatingSystem.LINUX, icmp=True)
+    other.ports_status.udp_ports[53] = PortScanData(port=53, status=PortStatus.OPEN)
+
+    merged_target_host = target_host.merge(other)
+
+    assert merged_target_host.operating_system == OperatingSystem.LINUX
+    assert merged_target_host.icmp is True
+    assert merged_target_host.ports_status.tcp_ports.open == {22}
+    assert merged_target_host.ports_status.udp_ports.open == {53}
+    assert target_host == TargetHost(
+        ip="10.0.0.1",
+        ports_status=TargetHostPorts(
+            tcp_ports=PortScanDataDict({22: PortScanData(port=22, status=PortStatus.OPEN)})
+        ),
+    )
+    assert len(other.ports_status.tcp_ports) == 0
+
+
+@pytest.mark.parametrize("method", [TargetHost.merge, TargetHost.update_from])
+def test_target_host__merge_different_ip(method):
+    target_host = TargetHost(ip="10.0.0.1")
+
+    with pytest.raises(ValueError):
+        method(target_host, TargetHost(ip="10.0.0.2"))
@@ -0,0 +1,181 @@
+from ipaddress import IPv4Address
+from typing import List
+
+import pytest
+from monkeytypes import NetworkProtocol, NetworkService, OperatingSystem, PortStatus
+
+from agentpluginapi import PortScanData, TargetHost, TargetHostInventory
+
+SMB = (NetworkProtocol.TCP, NetworkService.SMB)
+SSH = (NetworkProtocol.TCP, NetworkService.SSH)
+
+
+def create_target_host(
+    ip: str,
+    operating_system: OperatingSystem | None = None,
+    icmp: bool = False,
+    open_services: List[NetworkService] = [],
+    closed_services: List[NetworkService] = [],
+) -> TargetHost:
+    target_host = TargetHost(ip=ip, operating_system=operating_system, icmp=icmp)
+    for port, service in enumerate(open_services, start=1):
+        target_host.ports_status.tcp_ports[port] = PortScanData(
+            port=port, status=PortStatus.OPEN, service=service
+        )
+    for port, service in enumerate(closed_services, start=1000):
+        target_host.ports_status.tcp_ports[port] = PortScanData(
+            port=port, status=PortStatus.CLOSED, service=service
+        )
+
+    return target_host
+
+
+TARGET_HOSTS = [
+    create_target_host("10.2.0.1", OperatingSystem.WINDOWS, True, [NetworkService.SMB]),
+    create_target_host("10.2.255.254", OperatingSystem.WINDOWS, False, [NetworkService.SMB]),
+    create_target_host("10.2.3.4", OperatingSystem.LINUX, True, [NetworkService.SSH]),
+    create_target_host("10.3.0.1", OperatingSystem.WINDOWS, True, [NetworkService.SMB]),
+    create_target_host("10.1.255.255", None, True, [], [NetworkService.SMB]),
+    create_target_host("192.168.1.1", OperatingSystem.LINUX, False),
+]
+
+
+@pytest.fixture
+def inventory() -> TargetHostInventory:
+    return TargetHostInventory(TARGET_HOSTS)
+
+
+def ips(target_hosts: List[TargetHost]) -> List[str]:
+    return [str(target_host.ip) for target_host in target_hosts]
+
+
+def test_len_and_iter__sorted_by_ip(inventory: TargetHostInventory):
+    assert len(inventory) == len(TARGET_HOSTS)
+    assert ips(list(inventory)) == [
+        "10.1.255.255",
+        "10.2.0.1",
+        "10.2.3.4",
+        "10.2.255.254",
+        "10.3.0.1",
+        "192.168.1.1",
+    ]
+
+
+def test_contains_and_getitem(inventory: TargetHostInventory):
+    assert "10.2.3.4" in inventory
+    assert IPv4Address("10.2.3.4") in inventory
+    assert TARGET_HOSTS[2] in inventory
+    assert "10.2.3.5" not in inventory
+    assert "not an IP" not in inventory
+    assert inventory["10.2.3.4"] is TARGET_HOSTS[2]
+    assert inventory.get("10.2.3.5") is None
+    with pytest.raises(KeyError):
+        inventory["10.2.3.5"]
+
+
+@pytest.mark.parametrize(
+    "network, expected_ips",
+    [
+        ("10.2.0.0/16", ["10.2.0.1", "10.2.3.4", "10.2.255.254"]),
+        ("10.0.0.0/8", ["10.1.255.255", "10.2.0.1", "10.2.3.4", "10.2.255.254", "10.3.0.1"]),
+        ("10.2.3.4/32", ["10.2.3.4"]),
+        ("172.16.0.0/12", []),
+        ("0.0.0.0/0", [str(ip) for ip in sorted(th.ip for th in TARGET_HOSTS)]),
+    ],
+)
+def test_find__network(inventory: TargetHostInventory, network: str, expected_ips: List[str]):
+    assert ips(inventory.find(network)) == expected_ips
+
+
+def test_find__open_service(inventory: TargetHostInventory):
+    assert ips(inventory.find("10.2.0.0/16", open_service=SMB)) == ["10.2.0.1", "10.2.255.254"]
+    assert ips(inventory.find(open_service=SMB)) == ["10.2.0.1", "10.2.255.254", "10.3.0.1"]
+    assert inventory.find(open_service=(NetworkProtocol.UDP, NetworkService.SMB)) == []
+
+
+def test_find__operating_system_and_icmp(inventory: TargetHostInventory):
+    assert ips(inventory.find(operating_system=OperatingSystem.LINUX)) == [
+        "10.2.3.4",
+        "192.168.1.1",
+    ]
+    assert ips(inventory.find(icmp=False)) == ["10.2.255.254", "192.168.1.1"]
+    assert ips(
+        inventory.find(
+            "10.0.0.0/8", operating_system=OperatingSystem.WINDOWS, icmp=True, open_service=SMB
+        )
+    ) == ["10.2.0.1", "10.3.0.1"]
+
+
+def test_find__all(inventory: TargetHostInventory):
+    assert inventory.find() == list(inventory)
+
+
+def test_find__invalid_network(inventory: TargetHostInventory):
+    with pytest.raises(ValueError):
+        inventory.find("10.2.3.4/16")
+
+
+def test_add__replaces_and_reindexes(inventory: TargetHostInventory):
+    replacement = create_target_host(
+        "10.2.0.1", OperatingSystem.WINDOWS, True, [NetworkService.SSH]
+    )
+
+    inventory.add(replacement)
+
+    assert len(inventory) == len(TARGET_HOSTS)
+    assert inventory["10.2.0.1"] is replacement
+    assert ips(inventory.find("10.2.0.0/16", open_service=SMB)) == ["10.2.255.254"]
+    assert ips(inventory.find(open_service=SSH)) == ["10.2.0.1", "10.2.3.4"]
+
+
+def test_add__modified_target_host(inventory: TargetHostInventory):
+    target_host = create_target_host("192.168.1.2")
+    inventory.add(target_host)
+
+    target_host.ports_status.tcp_ports[22] = PortScanData(
+        port=22, status=PortStatus.OPEN, service=NetworkService.SSH
+    )
+    assert ips(inventory.find(open_service=SSH)) == ["10.2.3.4"]
+
+    inventory.add(target_host)
+
+    assert ips(inventory.find(open_service=SSH)) == ["10.2.3.4", "192.168.1.2"]
+
+
+def test_add__one_at_a_time():
+    inventory = TargetHostInventory()
+    for target_host in reversed(TARGET_HOSTS):
+        inventory.add(target_host)
+
+    assert list(inventory) == list(TargetHostInventory(TARGET_HOSTS))
+    assert inventory.find(open_service=SMB) == TargetHostInventory(TARGET_HOSTS).find(
+        open_service=SMB
+    )
+
+
+def test_update__duplicate_ips():
+    replacement = create_target_host("10.2.3.4", OperatingSystem.WINDOWS)
+
+    inventory = TargetHostInventory([*TARGET_HOSTS, replacement])
+
+    assert len(inventory) == len(TARGET_HOSTS)
+    assert inventory["10.2.3.4"] is replacement
+    assert inventory.find(open_service=SSH) == []
+
+
+def test_remove(inventory: TargetHostInventory):
+    removed_target_host = inventory.remove("10.2.0.1")
+
+    assert removed_target_host is TARGET_HOSTS[0]
+    assert "10.2.0.1" not in inventory
+    assert ips(inventory.find("10.2.0.0/16", open_service=SMB)) == ["10.2.255.254"]
+    with pytest.raises(KeyError):
+        inventory.remove("10.2.0.1")
+
+
+def test_iter__allows_modification(inventory: TargetHostInventory):
+    for target_host in inventory:
+        inventory.remove(target_host.ip)
+
+    assert len(inventory) == 0
+    assert inventory.find() == []
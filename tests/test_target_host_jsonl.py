@@ -0,0 +1,144 @@
+import io
+from typing import Iterator
+
+import pytest
+from monkeytypes import NetworkProtocol, NetworkService, OperatingSystem, PortStatus
+
+from agentpluginapi import (
+    CompactPortScanDataDict,
+    PortScanData,
+    TargetHost,
+    dump_target_hosts_jsonl,
+    load_target_hosts_jsonl,
+)
+
+
+def create_target_host(index: int) -> TargetHost:
+    target_host = TargetHost(
+        ip=f"10.0.{index // 256}.{index % 256}",
+        operating_system=OperatingSystem.LINUX if index % 2 else None,
+        icmp=bool(index % 3),
+    )
+    target_host.ports_status.tcp_ports[22] = PortScanData(
+        port=22,
+        status=PortStatus.OPEN,
+        protocol=NetworkProtocol.TCP,
+        service=NetworkService.SSH,
+        banner="SSH-2.0-OpenSSH_8.9",
+    )
+    target_host.ports_status.tcp_ports[443] = PortScanData(port=443, status=PortStatus.CLOSED)
+    target_host.ports_status.udp_ports[53] = PortScanData(
+        port=53, status=PortStatus.OPEN, protocol=NetworkProtocol.UDP
+    )
+
+    return target_host
+
+
+TARGET_HOSTS = [create_target_host(index) for index in range(10)]
+
+
+def test_dump_load_target_hosts_jsonl():
+    file = io.BytesIO()
+
+    count = dump_target_hosts_jsonl(TARGET_HOSTS, file)
+    file.seek(0)
+    loaded_target_hosts = list(load_target_hosts_jsonl(file))
+
+    assert count == len(TARGET_HOSTS)
+    assert loaded_target_hosts == TARGET_HOSTS
+    assert [th.to_json_dict() for th in loaded_target_hosts] == [
+        th.to_json_dict() for th in TARGET_HOSTS
+    ]
+
+
+def test_dump_target_hosts_jsonl__one_host_per_line():
+    file = io.BytesIO()
+
+    dump_target_hosts_jsonl(TARGET_HOSTS, file)
+
+    lines = file.getvalue().splitlines()
+    assert lines == [th.model_dump_json().encode() for th in TARGET_HOSTS]
+
+
+def test_dump_target_hosts_jsonl__consumes_lazily():
+    file = io.BytesIO()
+    written_sizes = []
+
+    def generate_target_hosts() -> Iterator[TargetHost]:
+        for target_host in TARGET_HOSTS:
+            written_sizes.append(len(file.getvalue()))
+            yield target_host
+
+    dump_target_hosts_jsonl(generate_target_hosts(), file)
+
+    assert written_sizes == sorted(set(written_sizes))
+
+
+def test_dump_target_hosts_jsonl__appends():
+    file = io.BytesIO()
+
+    dump_target_hosts_jsonl(TARGET_HOSTS[:5], file)
+    dump_target_hosts_jsonl(TARGET_HOSTS[5:], file)
+    file.seek(0)
+
+    assert list(load_target_hosts_jsonl(file)) == TARGET_HOSTS
+
+
+def test_load_target_hosts_jsonl__compact_storage():
+    file = io.BytesIO()
+    dump_target_hosts_jsonl(TARGET_HOSTS, file)
+    file.seek(0)
+
+    loaded_target_hosts = list(load_target_hosts_jsonl(file, compact_storage=True))
+
+    assert loaded_target_hosts == TARGET_HOSTS
+    for target_host in loaded_target_hosts:
+        assert isinstance(target_host.ports_status.tcp_ports, CompactPortScanDataDict)
+        assert isinstance(target_host.ports_status.udp_ports, CompactPortScanDataDict)
+
+
+def test_load_target_hosts_jsonl__indexes_ports():
+    file = io.BytesIO()
+    dump_target_hosts_jsonl(TARGET_HOSTS[:1], file)
+    file.seek(0)
+
+    (target_host,) = load_target_hosts_jsonl(file)
+
+    assert target_host.ports_status.tcp_ports.open == {22}
+    assert target_host.ports_status.tcp_ports.get_open_service_ports(NetworkService.SSH) == {22}
+    assert target_host.ports_status.udp_ports.get_protocol_ports(NetworkProtocol.UDP) == {53}
+
+
+def test_load_target_hosts_jsonl__reads_lazily():
+    file = io.BytesIO()
+    dump_target_hosts_jsonl(TARGET_HOSTS, file)
+    file.seek(0)
+
+    loaded_target_hosts = load_target_hosts_jsonl(file)
+    next(loaded_target_hosts)
+
+    assert file.tell() < len(file.getvalue())
+
+
+def test_load_target_hosts_jsonl__skips_blank_lines():
+    file = io.BytesIO(b"\n" + TARGET_HOSTS[0].model_dump_json().encode() + b"\n\n")
+
+    assert list(load_target_hosts_jsonl(file)) == TARGET_HOSTS[:1]
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        b"not json",
+        b'{"ip": "10.0.0.1"}',
+        b'{"ip": "10.0.0.1", "ports_status": {"tcp_ports": {"99999": {}}, "udp_ports": {}}}',
+        b'{"ip": "not an IP", "ports_status": {"tcp_ports": {}, "udp_ports": {}}}',
+    ],
+)
+def test_load_target_hosts_jsonl__invalid(line: bytes):
+    file = io.BytesIO(TARGET_HOSTS[0].model_dump_json().encode() + b"\n" + line + b"\n")
+    loaded_target_hosts = load_target_hosts_jsonl(file)
+
+    assert next(loaded_target_hosts) == TARGET_HOSTS[0]
+    with pytest.raises(ValueError, match="line 2"):
+        next(loaded_target_hosts)
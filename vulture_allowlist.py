@@ -1,6 +1,22 @@
 from agentpluginapi import (
+    DOWNLOAD_URL_PLACEHOLDER,
+    OTP_PLACEHOLDER,
+    AgentBinaryDownloadRequest,
     AgentBinaryDownloadReservation,
     AgentBinaryDownloadTicket,
+    AgentBinaryWrapperTemplate,
+    AgentCommandTemplate,
+    AgentEventPublisherMetrics,
+    AsyncAgentBinaryRepositoryAdapter,
+    AsyncAgentEventPublisherAdapter,
+    AsyncAgentOTPProviderAdapter,
+    AsyncHTTPAgentBinaryServerRegistrarAdapter,
+    AsyncPropagationCredentialsRepositoryAdapter,
+    BackgroundAgentEventPublisher,
+    BitmapTCPPortSelector,
+    BufferingAgentEventPublisher,
+    CachingAgentBinaryRepository,
+    CompactPortScanDataDict,
     DropperExecutionMode,
     ExploiterResult,
     FingerprintData,
@@ -8,8 +24,15 @@ from agentpluginapi import (
     IAgentCommandBuilderFactory,
     IAgentEventPublisher,
     IAgentOTPProvider,
+    IAsyncAgentBinaryRepository,
+    IAsyncAgentEventPublisher,
+    IAsyncAgentOTPProvider,
+    IAsyncHTTPAgentBinaryServerRegistrar,
+    IAsyncPropagationCredentialsRepository,
     IHTTPAgentBinaryServerRegistrar,
     ILinuxAgentCommandBuilder,
+    InMemoryPropagationCredentialsRepository,
+    InterfaceToTargetCacheInfo,
     IPropagationCredentialsRepository,
     ITCPPortSelector,
     IWindowsAgentCommandBuilder,
@@ -17,22 +40,59 @@ from agentpluginapi import (
     LinuxDownloadOptions,
     LinuxRunOptions,
     LocalMachineInfo,
+    NewCredentials,
+    OverflowPolicy,
     PayloadResult,
     PingScanData,
     PortScanData,
     PortScanDataDict,
+    PrefetchingAgentOTPProvider,
     RetrievalError,
+    SharedPortScanDataDict,
+    SharedPortScanStore,
+    SyncAgentBinaryRepositoryAdapter,
+    SyncAgentEventPublisherAdapter,
+    SyncAgentOTPProviderAdapter,
+    SyncHTTPAgentBinaryServerRegistrarAdapter,
+    SyncPropagationCredentialsRepositoryAdapter,
     TargetHost,
+    TargetHostInventory,
     TargetHostPorts,
     WindowsDownloadMethod,
     WindowsDownloadOptions,
     WindowsRunOptions,
     WindowsShell,
+    dump_target_hosts_jsonl,
+    load_target_hosts_jsonl,
 )
 from agentpluginapi.i_linux_agent_command_builder import LinuxSetPermissionsOptions
+from agentpluginapi.target_host import _PortSetView
 
 IAgentEventPublisher.publish
 IAgentEventPublisher.event
+IAgentEventPublisher.publish_many
+IAgentEventPublisher.events
+
+BufferingAgentEventPublisher
+BufferingAgentEventPublisher.start
+BufferingAgentEventPublisher.stop
+BufferingAgentEventPublisher.flush
+BufferingAgentEventPublisher.dropped_events
+
+BackgroundAgentEventPublisher
+BackgroundAgentEventPublisher.start
+BackgroundAgentEventPublisher.stop
+BackgroundAgentEventPublisher.metrics
+
+AgentEventPublisherMetrics.queue_depth
+AgentEventPublisherMetrics.published_events
+AgentEventPublisherMetrics.dropped_events
+AgentEventPublisherMetrics.failed_events
+AgentEventPublisherMetrics.mean_latency_sec
+AgentEventPublisherMetrics.max_latency_sec
+
+OverflowPolicy.BLOCK
+OverflowPolicy.DROP
 
 ITCPPortSelector
 ITCPPortSelector.get_free_tcp_port
@@ -40,11 +100,24 @@ ITCPPortSelector.min_range
 ITCPPortSelector.max_range
 ITCPPortSelector.lease_time_sec
 ITCPPortSelector.preferred_ports
+ITCPPortSelector.get_free_tcp_ports
+ITCPPortSelector.count
+ITCPPortSelector.release
+ITCPPortSelector.ports
+
+BitmapTCPPortSelector
 
 LocalMachineInfo
 LocalMachineInfo.operating_system
 LocalMachineInfo.temporary_directory
 LocalMachineInfo.get_interface_to_target
+LocalMachineInfo.get_interfaces_to_targets
+LocalMachineInfo.interface_to_target_cache_info
+
+InterfaceToTargetCacheInfo.hits
+InterfaceToTargetCacheInfo.misses
+InterfaceToTargetCacheInfo.currsize
+LocalMachineInfo.invalidate_route_table_cache
 
 PayloadResult
 PayloadResult.success
@@ -60,6 +133,10 @@ PortScanData.service
 
 PortScanDataDict.closed
 PortScanDataDict.get_open_service_ports
+PortScanDataDict.bulk_update
+PortScanDataDict.update_validated
+PortScanDataDict.get_protocol_ports
+_PortSetView._from_iterable
 
 TargetHost
 TargetHost.ip
@@ -71,6 +148,18 @@ TargetHostPorts.model_config
 TargetHostPorts.tcp_ports
 TargetHostPorts.udp_ports
 TargetHostPorts.dump_ports
+TargetHostPorts.with_compact_storage
+dump_target_hosts_jsonl
+load_target_hosts_jsonl
+TargetHostInventory.get
+TargetHostInventory.remove
+TargetHostInventory.find
+SharedPortScanStore.attach
+SharedPortScanStore.get_target_host_ports
+SharedPortScanStore.target_ips
+SharedPortScanStore.unlink
+
+CompactPortScanDataDict
 
 AgentBinaryDownloadReservation
 AgentBinaryDownloadReservation.id
@@ -79,6 +168,9 @@ AgentBinaryDownloadReservation.transform_agent_binary
 AgentBinaryDownloadReservation.download_url
 AgentBinaryDownloadReservation.download_completed
 
+AgentBinaryWrapperTemplate.get_size
+AgentBinaryWrapperTemplate.render
+
 AgentBinaryDownloadTicket.id
 AgentBinaryDownloadTicket.download_url
 AgentBinaryDownloadTicket.download_completed
@@ -99,22 +191,58 @@ RetrievalError
 
 IAgentBinaryRepository
 IAgentBinaryRepository.get_agent_binary
+IAgentBinaryRepository.open_agent_binary
+IAgentBinaryRepository.get_agent_binary_size
+IAgentBinaryRepository.get_agent_binary_sha256
+IAgentBinaryRepository.get_agent_binary_view
+
+CachingAgentBinaryRepository
+CachingAgentBinaryRepository.close
 
 IAgentOTPProvider
 IAgentOTPProvider.get_otp
+IAgentOTPProvider.get_otps
+
+PrefetchingAgentOTPProvider
+PrefetchingAgentOTPProvider.start
+PrefetchingAgentOTPProvider.stop
 
 IHTTPAgentBinaryServerRegistrar
 IHTTPAgentBinaryServerRegistrar.reserve_download
+IHTTPAgentBinaryServerRegistrar.reserve_compiled_download
 IHTTPAgentBinaryServerRegistrar.operating_system
 IHTTPAgentBinaryServerRegistrar.requestor_ip
 IHTTPAgentBinaryServerRegistrar.agent_binary_wrapper_template
 IHTTPAgentBinaryServerRegistrar.clear_reservation
 IHTTPAgentBinaryServerRegistrar.reservation_id
+IHTTPAgentBinaryServerRegistrar.reserve_downloads
+IHTTPAgentBinaryServerRegistrar.requests
+IHTTPAgentBinaryServerRegistrar.clear_reservations
+IHTTPAgentBinaryServerRegistrar.reservation_ids
+
+AgentBinaryDownloadRequest
+AgentBinaryDownloadRequest.operating_system
+AgentBinaryDownloadRequest.requestor_ip
+AgentBinaryDownloadRequest.agent_binary_wrapper_template
 
 IPropagationCredentialsRepository
 IPropagationCredentialsRepository.add_credentials
 IPropagationCredentialsRepository.credentials_to_add
 IPropagationCredentialsRepository.get_credentials
+IPropagationCredentialsRepository.find_credentials
+IPropagationCredentialsRepository.identity_type
+IPropagationCredentialsRepository.secret_type
+IPropagationCredentialsRepository.username
+IPropagationCredentialsRepository.get_credentials_since
+IPropagationCredentialsRepository.generation
+IPropagationCredentialsRepository.subscribe_to_new_credentials
+IPropagationCredentialsRepository.unsubscribe_from_new_credentials
+IPropagationCredentialsRepository.callback
+
+InMemoryPropagationCredentialsRepository
+
+NewCredentials.generation
+NewCredentials.credentials
 
 DropperExecutionMode.NONE
 DropperExecutionMode.SCRIPT
@@ -145,6 +273,11 @@ ILinuxAgentCommandBuilder.reset_command
 ILinuxAgentCommandBuilder.download_options
 ILinuxAgentCommandBuilder.run_options
 ILinuxAgentCommandBuilder.include_otp
+ILinuxAgentCommandBuilder.build_command_template
+
+AgentCommandTemplate.render
+AgentCommandTemplate.includes_otp
+AgentCommandTemplate.from_built_command
 
 WindowsDownloadMethod.WEB_REQUEST
 WindowsDownloadMethod.WEB_CLIENT
@@ -167,9 +300,45 @@ IWindowsAgentCommandBuilder.build_download_command
 IWindowsAgentCommandBuilder.build_run_command
 IWindowsAgentCommandBuilder.get_command
 IWindowsAgentCommandBuilder.reset_command
+IWindowsAgentCommandBuilder.build_command_template
 IWindowsAgentCommandBuilder.download_options
 IWindowsAgentCommandBuilder.run_options
 IWindowsAgentCommandBuilder.include_otp
 
 IAgentCommandBuilderFactory.create_linux_agent_command_builder
 IAgentCommandBuilderFactory.create_windows_agent_command_builder
+
+IAsyncAgentBinaryRepository
+IAsyncAgentBinaryRepository.get_agent_binary
+IAsyncAgentBinaryRepository.open_agent_binary
+IAsyncAgentBinaryRepository.get_agent_binary_view
+IAsyncAgentBinaryRepository.get_agent_binary_size
+IAsyncAgentBinaryRepository.get_agent_binary_sha256
+IAsyncAgentOTPProvider
+IAsyncAgentOTPProvider.get_otp
+IAsyncAgentOTPProvider.get_otps
+IAsyncHTTPAgentBinaryServerRegistrar
+IAsyncHTTPAgentBinaryServerRegistrar.reserve_download
+IAsyncHTTPAgentBinaryServerRegistrar.reserve_compiled_download
+IAsyncHTTPAgentBinaryServerRegistrar.clear_reservation
+IAsyncHTTPAgentBinaryServerRegistrar.reserve_downloads
+IAsyncHTTPAgentBinaryServerRegistrar.clear_reservations
+IAsyncAgentEventPublisher
+IAsyncAgentEventPublisher.publish
+IAsyncAgentEventPublisher.publish_many
+IAsyncPropagationCredentialsRepository
+IAsyncPropagationCredentialsRepository.add_credentials
+IAsyncPropagationCredentialsRepository.get_credentials
+IAsyncPropagationCredentialsRepository.find_credentials
+IAsyncPropagationCredentialsRepository.get_credentials_since
+
+AsyncAgentBinaryRepositoryAdapter
+AsyncAgentEventPublisherAdapter
+AsyncAgentOTPProviderAdapter
+AsyncHTTPAgentBinaryServerRegistrarAdapter
+AsyncPropagationCredentialsRepositoryAdapter
+SyncAgentBinaryRepositoryAdapter
+SyncAgentEventPublisherAdapter
+SyncAgentOTPProviderAdapter
+SyncHTTPAgentBinaryServerRegistrarAdapter
+SyncPropagationCredentialsRepositoryAdapter